@@ -119,8 +119,8 @@ class AKShareCashFlowStatementFetcher(
 
 def get_data(symbol: str, period: Literal["annual", "quarter"] = "annual", use_cache: bool = True, api_key:str="", limit:int = 5) -> pd.DataFrame:
     from openbb_akshare import project_name
-    from mysharelib.blob_cache import BlobCache
-    cache = BlobCache(table_name="cash_flow", project=project_name)
+    from openbb_akshare.utils.single_flight import CoalescingBlobCache
+    cache = CoalescingBlobCache(table_name="cash_flow", project=project_name)
     logger.info(f"Fetching cash flow data for {symbol} with limit {limit} and use_cache={use_cache}")
     
     try:
@@ -34,11 +34,24 @@ class AKShareEquityHistoricalQueryParams(EquityHistoricalQueryParams):
     __json_schema_extra__ = {
         "symbol": {"multiple_items_allowed": True},
         "period": {"choices": ["daily", "weekly", "monthly"]},
+        "adjustment": {"choices": ["none", "qfq", "hfq"]},
+        "interval": {"choices": ["1m", "5m", "15m", "30m", "60m", "1d"]},
     }
 
     period: Literal["daily", "weekly", "monthly"] = Field(
         default="daily", description=QUERY_DESCRIPTIONS.get("period", "")
     )
+    interval: Literal["1m", "5m", "15m", "30m", "60m", "1d"] = Field(
+        default="1d",
+        description=QUERY_DESCRIPTIONS.get("interval", "")
+        + " Minute intervals return intraday bars and ignore period and adjustment.",
+    )
+
+    adjustment: Literal["none", "qfq", "hfq"] = Field(
+        default="none",
+        description="The adjustment for dividends, bonus shares and transfers."
+        + " 'qfq' is forward-adjusted and 'hfq' is backward-adjusted.",
+    )
 
     use_cache: bool = Field(
         default=True,
@@ -59,6 +72,10 @@ class AKShareEquityHistoricalData(EquityHistoricalData):
         "change_percent": "涨跌幅",
     }
 
+    symbol: Optional[str] = Field(
+        default=None,
+        description="Symbol representing the entity requested in the data. Only returned for multiple symbols.",
+    )
     amount: Optional[float] = Field(
         default=None,
         description="Amount.",
@@ -97,26 +114,36 @@ class AKShareEquityHistoricalFetcher(
         return AKShareEquityHistoricalQueryParams(**transformed_params)
 
     @staticmethod
-    def extract_data(
+    async def aextract_data(
         query: AKShareEquityHistoricalQueryParams,
         credentials: Optional[Dict[str, str]],
         **kwargs: Any,
     ) -> List[Dict]:
         """Return the raw data from the AKShare endpoint."""
-        from openbb_akshare.utils.helpers import ak_download
-        data = ak_download(
-            symbol=query.symbol,
+        from openbb_akshare.utils.fast_transform import fast_transform_enabled
+        from openbb_akshare.utils.helpers import aak_download_many
+
+        symbols = [symbol.strip() for symbol in query.symbol.split(",") if symbol.strip()]
+        data = await aak_download_many(
+            symbols,
             start_date=query.start_date,
             end_date=query.end_date,
-            period="daily",
+            period=query.period,
             use_cache=query.use_cache,
             api_key="",
-            adjust="",
+            adjust="" if query.adjustment == "none" else query.adjustment,
+            interval=query.interval,
         )
 
         if data.empty:
             raise EmptyDataError()
 
+        if len(symbols) == 1:
+            data = data.drop(columns=["symbol"])
+
+        if fast_transform_enabled():
+            return data
+
         return data.to_dict(orient="records")
 
 
@@ -125,6 +152,11 @@ class AKShareEquityHistoricalFetcher(
         query: AKShareEquityHistoricalQueryParams, data: List[Dict], **kwargs: Any
     ) -> List[AKShareEquityHistoricalData]:
         """Return the transformed data."""
+        import pandas as pd
+
+        if isinstance(data, pd.DataFrame):
+            from openbb_akshare.utils.fast_transform import columnar_transform
+            return columnar_transform(AKShareEquityHistoricalData, data)
 
         return [
             AKShareEquityHistoricalData.model_validate(d)
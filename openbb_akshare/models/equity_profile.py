@@ -159,31 +159,37 @@ class AKShareEquityProfileFetcher(
     ) -> List[Dict]:
         """Extract the raw data from AKShare."""
         # pylint: disable=import-outside-toplevel
-        import asyncio  # noqa
         from openbb_core.app.model.abstract.error import OpenBBError
         from openbb_core.provider.utils.errors import EmptyDataError
         from warnings import warn
 
-        symbols = query.symbol.split(",")
+        from mysharelib.tools import normalize_symbol
+        from openbb_akshare.utils.concurrency import run_blocking
+        from openbb_akshare.utils.fetch_equity_info import fetch_equity_info_batch
+
+        symbols = [symbol.strip() for symbol in query.symbol.split(",") if symbol.strip()]
         results = []
         messages: list = []
 
-        async def get_one(symbol, api_key: str | None, use_cache: bool = True):
-            from openbb_akshare.utils.fetch_equity_info import fetch_equity_info
-            """Get the data for one ticker symbol."""
-            try:
-                result: dict = {}
-                result = fetch_equity_info(symbol, api_key=api_key, use_cache=use_cache).to_dict(orient="records")[0]
-                if result:
-                    results.append(result)
-            except Exception as e:
-                messages.append(
-                    f"Error getting data for {symbol} -> {e.__class__.__name__}: {e}"
-                )
-
-        tasks = [get_one(symbol, api_key=None, use_cache=query.use_cache) for symbol in symbols]
-
-        await asyncio.gather(*tasks)
+        # One batch on one shared worker; the upstream calls are capped by the Xueqiu host executor.
+        try:
+            found, errors = await run_blocking(fetch_equity_info_batch, symbols, None, query.use_cache)
+        except Exception as e:  # pylint: disable=broad-except
+            raise OpenBBError(f"Error getting data for {query.symbol} -> {e.__class__.__name__}: {e}") from e
+        found = found.drop(columns=["fetched_at"], errors="ignore")
+        rows = {row["symbol"]: row for row in found.to_dict(orient="records")}
+        for symbol in symbols:
+            error = errors.get(symbol)
+            row = None
+            if error is None:
+                symbol_f = normalize_symbol(symbol)[1]
+                row, error = rows.get(symbol_f), errors.get(symbol_f)
+            if row is not None:
+                results.append(row)
+            elif error is not None:
+                messages.append(f"Error getting data for {symbol} -> {error.__class__.__name__}: {error}")
+            else:
+                messages.append(f"Error getting data for {symbol} -> No data found")
 
         if not results and messages:
             raise OpenBBError("\n".join(messages))
@@ -25,7 +25,7 @@ class AKShareEquityQuoteQueryParams(EquityQuoteQueryParams):
 
     use_cache: bool = Field(
         default=True,
-        description="Whether to use a cached request. The quote is cached for one hour.",
+        description="Whether to use a cached request. Quotes are refreshed every minute during trading and kept until the next open after the close.",
     )
 
 
@@ -57,39 +57,52 @@ class AKShareEquityQuoteFetcher(
         return AKShareEquityQuoteQueryParams(**params)
 
     @staticmethod
-    def extract_data(
+    async def aextract_data(
         query: AKShareEquityQuoteQueryParams,
         credentials: Optional[Dict[str, str]],
         **kwargs: Any,
     ) -> List[Dict]:
         """Extract the raw data from AKShare."""
         # pylint: disable=import-outside-toplevel
-        import akshare as ak
+        import asyncio
         import pandas as pd
 
-        symbols = query.symbol.split(",")
-        all_data = []
-
-        def get_one(symbol, use_cache) -> pd.DataFrame:
-            """Get the data for one ticker symbol."""
-            from openbb_akshare.utils.fetch_quote import load_cached_data
-            quote = pd.DataFrame()
-            symbol_b, symbol_f, market = normalize_symbol(symbol)
-            stock_quotes = load_cached_data(market, use_cache)
-            quote = stock_quotes[stock_quotes["代码"] == symbol]
+        from openbb_akshare.utils.concurrency import run_blocking
+        from openbb_akshare.utils.fast_transform import fast_transform_enabled
+        from openbb_akshare.utils.fetch_quote import lookup_quotes
 
-            if quote.empty:
-                return pd.DataFrame([{"symbol": symbol, "error": "Symbol not found"}])
-            return quote
+        symbols = [symbol.strip() for symbol in query.symbol.split(",") if symbol.strip()]
 
+        # Bucket the symbols by market, so each snapshot is loaded once.
+        buckets: Dict[str, List[str]] = {}
         for symbol in symbols:
-            try:        
-                data = get_one(symbol, query.use_cache)
-                all_data.append(data.to_dict(orient="records")[0])
-                
-            except Exception as e:
-                print(f"Error fetching data for symbol {symbol}: {e}")
+            symbol_b, symbol_f, market = normalize_symbol(symbol)
+            buckets.setdefault(market, []).append(symbol_b)
+
+        markets = list(buckets)
+        results = await asyncio.gather(
+            *[run_blocking(lookup_quotes, market, buckets[market], query.use_cache) for market in markets],
+            return_exceptions=True,
+        )
+
+        quotes = {}
+        for market, result in zip(markets, results):
+            if isinstance(result, Exception):
+                logger.warning(f"Error fetching quotes of market {market}: {result}")
                 continue
+            for position, code in enumerate(result["代码"]):
+                quotes[(market, code)] = result.iloc[position:position + 1]
+
+        all_data = []
+        for symbol in symbols:
+            symbol_b, symbol_f, market = normalize_symbol(symbol)
+            quote = quotes.get((market, symbol_b))
+            if quote is None:
+                quote = pd.DataFrame([{"symbol": symbol, "error": "Symbol not found"}])
+            all_data.append(quote if fast_transform_enabled() else quote.to_dict(orient="records")[0])
+
+        if fast_transform_enabled():
+            return pd.concat(all_data, ignore_index=True) if all_data else pd.DataFrame()
 
         return all_data
 
@@ -100,4 +113,10 @@ class AKShareEquityQuoteFetcher(
         **kwargs: Any,
     ) -> List[AKShareEquityQuoteData]:
         """Transform the data."""
+        import pandas as pd
+
+        if isinstance(data, pd.DataFrame):
+            from openbb_akshare.utils.fast_transform import columnar_transform
+            return columnar_transform(AKShareEquityQuoteData, data)
+
         return [AKShareEquityQuoteData.model_validate(d) for d in data]
@@ -34,11 +34,53 @@ class AKShareEquityScreenerQueryParams(EquityScreenerQueryParams):
     )
     use_cache: bool = Field(
         default=True,
-        description="Whether to use a cached request. The quote is cached for one hour.",
+        description="Whether to use a cached request. Quotes are refreshed every minute during trading and kept until the next open after the close.",
     )
     limit: Optional[int] = Field(
         default=1000, description="Limit the number of results to return."
     )
+    price_min: Optional[float] = Field(
+        default=None, description="Minimum price."
+    )
+    price_max: Optional[float] = Field(
+        default=None, description="Maximum price."
+    )
+    change_percent_min: Optional[float] = Field(
+        default=None, description="Minimum percent change."
+    )
+    change_percent_max: Optional[float] = Field(
+        default=None, description="Maximum percent change."
+    )
+    volume_min: Optional[float] = Field(
+        default=None, description="Minimum volume."
+    )
+    volume_max: Optional[float] = Field(
+        default=None, description="Maximum volume."
+    )
+    turnover_min: Optional[float] = Field(
+        default=None, description="Minimum turnover (amount traded)."
+    )
+    turnover_max: Optional[float] = Field(
+        default=None, description="Maximum turnover (amount traded)."
+    )
+    market_cap_min: Optional[float] = Field(
+        default=None, description="Minimum market capitalization."
+    )
+    market_cap_max: Optional[float] = Field(
+        default=None, description="Maximum market capitalization."
+    )
+    pe_min: Optional[float] = Field(
+        default=None, description="Minimum dynamic P/E ratio."
+    )
+    pe_max: Optional[float] = Field(
+        default=None, description="Maximum dynamic P/E ratio."
+    )
+    sort_by: Optional[Literal["price", "change_percent", "volume", "turnover", "market_cap", "pe"]] = Field(
+        default=None, description="Rank the results by this metric and return the top ones."
+    )
+    ascending: bool = Field(
+        default=False, description="Rank the smallest values of `sort_by` first."
+    )
 
 
 class AKShareEquityScreenerData(EquityScreenerData):
@@ -52,6 +94,9 @@ class AKShareEquityScreenerData(EquityScreenerData):
     sector: Optional[str] = Field(
         description="The sector the ticker belongs to.", default=None
     )
+    industry: Optional[str] = Field(
+        description="The industry the ticker belongs to.", default=None
+    )
     exchange: Optional[str] = Field(
         description="The exchange code the asset trades on.",
         default=None,
@@ -79,26 +124,36 @@ class AKShareEquityScreenerFetcher(
     ) -> List[Dict]:
         """Return the raw data from the AKShare endpoint."""
         # pylint: disable=import-outside-toplevel
-        from openbb_akshare.utils.fetch_quote import load_cached_data
-        all_df = pd.DataFrame()
-        def get_all():
-            df1 = pd.DataFrame()
-            for exchange in EXCHANGES:
-                if exchange not in MARKETS:
-                    raise ValueError(f"Exchange {exchange} not supported")
-                market = MARKETS[exchange]
-                df2 = load_cached_data(market, query.use_cache)
-                df1 = pd.concat([df1, df2])
-            return df1
-            
-        if query.exchange not in MARKETS:
-            all_df = get_all()
+        import asyncio
+        from openbb_akshare.utils.concurrency import run_blocking
+        from openbb_akshare.utils.fast_transform import fast_transform_enabled
+        from openbb_akshare.utils.screener_engine import SCREEN_METRICS, get_snapshot_index, screen
+
+        if query.exchange in MARKETS:
+            markets = [MARKETS[query.exchange]]
         else:
-            market = MARKETS[query.exchange]
-            all_df = load_cached_data(market, query.use_cache)
+            markets = [MARKETS[exchange] for exchange in EXCHANGES]
+
+        indexes = await asyncio.gather(
+            *[run_blocking(get_snapshot_index, market, query.use_cache) for market in markets]
+        )
+        if query.sector:
+            from openbb_akshare.utils.sector_classification import get_classification
+
+            classification = await run_blocking(get_classification, query.use_cache)
+            for index in indexes:
+                index.classify(classification)
 
-        if query.limit  is not None:
-            all_df = all_df[: query.limit]
+        filters = {
+            metric: (getattr(query, f"{metric}_min"), getattr(query, f"{metric}_max"))
+            for metric in SCREEN_METRICS
+        }
+        all_df = screen(indexes, filters, query.sort_by, query.ascending, query.limit, query.sector)
+        if all_df.empty:
+            raise EmptyDataError("No equities matched the screen.")
+
+        if fast_transform_enabled():
+            return all_df
 
         return all_df.to_dict(orient="records")
 
@@ -107,4 +162,8 @@ class AKShareEquityScreenerFetcher(
         query: AKShareEquityScreenerQueryParams, data: List[Dict], **kwargs: Any
     ) -> List[AKShareEquityScreenerData]:
         """Return the transformed data."""
+        if isinstance(data, pd.DataFrame):
+            from openbb_akshare.utils.fast_transform import columnar_transform
+            return columnar_transform(AKShareEquityScreenerData, data)
+
         return [AKShareEquityScreenerData.model_validate(d) for d in data]
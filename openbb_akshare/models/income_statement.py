@@ -125,8 +125,8 @@ class AKShareIncomeStatementFetcher(
 
 def get_data(symbol: str, period: Literal["annual", "quarter"] = "annual", use_cache: bool = True, api_key:str="", limit:int = 5) -> pd.DataFrame:
     from openbb_akshare import project_name
-    from mysharelib.blob_cache import BlobCache
-    cache = BlobCache(table_name="income_statement", project=project_name)
+    from openbb_akshare.utils.single_flight import CoalescingBlobCache
+    cache = CoalescingBlobCache(table_name="income_statement", project=project_name)
     logger.info(f"Fetching income statement data for {symbol} with limit {limit} and use_cache={use_cache}")
     
     try:
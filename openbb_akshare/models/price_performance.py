@@ -74,10 +74,11 @@ class AKSharePricePerformanceFetcher(
         symbols = query.symbol.split(",")
 
         def get_data(code: str) -> dict:
-            from mysharelib.tools import calculate_price_performance, last_closing_day
+            from mysharelib.tools import calculate_price_performance, normalize_symbol
             from openbb_akshare.utils.helpers import get_list_date, ak_download
+            from openbb_akshare.utils.trading_calendar import last_closing_day
 
-            df = ak_download(symbol=code, start_date=get_list_date(code), end_date=last_closing_day())
+            df = ak_download(symbol=code, start_date=get_list_date(code), end_date=last_closing_day(normalize_symbol(code)[2]))
             df['date'] = pd.to_datetime(df['date'])
             df.set_index('date', inplace=True)
             return calculate_price_performance(code, df)
@@ -23,13 +23,13 @@ def fetch_compare_company(
     Returns:
         pd.DataFrame: A DataFrame containing the metrics.
     """
-    from mysharelib.blob_cache import BlobCache
+    from openbb_akshare.utils.single_flight import CoalescingBlobCache
 
     symbol_b, _, market = normalize_symbol(symbol)
     if market not in ["SH", "SZ", "BJ", "HK"]:
         logger.warning("fetch_compare_company只支持A股和港股。")
         return pd.DataFrame()
-    cache = BlobCache(table_name="compare_company_facts", project=project_name)
+    cache = CoalescingBlobCache(table_name="compare_company_facts", project=project_name)
     data = cache.load_cached_data(symbol_b, period, use_cache, _get_metrics, api_key=api_key)
     if data is None:
         return pd.DataFrame()
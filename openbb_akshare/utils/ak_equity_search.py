@@ -1,7 +1,6 @@
 import logging
 import pandas as pd
 from mysharelib.tools import setup_logger, get_exchange
-from mysharelib.table_cache import TableCache
 from openbb_akshare import project_name
 
 setup_logger(project_name)
@@ -31,7 +30,14 @@ def get_symbols_df() -> pd.DataFrame:
     return pd.concat([stock_info_a_code_name_df, stock_info_hk_code_name_df], ignore_index=True) 
 
 def get_symbols(use_cache: bool = True, api_key : str = "") -> pd.DataFrame:
-    cache = TableCache(TABLE_SCHEMA, project=project_name, table_name="symbols", primary_key="symbol")
+    from openbb_akshare.utils.single_flight import single_flight
+
+    return single_flight(f"symbols_{use_cache}", _load_symbols, use_cache, api_key)
+
+def _load_symbols(use_cache: bool = True, api_key : str = "") -> pd.DataFrame:
+    from openbb_akshare.utils.cache_db import get_table_cache
+
+    cache = get_table_cache(TABLE_SCHEMA, "symbols", primary_key="symbol")
     if use_cache:
         data = cache.read_dataframe()
         if not data.empty:
@@ -24,14 +24,14 @@ def fetch_key_metrics(
     Returns:
         pd.DataFrame: A DataFrame containing the key metrics.
     """
-    from mysharelib.blob_cache import BlobCache
+    from openbb_akshare.utils.single_flight import CoalescingBlobCache
 
     logger.debug(f"Fetching key metrics for symbol: {symbol}, period: {period}, use_cache: {use_cache}")
     symbol_b, _, market = normalize_symbol(symbol)
     if market not in ["SH", "SZ", "BJ", "HK"]:
         logger.warning("AKShare key metrics only support A shares.")
         return pd.DataFrame()
-    cache = BlobCache(table_name="key_metrics", project=project_name)
+    cache = CoalescingBlobCache(table_name="key_metrics", project=project_name)
     try:
         data = cache.load_cached_data(symbol_b, period, use_cache, _get_key_metrics, api_key=api_key)
     except NotImplementedError:
@@ -0,0 +1,149 @@
+"""AKShare pooled SQLite connections for the cache database."""
+
+import os
+import logging
+import sqlite3
+import threading
+from typing import Callable, Dict, Iterable, Optional, Set, Tuple, Type
+import pandas as pd
+from mysharelib.table_cache import TableCache
+from mysharelib.tools import setup_logger
+from openbb_akshare import project_name
+
+setup_logger(project_name)
+logger = logging.getLogger(__name__)
+
+# Seconds a connection waits for a lock held by another process before failing.
+BUSY_TIMEOUT = float(os.environ.get("OPENBB_AKSHARE_SQLITE_TIMEOUT", 30))
+
+# Prepared statements kept per connection.
+CACHED_STATEMENTS = 256
+
+# SQLite lists of more than 999 parameters are split into chunks.
+MAX_SQL_PARAMS = 900
+
+_local = threading.local()
+_initialized: Set[Tuple[str, str]] = set()
+_init_lock = threading.Lock()
+_table_caches: Dict[Tuple, TableCache] = {}
+_table_caches_lock = threading.Lock()
+
+
+def get_db_path(project: str = project_name) -> str:
+    """Return the path of the cache database of a project."""
+    from mysharelib import get_cache_path
+
+    return get_cache_path(project)
+
+
+def get_connection(db_path: Optional[str] = None) -> sqlite3.Connection:
+    """
+    Return this thread's pooled connection to a cache database.
+
+    Connections are opened once per thread and database, in WAL mode with a busy
+    timeout, so readers never block the writer and concurrent writers from
+    several workers wait for each other instead of failing with ``database is
+    locked``. Use the connection as a context manager to commit or roll back;
+    it is never closed.
+    """
+    db_path = db_path or get_db_path()
+    connections = getattr(_local, "connections", None)
+    if connections is None:
+        connections = _local.connections = {}
+    conn = connections.get(db_path)
+    if conn is None:
+        conn = sqlite3.connect(db_path, timeout=BUSY_TIMEOUT, cached_statements=CACHED_STATEMENTS)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(f"PRAGMA busy_timeout={int(BUSY_TIMEOUT * 1000)}")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        connections[db_path] = conn
+    return conn
+
+
+def init_once(db_path: str, name: str, init: Callable[[sqlite3.Connection], None]):
+    """Run the schema initialization ``name`` of a database once per process."""
+    key = (db_path, name)
+    if key in _initialized:
+        return
+    with _init_lock:
+        if key in _initialized:
+            return
+        with get_connection(db_path) as conn:
+            init(conn)
+        _initialized.add(key)
+
+
+class PooledTableCache(TableCache):
+    """
+    ``TableCache`` running on the pooled connections.
+
+    The table is created once per process, and every read and write reuses the
+    thread's connection and its prepared statements.
+    """
+
+    def _ensure_db_exists(self):
+        columns_definition = ", ".join([f"{col} {dtype}" for col, dtype in self.table_schema.items()])
+        init_once(self.db_path, self.table_name, lambda conn: conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {self.table_name} ({columns_definition})"))
+
+    def write_dataframe(self, df: pd.DataFrame):
+        with get_connection(self.db_path) as conn:
+            df.to_sql(self.table_name, conn, if_exists='replace', index=False)
+
+    def read_dataframe(self) -> pd.DataFrame:
+        with get_connection(self.db_path) as conn:
+            return pd.read_sql_query(f"SELECT * FROM {self.table_name}", conn)
+
+    def read_rows(self, filters: Dict) -> pd.DataFrame:
+        if not filters:
+            return self.read_dataframe()
+        where_conditions = " AND ".join([f"{key} = ?" for key in filters.keys()])
+        with get_connection(self.db_path) as conn:
+            return pd.read_sql_query(f"SELECT * FROM {self.table_name} WHERE {where_conditions}", conn,
+                                     params=list(filters.values()))
+
+    def read_rows_in(self, column: str, values: Iterable) -> pd.DataFrame:
+        """Read the rows whose column is one of several values, with one indexed query per chunk."""
+        values = list(values)
+        frames = []
+        with get_connection(self.db_path) as conn:
+            for i in range(0, len(values), MAX_SQL_PARAMS):
+                chunk = values[i:i + MAX_SQL_PARAMS]
+                frames.append(pd.read_sql_query(
+                    f"SELECT * FROM {self.table_name} WHERE {column} IN ({', '.join(['?'] * len(chunk))})",
+                    conn, params=chunk))
+        if not frames:
+            return pd.read_sql_query(f"SELECT * FROM {self.table_name} LIMIT 0", get_connection(self.db_path))
+        return pd.concat(frames, ignore_index=True)
+
+    def update_or_insert(self, df: pd.DataFrame):
+        with get_connection(self.db_path) as conn:
+            for _, row in df.iterrows():
+                conn.execute(f"DELETE FROM {self.table_name} WHERE {self.primary_key} = ?", (row[self.primary_key],))
+                columns = list(row.index)
+                conn.execute(
+                    f"INSERT INTO {self.table_name} ({', '.join(columns)}) VALUES ({', '.join(['?'] * len(columns))})",
+                    list(row.values),
+                )
+
+    def fetch_date_range(self, start_date: str, end_date: str) -> pd.DataFrame:
+        with get_connection(self.db_path) as conn:
+            df = pd.read_sql(f"SELECT * FROM {self.table_name} WHERE date BETWEEN ? AND ? ORDER BY date ASC", conn,
+                             params=(start_date, end_date))
+        df['date'] = pd.to_datetime(df['date'])
+        return df
+
+
+def get_table_cache(table_schema: Dict, table_name: str, primary_key: str = "symbol",
+                    cls: Type[TableCache] = PooledTableCache, db_path: Optional[str] = None,
+                    **kwargs) -> TableCache:
+    """Return the process-wide cache instance of a table, creating it on first use."""
+    db_path = db_path or get_db_path()
+    key = (cls, db_path, table_name, primary_key, tuple(sorted(kwargs.items())))
+    with _table_caches_lock:
+        cache = _table_caches.get(key)
+        if cache is None:
+            cache = cls(table_schema, project=project_name, db_path=db_path, table_name=table_name,
+                        primary_key=primary_key, **kwargs)
+            _table_caches[key] = cache
+        return cache
@@ -0,0 +1,253 @@
+"""AKShare columnar, memory-mapped storage for daily bars."""
+
+import os
+import time
+import shutil
+import logging
+import threading
+from typing import Dict, Iterable, Optional, Tuple
+import numpy as np
+import pandas as pd
+from mysharelib.tools import setup_logger
+from openbb_akshare import project_name
+from openbb_akshare.utils.history_cache import HistoryManifest
+
+setup_logger(project_name)
+logger = logging.getLogger(__name__)
+
+SQL_TO_NUMPY = {
+    "REAL": "<f8",
+    "INTEGER": "<i8",
+}
+
+# File naming the generation directory which holds the current columns of a series.
+CURRENT_FILE = "CURRENT"
+
+# Open memory maps, keyed by series directory, with the generation they belong to.
+_MMAPS: Dict[str, Tuple[str, Dict[str, np.ndarray]]] = {}
+_MMAPS_LOCK = threading.Lock()
+
+
+def get_store_root(project: str = project_name) -> str:
+    """Return the directory holding the columnar bar files."""
+    from mysharelib import get_cache_path
+
+    root = os.path.join(os.path.dirname(get_cache_path(project)), "history")
+    os.makedirs(root, exist_ok=True)
+    return root
+
+
+def schema_dtypes(table_schema: Dict) -> Dict[str, str]:
+    """Return the on-disk dtype of each column of a series, keyed by an integer YYYYMMDD date."""
+    dtypes = {"date": "<i4"}
+    for col, sql_type in table_schema.items():
+        if col != "date":
+            dtypes[col] = SQL_TO_NUMPY.get(sql_type.split()[0], "<f8")
+    return dtypes
+
+
+def to_date_key(dates) -> np.ndarray:
+    """Convert dates to integer YYYYMMDD keys."""
+    dates = pd.DatetimeIndex(pd.to_datetime(dates))
+    return (dates.year * 10000 + dates.month * 100 + dates.day).to_numpy(dtype="<i4")
+
+
+def from_date_key(keys: np.ndarray) -> pd.DatetimeIndex:
+    """Convert integer YYYYMMDD keys back to timestamps."""
+    keys = np.asarray(keys, dtype="<i8")
+    return pd.to_datetime(pd.DataFrame({"year": keys // 10000, "month": keys // 100 % 100, "day": keys % 100}))
+
+
+def series_dir(table_name: str, root: Optional[str] = None) -> str:
+    """Return the directory of one series."""
+    return os.path.join(root or get_store_root(), table_name)
+
+
+def has_series(table_name: str, root: Optional[str] = None) -> bool:
+    """Check whether a series has been written."""
+    return os.path.exists(os.path.join(series_dir(table_name, root), CURRENT_FILE))
+
+
+def _current_generation(directory: str) -> Optional[str]:
+    try:
+        with open(os.path.join(directory, CURRENT_FILE)) as f:
+            return f.read().strip() or None
+    except FileNotFoundError:
+        return None
+
+
+def _open_columns(directory: str, dtypes: Dict[str, str], columns: Iterable[str]) -> Dict[str, np.ndarray]:
+    """
+    Return read-only memory maps of columns of a series.
+
+    A generation is never modified once written, so its maps stay valid until a
+    writer points CURRENT at a newer one. Columns missing from the files, e.g.
+    added to the schema later, are all NaN.
+    """
+    columns = ["date", *[name for name in columns if name != "date"]]
+    generation = _current_generation(directory)
+    if generation is None:
+        return {name: np.empty(0, dtype=dtypes[name]) for name in columns}
+    with _MMAPS_LOCK:
+        cached = _MMAPS.get(directory)
+        if cached is None or cached[0] != generation:
+            cached = _MMAPS[directory] = (generation, {})
+        arrays = cached[1]
+        for name in columns:
+            if name not in arrays:
+                path = os.path.join(directory, generation, f"{name}.npy")
+                arrays[name] = (np.load(path, mmap_mode="r") if os.path.exists(path)
+                                else np.full(len(arrays["date"]), np.nan, dtype=dtypes[name]))
+        return {name: arrays[name] for name in columns}
+
+
+def _write_columns(directory: str, columns: Dict[str, np.ndarray]):
+    """
+    Write the columns of a series as a new generation and make it current.
+
+    The column files are never replaced in place, so the write works while
+    readers, including ones on Windows, hold maps of the previous generation.
+    Only the small CURRENT file is swapped. Generations older than the previous
+    one are removed; ones still mapped on Windows are removed on a later write.
+    """
+    generation = f"{time.time_ns()}_{os.getpid()}_{threading.get_ident()}"
+    os.makedirs(os.path.join(directory, generation))
+    for name, values in columns.items():
+        np.save(os.path.join(directory, generation, f"{name}.npy"), values)
+
+    tmp_path = os.path.join(directory, f"{CURRENT_FILE}.{generation}.tmp")
+    with open(tmp_path, "w") as f:
+        f.write(generation)
+    for attempt in range(5):
+        try:
+            os.replace(tmp_path, os.path.join(directory, CURRENT_FILE))
+            break
+        except PermissionError:
+            # On Windows a reader may have CURRENT open for a moment.
+            if attempt == 4:
+                raise
+            time.sleep(0.01)
+
+    generations = sorted((entry.name for entry in os.scandir(directory) if entry.is_dir()),
+                         key=lambda name: int(name.split("_")[0]))
+    for old in generations[:-2]:
+        shutil.rmtree(os.path.join(directory, old), ignore_errors=True)
+
+
+def _slice_range(columns: Dict[str, np.ndarray], start_date: str, end_date: str) -> Dict[str, np.ndarray]:
+    """Binary search the date keys and return [start_date, end_date] of every column as views."""
+    keys = columns["date"]
+    lo = np.searchsorted(keys, int(start_date.replace("-", "")), side="left")
+    hi = np.searchsorted(keys, int(end_date.replace("-", "")), side="right")
+    return {name: values[lo:hi] for name, values in columns.items()}
+
+
+class ColumnarHistoryCache(HistoryManifest):
+    """
+    Per-symbol bar cache stored as one sorted, memory-mapped ``.npy`` file per column.
+
+    Each series is a directory with an integer YYYYMMDD date key column, so a
+    date range read is a binary search plus zero-copy slices of the mapped pages,
+    and a read of a few columns, e.g. only closes, never touches the others.
+    Writes create a new generation of the files, which lets many worker processes
+    map the same pages read-only. Coverage is tracked in the shared SQLite manifest.
+    """
+
+    def __init__(self, table_schema: Dict,
+                 project: str = project_name,
+                 table_name: str = "equity_history",
+                 root: Optional[str] = None,
+                 db_path: Optional[str] = None,
+                 period: str = "daily",
+                 adjust: str = "",
+                 market: str = "SH"):
+        from mysharelib import get_cache_path
+
+        self.table_name = table_name
+        self.table_schema = table_schema
+        self.dtypes = schema_dtypes(table_schema)
+        self.root = root or get_store_root(project)
+        self.path = series_dir(table_name, self.root)
+        # The SQLite table of the same series has its own coverage under its bare name.
+        HistoryManifest.__init__(self, db_path or get_cache_path(project), f"columnar/{table_name}",
+                                 period=period, adjust=adjust, market=market)
+
+    def _bar_date_bounds(self, conn) -> Tuple[Optional[str], Optional[str]]:
+        keys = self.read_columns(["date"])["date"]
+        if len(keys) == 0:
+            return None, None
+        first, last = from_date_key(keys[[0, -1]])
+        return first.strftime("%Y-%m-%d"), last.strftime("%Y-%m-%d")
+
+    def read_columns(self, columns: Optional[Iterable[str]] = None) -> Dict[str, np.ndarray]:
+        """Return the date key and the given columns, or all of them, as read-only memory maps."""
+        return _open_columns(self.path, self.dtypes, self.dtypes if columns is None else columns)
+
+    def read_range(self, start_date: str, end_date: str,
+                   columns: Optional[Iterable[str]] = None) -> Dict[str, np.ndarray]:
+        """Return the bars in [start_date, end_date] as zero-copy slices of the columns."""
+        return _slice_range(self.read_columns(columns), start_date, end_date)
+
+    def fetch_date_range(self, start_date: str, end_date: str) -> pd.DataFrame:
+        """Return the bars in a date range in the same layout as ``TableCache.fetch_date_range``."""
+        bars = self.read_range(start_date, end_date)
+        df = pd.DataFrame({name: bars[name] for name in self.dtypes if name != "date"})
+        df.insert(0, "date", from_date_key(bars["date"]) if len(bars["date"]) else pd.Series(dtype="datetime64[ns]"))
+        return df
+
+    def read_dataframe(self) -> pd.DataFrame:
+        """Return the whole series as a DataFrame."""
+        return self.fetch_date_range("0001-01-01", "9999-12-31")
+
+    def _series_lock(self):
+        """Serialize the writers of this series across threads and processes."""
+        from openbb_akshare.utils.single_flight import process_lock
+
+        return process_lock(f"columnar_{self.table_name}")
+
+    def merge_dataframe(self, df: pd.DataFrame):
+        """Merge bars into the files, new rows replacing existing rows of the same date."""
+        if df is None or df.empty:
+            return
+
+        new = {"date": to_date_key(df["date"])}
+        for name, dtype in self.dtypes.items():
+            if name != "date":
+                new[name] = (pd.to_numeric(df[name], errors="coerce").to_numpy(dtype=dtype) if name in df.columns
+                             else np.full(len(df), np.nan, dtype=dtype))
+
+        # Without the lock, two writers could both read the old files and one would drop the other's bars.
+        with self._series_lock():
+            old = self.read_columns()
+            merged = {name: np.concatenate([new[name], np.asarray(old[name])]) for name in self.dtypes}
+            # np.unique keeps the first occurrence, so the new bars win over the cached ones.
+            _, first = np.unique(merged["date"], return_index=True)
+            os.makedirs(self.path, exist_ok=True)
+            _write_columns(self.path, {name: values[first] for name, values in merged.items()})
+
+    def mark_covered(self, start, end):
+        """Record that [start, end] has been downloaded, serialized with the writers of the bars."""
+        with self._series_lock():
+            super().mark_covered(start, end)
+
+    def copy_from(self, cache) -> None:
+        """Import the bars and coverage of another history cache, e.g. a ``HistoryTableCache``."""
+        self.merge_dataframe(cache.read_dataframe())
+        for start, end in cache.covered_ranges():
+            self.mark_covered(start, end)
+
+
+def load_many(table_schema: Dict, table_names: Iterable[str], start_date: str, end_date: str,
+              columns: Optional[Iterable[str]] = None, root: Optional[str] = None) -> Dict[str, Dict[str, np.ndarray]]:
+    """
+    Load a date range of many series for backtests.
+
+    The returned arrays are zero-copy slices of the memory-mapped column files,
+    keyed by series and column. Only the date key and the given columns are
+    mapped, and only the pages that are actually touched are read from disk.
+    """
+    root = root or get_store_root()
+    dtypes = schema_dtypes(table_schema)
+    columns = list(dtypes if columns is None else columns)
+    return {table_name: _slice_range(_open_columns(series_dir(table_name, root), dtypes, columns), start_date, end_date)
+            for table_name in table_names}
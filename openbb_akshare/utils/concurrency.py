@@ -0,0 +1,149 @@
+"""AKShare shared executor and per-host concurrency limits."""
+
+import os
+import asyncio
+import logging
+import threading
+from contextlib import contextmanager
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from functools import partial
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+from mysharelib.tools import setup_logger
+from openbb_akshare import project_name
+
+setup_logger(project_name)
+logger = logging.getLogger(__name__)
+
+# Maximum number of upstream calls in flight per host, per process.
+HOST_LIMITS = {
+    "eastmoney": 8,
+    "xueqiu": 4,
+    "ths": 4,
+    "sina": 4,
+}
+DEFAULT_HOST_LIMIT = 4
+
+# Size of the shared executor running blocking akshare calls.
+MAX_WORKERS = int(os.environ.get("OPENBB_AKSHARE_MAX_WORKERS", 32))
+
+_executor: Optional[ThreadPoolExecutor] = None
+_host_executors: Dict[str, ThreadPoolExecutor] = {}
+_semaphores: Dict[str, threading.BoundedSemaphore] = {}
+_lock = threading.Lock()
+
+
+def _load_env_limits():
+    """Read host limits such as ``eastmoney=8,xueqiu=2`` from OPENBB_AKSHARE_HOST_LIMITS."""
+    for item in os.environ.get("OPENBB_AKSHARE_HOST_LIMITS", "").split(","):
+        host, _, limit = item.partition("=")
+        if host.strip() and limit.strip().isdigit():
+            HOST_LIMITS[host.strip()] = int(limit)
+
+
+_load_env_limits()
+
+
+def set_host_limit(host: str, limit: int):
+    """Set the concurrency cap of an upstream host. Calls already waiting keep the old cap."""
+    if limit < 1:
+        raise ValueError(f"Host limit must be at least 1, got {limit}")
+    with _lock:
+        HOST_LIMITS[host] = limit
+        _semaphores.pop(host, None)
+        executor = _host_executors.pop(host, None)
+    if executor is not None:
+        executor.shutdown(wait=False)
+
+
+def _get_semaphore(host: str) -> threading.BoundedSemaphore:
+    with _lock:
+        semaphore = _semaphores.get(host)
+        if semaphore is None:
+            semaphore = threading.BoundedSemaphore(HOST_LIMITS.get(host, DEFAULT_HOST_LIMIT))
+            _semaphores[host] = semaphore
+        return semaphore
+
+
+@contextmanager
+def host_slot(host: str):
+    """
+    Hold one of the concurrency slots of an upstream host.
+
+    The slots are thread semaphores, so the cap holds for sync callers, worker
+    threads and coroutines offloaded to the shared executor alike.
+    """
+    semaphore = _get_semaphore(host)
+    semaphore.acquire()
+    try:
+        yield
+    finally:
+        semaphore.release()
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """Return the process-wide executor for blocking akshare calls."""
+    global _executor
+    with _lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix=project_name)
+        return _executor
+
+
+def get_host_executor(host: str) -> ThreadPoolExecutor:
+    """Return the executor for fanning out calls to one upstream host, sized to its cap."""
+    with _lock:
+        executor = _host_executors.get(host)
+        if executor is None:
+            executor = _host_executors[host] = ThreadPoolExecutor(
+                max_workers=HOST_LIMITS.get(host, DEFAULT_HOST_LIMIT), thread_name_prefix=f"{project_name}_{host}")
+        return executor
+
+
+def map_on_host(host: str, func: Callable, items: Iterable, window: Optional[int] = None) -> List[Tuple[Any, Optional[Exception]]]:
+    """
+    Call func on every item on the executor of an upstream host and wait for all of them.
+
+    Batch loads fan out their per-item calls here instead of to the shared
+    executor, so waiting for the host's slots never ties up shared workers, and a
+    caller which itself runs on the shared executor can wait for the results
+    without deadlocking it. func must not fan out to the same host again.
+
+    Args:
+        host (str): The upstream host, as in ``HOST_LIMITS``.
+        window (int): Maximum number of calls submitted at a time, so that other
+                      callers of the host are not queued behind the whole batch.
+
+    Returns:
+        List[Tuple[Any, Optional[Exception]]]: The result, or the exception raised, of each item in item order.
+    """
+    executor = get_host_executor(host)
+    items = list(items)
+    results: List[Tuple[Any, Optional[Exception]]] = [(None, None)] * len(items)
+    pending: Dict[Future, int] = {}
+
+    def settle(futures):
+        for future in futures:
+            i = pending.pop(future)
+            try:
+                results[i] = (future.result(), None)
+            except Exception as e:
+                results[i] = (None, e)
+
+    for i, item in enumerate(items):
+        if window is not None and len(pending) >= window:
+            settle(wait(pending, return_when=FIRST_COMPLETED).done)
+        pending[executor.submit(func, item)] = i
+    settle(list(pending))
+    return results
+
+
+async def run_blocking(func: Callable, *args: Any, **kwargs: Any) -> Any:
+    """Run a blocking function on the shared executor without blocking the event loop."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_executor(), partial(func, *args, **kwargs))
+
+
+async def run_on_host(host: str, func: Callable, *args: Any, **kwargs: Any) -> Any:
+    """Run a blocking call to an upstream host on the host's executor without blocking the event loop."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_host_executor(host), partial(func, *args, **kwargs))
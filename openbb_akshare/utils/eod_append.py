@@ -0,0 +1,116 @@
+"""AKShare end-of-day history append module."""
+
+import os
+import logging
+from datetime import (
+    date as dateType,
+    datetime
+)
+from typing import Dict, Iterable, Optional
+import pandas as pd
+from mysharelib.tools import setup_logger
+from openbb_akshare import project_name
+
+setup_logger(project_name)
+logger = logging.getLogger(__name__)
+
+# Spot snapshot columns and the matching daily bar columns.
+SNAPSHOT_BAR_COLUMNS = {
+    "今开": "open",
+    "最高": "high",
+    "最低": "low",
+    "最新价": "close",
+    "成交量": "volume",
+    "成交额": "amount",
+    "涨跌额": "change",
+    "涨跌幅": "change_percent",
+}
+
+EOD_MARKETS = ("SH", "SZ", "BJ", "HK")
+
+
+def snapshot_to_bars(snapshot: pd.DataFrame, trade_date: dateType) -> pd.DataFrame:
+    """
+    Turn a spot snapshot taken after the close into one daily bar per symbol.
+
+    Symbols which did not trade, e.g. suspended ones, have no volume or price and
+    are dropped, so they keep no bar for the day as in the history endpoints.
+
+    Returns:
+        DataFrame: Daily bars indexed by the bare symbol code.
+    """
+    bars = snapshot.rename(columns=SNAPSHOT_BAR_COLUMNS)
+    bars = bars.set_index(bars["代码"].astype(str))[list(SNAPSHOT_BAR_COLUMNS.values())]
+    bars = bars.apply(pd.to_numeric, errors="coerce")
+    bars = bars[(bars["volume"] > 0) & bars[["open", "high", "low", "close"]].notna().all(axis=1)]
+    bars.insert(0, "date", pd.Timestamp(trade_date))
+    return bars
+
+
+def append_snapshot(market: str, snapshot: pd.DataFrame, trade_date: dateType,
+                    db_path: Optional[str] = None, backend: Optional[str] = None) -> int:
+    """
+    Append the bars of one market snapshot to every existing history cache of that market.
+
+    With the SQLite backend all tables and manifests are updated in a single
+    transaction. The columnar backend has one file per series, so its caches
+    are updated one by one.
+
+    Returns:
+        int: The number of history caches updated.
+    """
+    from mysharelib import get_cache_path
+    from openbb_akshare.utils.history_cache import append_bars_many
+
+    bars = snapshot_to_bars(snapshot, trade_date)
+    bars_by_table = {f"{market}{code}": bars.loc[[code]] for code in bars.index.unique()}
+
+    backend = backend or os.environ.get("OPENBB_AKSHARE_HISTORY_BACKEND", "sqlite")
+    if backend == "columnar":
+        from openbb_akshare.utils.columnar_store import ColumnarHistoryCache, get_store_root, has_series
+        from openbb_akshare.utils.helpers import EQUITY_HISTORY_SCHEMA
+
+        root = get_store_root()
+        updated = 0
+        for table_name, df in bars_by_table.items():
+            if not has_series(table_name, root):
+                continue
+            cache = ColumnarHistoryCache(EQUITY_HISTORY_SCHEMA, table_name=table_name, root=root,
+                                         db_path=db_path, market=market)
+            cache.merge_dataframe(df)
+            cache.mark_covered(trade_date, trade_date)
+            updated += 1
+        return updated
+
+    return append_bars_many(db_path or get_cache_path(project_name), bars_by_table)
+
+
+def run_eod_append(markets: Iterable[str] = EOD_MARKETS, now: Optional[datetime] = None) -> Dict[str, int]:
+    """
+    Keep all cached daily histories current from one spot snapshot per market.
+
+    Markets whose session has not closed yet today are skipped, since their
+    snapshot is not a final bar. Per-symbol history calls are then only needed
+    to backfill gaps.
+
+    Returns:
+        Dict[str, int]: The number of history caches updated per market.
+    """
+    from openbb_akshare.utils.fetch_quote import get_data
+    from openbb_akshare.utils.trading_calendar import exchange_now, get_trading_calendar
+
+    result = {}
+    for market in markets:
+        calendar = get_trading_calendar(market)
+        local_now = now or exchange_now()
+        trade_date = calendar.previous_close(local_now)
+        if trade_date != local_now.date():
+            logger.info(f"The {market} session of {local_now.date()} has not closed, skipping the end-of-day append.")
+            continue
+
+        # The quote cache may hold a snapshot from before the close, so always take a fresh one.
+        snapshot = get_data(market)
+        result[market] = append_snapshot(market, snapshot, trade_date)
+        logger.info(f"Appended the {trade_date} bars to {result[market]} {market} history caches.")
+    return result
+
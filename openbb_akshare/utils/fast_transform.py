@@ -0,0 +1,119 @@
+"""AKShare columnar transform module."""
+
+import os
+import types
+import logging
+from datetime import (
+    date as dateType,
+    datetime
+)
+from typing import Any, List, Type, Union, get_args, get_origin
+import pandas as pd
+from mysharelib.tools import setup_logger
+from openbb_akshare import project_name
+
+setup_logger(project_name)
+logger = logging.getLogger(__name__)
+
+
+def fast_transform_enabled() -> bool:
+    """Check whether the columnar transform is enabled with OPENBB_AKSHARE_FAST_TRANSFORM."""
+    return os.environ.get("OPENBB_AKSHARE_FAST_TRANSFORM", "").lower() in ("1", "true", "yes")
+
+
+def _field_types(annotation) -> set:
+    """Return the concrete types of a field annotation, without None."""
+    if get_origin(annotation) in (Union, types.UnionType):
+        return {t for arg in get_args(annotation) for t in _field_types(arg)}
+    return set() if annotation is type(None) else {annotation}
+
+
+def _validate_dates(column: pd.Series, allow_datetime: bool) -> pd.Series:
+    values = pd.to_datetime(column, errors="raise")
+    if allow_datetime and not (values.dropna().dt.normalize() == values.dropna()).all():
+        return pd.Series(values.dt.to_pydatetime(), index=column.index, dtype=object)
+    return values.dt.date
+
+
+def validate_columns(model: Type, df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Validate and coerce a frame once per column against the fields of a Data model.
+
+    Source columns are renamed with the model's ``__alias_dict__``, numeric fields
+    are converted with ``pd.to_numeric``, date fields with ``pd.to_datetime`` and
+    missing values of optional fields become None. Columns which are not model
+    fields are kept as extra fields, as with ``model_validate``.
+
+    Raises:
+        ValueError: If a required field is missing or a column cannot be converted.
+    """
+    df = df.rename(columns={source: field for field, source in model.__alias_dict__.items()})
+    df = df.loc[:, ~df.columns.duplicated()]
+    columns = {}
+    for name, field in model.model_fields.items():
+        if name not in df.columns:
+            if field.is_required():
+                raise ValueError(f"{model.__name__}: missing required column {name}")
+            continue
+        column = df[name]
+        kinds = _field_types(field.annotation)
+        if kinds & {dateType, datetime}:
+            column = _validate_dates(column, datetime in kinds)
+        elif kinds & {float, int}:
+            numeric = pd.to_numeric(column, errors="coerce")
+            if (numeric.isna() & column.notna()).any():
+                raise ValueError(f"{model.__name__}: column {name} is not numeric")
+            if kinds == {int} and (numeric.dropna() % 1 != 0).any():
+                raise ValueError(f"{model.__name__}: column {name} is not integral")
+            column = numeric
+        elif kinds == {str}:
+            column = column.where(column.isna(), column.astype(str))
+        if field.is_required() and not kinds & {float} and column.isna().any():
+            raise ValueError(f"{model.__name__}: column {name} has missing values")
+        columns[name] = column
+
+    result = (df.assign(**columns) if columns else df).astype(object)
+    # Required float fields accept NaN like model_validate does; everything else missing becomes None.
+    keep_nan = [name for name, field in model.model_fields.items()
+                if name in result.columns and field.is_required() and float in _field_types(field.annotation)]
+    missing = result.isna()
+    missing[keep_nan] = False
+    return result.mask(missing, None)
+
+
+class ColumnarResults(list):
+    """
+    Data models built from validated columns, without validating each row again.
+
+    This is a plain list of models, so it can be returned from ``transform_data``
+    and serialized like any other results. ``to_dataframe`` returns the validated
+    columns without going through the models.
+    """
+
+    def __init__(self, model: Type, df: pd.DataFrame):
+        self.model = model
+        self._df = df.reset_index(drop=True)
+        fields_set = set(df.columns) & set(model.model_fields)
+        columns = list(self._df.columns)
+        super().__init__(
+            model.model_construct(_fields_set=fields_set, **dict(zip(columns, values)))
+            for values in zip(*(self._df[col].tolist() for col in columns))
+        )
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """Return the validated columns as a DataFrame."""
+        return self._df.copy()
+
+
+def columnar_transform(model: Type, df: pd.DataFrame) -> Union[ColumnarResults, List[Any]]:
+    """
+    Transform a trusted frame into Data models, validating it once per column.
+
+    If the frame does not pass the column-level validation, the rows are
+    validated one by one with ``model_validate`` instead.
+    """
+    try:
+        return ColumnarResults(model, validate_columns(model, df))
+    except (ValueError, TypeError) as e:
+        logger.warning(f"Columnar validation failed, validating rows instead: {e}")
+        return [model.model_validate(d) for d in df.to_dict(orient="records")]
@@ -1,4 +1,7 @@
+import os
 import json
+import time
+from typing import Dict, List, Optional, Tuple
 import pandas as pd
 import akshare as ak
 import logging
@@ -33,16 +36,46 @@ EQUITY_INFO_SCHEMA = {
     "actual_issue_vol": "INTEGER",
     "reg_asset": "REAL",
     "issue_price": "REAL",
-    "currency": "TEXT"
+    "currency": "TEXT",
+    "fetched_at": "REAL"
 }
 
+# Seconds after which a cached profile is fetched again. Rows cached before
+# fetched_at was recorded count as stale.
+EQUITY_INFO_MAX_AGE = float(os.environ.get("OPENBB_AKSHARE_EQUITY_INFO_MAX_AGE", 30 * 24 * 60 * 60))
+
+# Profiles refreshed per run of refresh_stale_equity_info.
+REFRESH_BATCH = 200
+
 def serialize_dict_fields(d):
     return {k: json.dumps(v) if isinstance(v, dict) else v for k, v in d.items()}
 
+def _add_fetched_at(conn):
+    """Add the fetched_at column to equity_info tables created before it existed."""
+    columns = [row[1] for row in conn.execute("PRAGMA table_info(equity_info)")]
+    if "fetched_at" not in columns:
+        conn.execute("ALTER TABLE equity_info ADD COLUMN fetched_at REAL")
+
+def get_equity_info_cache():
+    """Return the equity_info table cache, migrated to the current schema."""
+    from openbb_akshare.utils.cache_db import get_table_cache, init_once
+
+    cache = get_table_cache(EQUITY_INFO_SCHEMA, "equity_info", primary_key="symbol")
+    init_once(cache.db_path, "equity_info.fetched_at", _add_fetched_at)
+    return cache
+
+def is_fresh(fetched_at, max_age: float = EQUITY_INFO_MAX_AGE) -> bool:
+    """Check whether a profile fetched at a POSIX timestamp is younger than max_age."""
+    return fetched_at is not None and not pd.isna(fetched_at) and time.time() - fetched_at < max_age
+
 def fetch_equity_info(symbol: str, api_key: str | None = None, use_cache: bool = True) -> pd.DataFrame:
     """
     Fetches detailed information about a specific equity symbol.
 
+    Concurrent calls for the same symbol are coalesced into one upstream request.
+    Cached profiles older than EQUITY_INFO_MAX_AGE are fetched again; if that
+    fails, the stale profile is returned, and without one the error is raised.
+
     Args:
         symbol (str): The stock symbol to fetch information for.
                       such as "601127.SH".
@@ -50,18 +83,23 @@ def fetch_equity_info(symbol: str, api_key: str | None = None, use_cache: bool =
     Returns:
         dict: A dictionary containing the equity information.
     """
-    from mysharelib.table_cache import TableCache
+    from mysharelib.tools import normalize_symbol
+    from openbb_akshare.utils.single_flight import single_flight
+
+    symbol_b, symbol_f, market = normalize_symbol(symbol)
+    return single_flight(f"equity_info_{symbol_f}_{use_cache}", _load_equity_info, symbol, api_key, use_cache)
+
+def _load_equity_info(symbol: str, api_key: str | None = None, use_cache: bool = True) -> pd.DataFrame:
+    from openbb_akshare.utils.concurrency import host_slot
     from mysharelib.tools import normalize_symbol
 
     symbol_b, symbol_f, market = normalize_symbol(symbol)
-    cache = TableCache(EQUITY_INFO_SCHEMA, project=project_name, table_name="equity_info", primary_key="symbol")
+    cache = get_equity_info_cache()
 
-    if use_cache:
-        data = cache.read_dataframe()
-        result = data[data["symbol"] == symbol_f]
-        if not result.empty:
-            #logger.info(f"Using cached equity info for symbol: {symbol_f}")
-            return result
+    cached = cache.read_rows({"symbol": symbol_f})
+    if use_cache and not cached.empty and is_fresh(cached["fetched_at"].iloc[0]):
+        #logger.info(f"Using cached equity info for symbol: {symbol_f}")
+        return cached
 
     columns = list(EQUITY_INFO_SCHEMA.keys())
     equity_info = pd.DataFrame(columns=columns)
@@ -69,7 +107,8 @@ def fetch_equity_info(symbol: str, api_key: str | None = None, use_cache: bool =
         if api_key:
             ak.stock.cons.xq_a_token = api_key
         if market == "HK":
-            stock_individual_basic_info_hk_xq_df = ak.stock_individual_basic_info_hk_xq(symbol=symbol_b)
+            with host_slot("xueqiu"):
+                stock_individual_basic_info_hk_xq_df = ak.stock_individual_basic_info_hk_xq(symbol=symbol_b)
             hk_data = stock_individual_basic_info_hk_xq_df.set_index("item").T
             row = {}
             row["symbol"] = symbol_f
@@ -96,24 +135,148 @@ def fetch_equity_info(symbol: str, api_key: str | None = None, use_cache: bool =
             row["reg_asset"] = 0.0
             row["issue_price"] = hk_data["ispr"].iloc[0]
             row["currency"] = "HKD"
+            row["fetched_at"] = time.time()
             equity_info.loc[len(equity_info)] = row
             cache.update_or_insert(equity_info)
         else:
-            stock_individual_basic_info_xq_df = ak.stock_individual_basic_info_xq(symbol=f"{market}{symbol_b}")
-            keys = list(EQUITY_INFO_SCHEMA.keys())
-            equity_info=stock_individual_basic_info_xq_df.set_index("item").T[keys[1:]]
+            with host_slot("xueqiu"):
+                stock_individual_basic_info_xq_df = ak.stock_individual_basic_info_xq(symbol=f"{market}{symbol_b}")
+            keys = [key for key in EQUITY_INFO_SCHEMA if key not in ("symbol", "fetched_at")]
+            equity_info=stock_individual_basic_info_xq_df.set_index("item").T[keys]
 
             serialized_data = [serialize_dict_fields(item) for item in equity_info.to_dict(orient="records")]
-            df = pd.DataFrame([{"symbol": symbol_f, **serialized_data[0]}])
+            df = pd.DataFrame([{"symbol": symbol_f, **serialized_data[0], "fetched_at": time.time()}])
             cache.update_or_insert(df)
     except Exception as e:
-        print(f"Error fetching equity info for {symbol}: {e}")
-        return pd.DataFrame(columns=columns)
+        if use_cache and not cached.empty:
+            logger.warning(f"Error fetching equity info for {symbol}, using the stale profile: {e}")
+            return cached
+        raise
 
-    data = cache.read_dataframe()
-    result = data[data["symbol"] == symbol_f]
+    result = cache.read_rows({"symbol": symbol_f})
     result["listed_date"] = pd.to_datetime(result["listed_date"], unit='ms')
     result["established_date"] = pd.to_datetime(result["established_date"], unit='ms')
     # logger.info(f"Fetched equity info for symbol: {symbol_f}")
 
     return result
+
+def fetch_equity_info_many(symbols: List[str], api_key: str | None = None, use_cache: bool = True,
+                           window: Optional[int] = None) -> pd.DataFrame:
+    """
+    Fetches the equity information of several symbols.
+
+    This is ``fetch_equity_info_batch`` without the per-symbol errors, which are
+    logged instead.
+
+    Returns:
+        DataFrame: One row per symbol found, in request order, as stored in the cache.
+    """
+    found, errors = fetch_equity_info_batch(symbols, api_key, use_cache, window)
+    for symbol, error in errors.items():
+        logger.warning(f"Error fetching equity info for {symbol}: {error}")
+    return found
+
+def fetch_equity_info_batch(symbols: List[str], api_key: str | None = None, use_cache: bool = True,
+                            window: Optional[int] = None) -> Tuple[pd.DataFrame, Dict[str, Exception]]:
+    """
+    Fetches the equity information of several symbols, with the error of each symbol which failed.
+
+    Cached rows are read with indexed lookups on the symbol, and only the missing
+    or stale symbols are fetched, concurrently with ``map_on_host``, so at most
+    the Xueqiu host limit of calls is in flight. Stale rows which cannot be
+    fetched again are returned as they are, and symbols which fail are left out
+    of the rows, so one failure never fails the whole batch.
+
+    Args:
+        symbols (List[str]): The stock symbols, such as ["601127.SH", "00700.HK"].
+        window (int): Maximum number of fetches submitted at a time. Background jobs
+                      set it, so requests are not queued behind a whole batch.
+
+    Returns:
+        Tuple[DataFrame, Dict[str, Exception]]: One row per symbol found, in request
+        order, as stored in the cache, and the exception of each symbol which
+        failed, keyed by the normalized symbol, or by the symbol as given if it
+        could not be normalized.
+    """
+    from functools import partial
+    from mysharelib.tools import normalize_symbol
+    from openbb_akshare.utils.concurrency import map_on_host
+
+    errors: Dict[str, Exception] = {}
+    symbols_f = []
+    for symbol in symbols:
+        try:
+            symbols_f.append(normalize_symbol(symbol)[1])
+        except Exception as e:
+            errors[symbol] = e
+    symbols_f = list(dict.fromkeys(symbols_f))
+    cache = get_equity_info_cache()
+
+    found = cache.read_rows_in("symbol", symbols_f) if use_cache else pd.DataFrame(columns=["symbol", "fetched_at"])
+    found = found[found["fetched_at"].map(is_fresh).astype(bool)]
+    hits = set(found["symbol"])
+    missing = [symbol for symbol in symbols_f if symbol not in hits]
+    if missing:
+        fetch = partial(fetch_equity_info, api_key=api_key, use_cache=use_cache)
+        for symbol, (_, error) in zip(missing, map_on_host("xueqiu", fetch, missing, window)):
+            if error is not None:
+                errors[symbol] = error
+        fetched = cache.read_rows_in("symbol", missing)
+        frames = [df for df in (found, fetched) if not df.empty]
+        found = pd.concat(frames, ignore_index=True) if frames else fetched
+
+    order = {symbol: i for i, symbol in enumerate(symbols_f)}
+    found = found.drop_duplicates("symbol")
+    return found.iloc[found["symbol"].map(order).argsort()].reset_index(drop=True), errors
+
+def refresh_stale_equity_info(limit: int = REFRESH_BATCH, max_age: float = EQUITY_INFO_MAX_AGE,
+                              api_key: str | None = None) -> int:
+    """
+    Fetch again the oldest cached profiles which are older than max_age.
+
+    Meant to be run periodically, e.g. from a scheduler, so that profiles are
+    renewed a batch at a time instead of expiring all at once on the request path.
+
+    Returns:
+        int: The number of profiles refreshed.
+    """
+    from openbb_akshare.utils.cache_db import get_connection
+    from openbb_akshare.utils.concurrency import HOST_LIMITS
+
+    cache = get_equity_info_cache()
+    with get_connection(cache.db_path) as conn:
+        rows = conn.execute(
+            "SELECT symbol, fetched_at FROM equity_info WHERE fetched_at IS NULL OR fetched_at < ? "
+            "ORDER BY fetched_at IS NOT NULL, fetched_at LIMIT ?",
+            (time.time() - max_age, limit),
+        ).fetchall()
+    if not rows:
+        return 0
+    previous = dict(rows)
+    refreshed = fetch_equity_info_many(list(previous), api_key=api_key, use_cache=False,
+                                       window=HOST_LIMITS["xueqiu"])
+    count = sum(fetched_at != previous.get(symbol) and is_fresh(fetched_at, max_age)
+                for symbol, fetched_at in zip(refreshed["symbol"], refreshed["fetched_at"]))
+    logger.info(f"Refreshed {count} of {len(rows)} stale equity profiles.")
+    return count
+
+def prefetch_equity_info(symbols: Optional[List[str]] = None, api_key: str | None = None) -> int:
+    """
+    Fill the equity_info cache for the whole A+H universe, or for the given symbols.
+
+    Profiles which are cached and fresh are skipped, so an interrupted prefetch
+    resumes where it stopped. Only the Xueqiu host limit of fetches is submitted
+    at a time, so profile requests are served in between.
+
+    Returns:
+        int: The number of symbols with a cached profile afterwards.
+    """
+    from openbb_akshare.utils.concurrency import HOST_LIMITS
+
+    if symbols is None:
+        from openbb_akshare.utils.ak_equity_search import get_symbols
+
+        universe = get_symbols()
+        symbols = [f"{symbol}.HK" if exchange == "HKEX" else symbol
+                   for symbol, exchange in zip(universe["symbol"], universe["exchange"])]
+    return len(fetch_equity_info_many(symbols, api_key=api_key, window=HOST_LIMITS["xueqiu"]))
@@ -1,33 +1,92 @@
-import sqlite3
+import os
 import pandas as pd
 import time
-import pickle
 import logging
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
 from mysharelib.tools import setup_logger
 from openbb_akshare import project_name
+from openbb_akshare.utils.cache_db import MAX_SQL_PARAMS
 
 setup_logger(project_name)
 
-CACHE_TTL = 60*60  # 60 seconds
+# Seconds a snapshot stays fresh during the opening auction and continuous trading.
+# In the lunch break and after the close it stays fresh until the market reopens.
+TRADING_TTL = int(os.environ.get("OPENBB_AKSHARE_QUOTE_TTL", 60))
 logger = logging.getLogger(__name__)
 
+QUOTE_TABLE = "equity_quote_rows"
+SNAPSHOT_TABLE = "equity_quote_snapshots"
+
+# Spot snapshot columns and their columns in the quote table.
+QUOTE_COLUMNS = {
+    "序号": "position",
+    "代码": "code",
+    "名称": "name",
+    "最新价": "last_price",
+    "涨跌幅": "change_percent",
+    "涨跌额": "change",
+    "成交量": "volume",
+    "成交额": "amount",
+    "振幅": "amplitude",
+    "最高": "high",
+    "最低": "low",
+    "今开": "open",
+    "昨收": "prev_close",
+    "量比": "volume_ratio",
+    "换手率": "turnover_rate",
+    "市盈率-动态": "pe_ttm",
+    "市净率": "pb",
+    "总市值": "market_cap",
+    "流通市值": "float_market_cap",
+    "涨速": "speed",
+    "5分钟涨跌": "change_5m",
+    "60日涨跌幅": "change_60d",
+    "年初至今涨跌幅": "change_ytd",
+}
+
+
+# Process-local snapshots per market: (timestamp, snapshot, code -> row position).
+_snapshots: Dict[str, Tuple[float, pd.DataFrame, Dict[str, int]]] = {}
+_snapshots_lock = threading.Lock()
+# Markets with a background refresh in flight.
+_refreshing = set()
+
 def get_connection():
-    from mysharelib import get_cache_path
-    db_path = get_cache_path(project_name)
+    from openbb_akshare.utils.cache_db import get_connection as get_pooled_connection
 
-    return sqlite3.connect(db_path)
+    return get_pooled_connection()
 
 def init_cache_table():
-    with get_connection() as conn:
-        cursor = conn.cursor()
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS equity_quote (
-                key TEXT PRIMARY KEY,
-                timestamp REAL,
-                data BLOB
-            )
-        ''')
-        conn.commit()
+    from openbb_akshare.utils.cache_db import get_db_path, init_once
+
+    init_once(get_db_path(), QUOTE_TABLE, _create_quote_tables)
+
+def _create_quote_tables(conn):
+    columns = ", ".join(
+        f"{col} {'TEXT' if col in ('code', 'name') else 'INTEGER' if col == 'position' else 'REAL'}"
+        for col in QUOTE_COLUMNS.values()
+    )
+    cursor = conn.cursor()
+    cursor.execute(f'''
+        CREATE TABLE IF NOT EXISTS {QUOTE_TABLE} (
+            market TEXT,
+            {columns},
+            PRIMARY KEY (market, code)
+        )
+    ''')
+    cursor.execute(f"CREATE INDEX IF NOT EXISTS idx_{QUOTE_TABLE}_code ON {QUOTE_TABLE} (code)")
+    cursor.execute(f'''
+        CREATE TABLE IF NOT EXISTS {SNAPSHOT_TABLE} (
+            market TEXT PRIMARY KEY,
+            timestamp REAL,
+            rows INTEGER
+        )
+    ''')
+    conn.commit()
+
+def _market_code(market) -> str:
+    return "SH" if market == "SS" else market
 
 def get_data(market):
     import akshare as ak
@@ -61,52 +120,226 @@ def get_exchange_name(market):
     else:
         raise ValueError(f"Unsupported market: {market}")
 
-def get_primary_key(market):
-    if market == "HK":
-        return "equity_quote_HK"
-    elif market == "SH" or market == "SS":
-        return "equity_quote_SH"
-    elif market == "SZ":
-        return "equity_quote_SZ"
-    elif market == "BJ":
-        return "equity_quote_BJ"
-    else:
-        raise ValueError(f"Unsupported market: {market}")
+def _remember_snapshot(market, timestamp, df) -> Tuple[float, pd.DataFrame, Dict[str, int]]:
+    index = {code: i for i, code in enumerate(df["代码"].astype(str))} if "代码" in df.columns else {}
+    entry = (timestamp, df, index)
+    with _snapshots_lock:
+        _snapshots[market] = entry
+    return entry
 
-def load_cached_data(market, use_cache=True)->pd.DataFrame:
+def write_snapshot(market, df: pd.DataFrame, timestamp: Optional[float] = None):
+    """
+    Replace the rows of a market in the quote table with a snapshot, in one transaction.
+
+    An empty snapshot is not written, so the stored one is kept. Raises ValueError
+    for an unsupported market.
+    """
+    get_exchange_name(market)
+    rows = df.rename(columns=QUOTE_COLUMNS)
+    columns = [col for col in QUOTE_COLUMNS.values() if col in rows.columns]
+    if rows.empty or not columns:
+        logger.warning(f"Not storing an empty {market} quote snapshot.")
+        return
+    timestamp = time.time() if timestamp is None else timestamp
+    rows = rows[columns].astype(object).where(rows[columns].notna(), None)
+    with get_connection() as conn:
+        conn.execute(f"DELETE FROM {QUOTE_TABLE} WHERE market=?", (_market_code(market),))
+        conn.executemany(
+            f"INSERT OR REPLACE INTO {QUOTE_TABLE} (market, {', '.join(columns)}) "
+            f"VALUES ({', '.join(['?'] * (len(columns) + 1))})",
+            ((_market_code(market), *row) for row in rows.itertuples(index=False, name=None)),
+        )
+        conn.execute(f"INSERT OR REPLACE INTO {SNAPSHOT_TABLE} (market, timestamp, rows) VALUES (?, ?, ?)",
+                     (_market_code(market), timestamp, len(rows)))
+        conn.commit()
+
+def snapshot_timestamp(market) -> Optional[float]:
+    """Return the time the stored snapshot of a market was downloaded."""
+    with get_connection() as conn:
+        row = conn.execute(f"SELECT timestamp FROM {SNAPSHOT_TABLE} WHERE market=?", (_market_code(market),)).fetchone()
+    return row[0] if row else None
+
+def _read_rows(conn, where: str, params: List) -> pd.DataFrame:
+    df = pd.read_sql_query(f"SELECT * FROM {QUOTE_TABLE} WHERE {where} ORDER BY market, position", conn, params=params)
+    # Columns which a market does not have, e.g. pe_ttm for HK, are all empty.
+    df = df.drop(columns=["market"]).dropna(axis=1, how="all")
+    return df.rename(columns={col: source for source, col in QUOTE_COLUMNS.items()})
+
+def query_quotes(codes: Iterable[str], market: Optional[str] = None) -> pd.DataFrame:
+    """
+    Read the stored quotes of several codes with indexed lookups.
+
+    This reads only the requested rows, so other processes can use it without
+    loading whole snapshots. It does not check the TTL or refresh the snapshot.
+    """
+    codes = list(codes)
+    frames = []
+    with get_connection() as conn:
+        for i in range(0, len(codes), MAX_SQL_PARAMS):
+            chunk = codes[i:i + MAX_SQL_PARAMS]
+            where = f"code IN ({', '.join(['?'] * len(chunk))})"
+            params = list(chunk)
+            if market is not None:
+                where += " AND market=?"
+                params.append(_market_code(market))
+            frames.append(_read_rows(conn, where, params))
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
+def quote_expires_at(market, fetched_at: float) -> float:
+    """
+    Return the time a snapshot downloaded at ``fetched_at`` goes stale.
+
+    Expiry follows the market phase at download time: TRADING_TTL during the
+    opening auction and continuous trading, and the start of the next phase
+    otherwise, so a snapshot taken after the close is kept until the next open.
+    """
+    from openbb_akshare.utils.trading_calendar import exchange_time, exchange_timestamp, get_trading_calendar
+
+    phase, phase_end = get_trading_calendar(_market_code(market)).market_phase(exchange_time(fetched_at))
+    expires_at = exchange_timestamp(phase_end)
+    if phase in ("pre_open", "trading"):
+        expires_at = min(expires_at, fetched_at + TRADING_TTL)
+    return expires_at
+
+def _is_fresh(market, fetched_at: float) -> bool:
+    return time.time() < quote_expires_at(market, fetched_at)
+
+def _is_trading(market) -> bool:
+    from openbb_akshare.utils.trading_calendar import get_trading_calendar
+
+    return get_trading_calendar(_market_code(market)).market_phase()[0] == "trading"
+
+def _download_snapshot(market) -> Tuple[float, pd.DataFrame, Dict[str, int]]:
+    from openbb_akshare.utils.concurrency import host_slot
+
+    logger.info("Generating new data...")
+    init_cache_table()
+    now = time.time()
+    with host_slot("eastmoney"):
+        df = get_data(market)
+    write_snapshot(market, df, now)
+    _record_tape(market, df, now)
+    return _remember_snapshot(market, now, df)
+
+def _record_tape(market, df: pd.DataFrame, timestamp: float):
+    """Append a downloaded snapshot to the intraday quote tape when it is enabled."""
+    from openbb_akshare.utils.quote_tape import record_snapshot, tape_enabled
+
+    if not tape_enabled():
+        return
+    try:
+        record_snapshot(market, df, timestamp)
+    except Exception as e:
+        logger.warning(f"Recording the {market} snapshot on the quote tape failed: {e}")
+
+def _refresh_in_background(market):
+    """Refresh a stale snapshot on the shared executor, at most once at a time per market."""
+    from openbb_akshare.utils.concurrency import get_executor
+    from openbb_akshare.utils.single_flight import single_flight
+
+    with _snapshots_lock:
+        if market in _refreshing:
+            return
+        _refreshing.add(market)
+
+    def refresh():
+        try:
+            # The same key as foreground loads, so only one load runs across threads and processes.
+            single_flight(f"quote_snapshot_{_market_code(market)}", _load_stale_snapshot, market, False)
+        except Exception as e:
+            logger.warning(f"Background refresh of the {market} snapshot failed: {e}")
+        finally:
+            with _snapshots_lock:
+                _refreshing.discard(market)
+
+    get_executor().submit(refresh)
+
+def load_snapshot(market, use_cache=True) -> Tuple[float, pd.DataFrame, Dict[str, int]]:
+    """
+    Load the spot snapshot of a market with its code index.
+
+    Snapshots are kept in process memory in front of the SQLite quote table, and
+    expire as given by ``quote_expires_at``. During continuous trading an expired
+    snapshot is returned at once while a single background task refreshes it.
+    Concurrent loads of an expired snapshot are coalesced into one.
+
+    Returns:
+        Tuple: The download timestamp, the snapshot and a code -> row position index.
+    """
     if not use_cache:
         logger.info("Cache disabled, fetching fresh data...")
-        return get_data(market)
-    
-    key=get_primary_key(market)
-    init_cache_table()
+        return _download_snapshot(market)
 
-    now = time.time()
+    with _snapshots_lock:
+        entry = _snapshots.get(market)
+    if entry and _is_fresh(market, entry[0]):
+        return entry
+
+    if entry is None or not _is_trading(market):
+        from openbb_akshare.utils.single_flight import single_flight
+
+        entry = single_flight(f"quote_snapshot_{_market_code(market)}", _load_stale_snapshot, market, True)
+    if not _is_fresh(market, entry[0]):
+        _refresh_in_background(market)
+    return entry
+
+def _load_stored_snapshot(market, entry):
+    """Return the stored snapshot if it is newer than the one in memory and still usable, else ``entry``."""
+    init_cache_table()
+    timestamp = snapshot_timestamp(market)
+    if timestamp is None or (entry is not None and timestamp <= entry[0]):
+        return entry
+    if not (_is_fresh(market, timestamp) or _is_trading(market)):
+        return entry
+    logger.info("Loading from SQLite cache...")
     with get_connection() as conn:
-        cursor = conn.cursor()
-        cursor.execute('SELECT timestamp, data FROM equity_quote WHERE key=?', (key,))
-        row = cursor.fetchone()
+        df = _read_rows(conn, "market=?", [_market_code(market)])
+    return _remember_snapshot(market, timestamp, df)
 
-        if row:
-            timestamp, data_blob = row
-            if now - timestamp < CACHE_TTL:
-                logger.info("Loading from SQLite cache...")
-                return pickle.loads(data_blob)
+def _load_stale_snapshot(market, serve_stale: bool) -> Tuple[float, pd.DataFrame, Dict[str, int]]:
+    """
+    Load a snapshot which is not fresh in memory from SQLite or upstream.
 
-        logger.info("Generating new data...")
-        df = get_data(market)
+    This runs under the snapshot's single-flight lock, so the stored timestamp is
+    checked again first: a load that waited for another thread or process finds
+    its download instead of repeating it. With ``serve_stale`` a stale snapshot
+    is returned during continuous trading rather than downloading.
+    """
+    with _snapshots_lock:
+        entry = _snapshots.get(market)
+    if entry and _is_fresh(market, entry[0]):
+        return entry
 
-        # 序列化 DataFrame
-        data_blob = pickle.dumps(df)
+    entry = _load_stored_snapshot(market, entry)
+    if entry is not None and (_is_fresh(market, entry[0]) or (serve_stale and _is_trading(market))):
+        return entry
+    return _download_snapshot(market)
 
-        # 更新或插入缓存
-        cursor.execute('''
-            INSERT OR REPLACE INTO equity_quote (key, timestamp, data)
-            VALUES (?, ?, ?)
-        ''', (key, now, data_blob))
+def load_cached_data(market, use_cache=True)->pd.DataFrame:
+    """Load the spot snapshot of a market. The frame is shared and must not be modified in place."""
+    return load_snapshot(market, use_cache)[1]
 
-        conn.commit()
-        return df
+def lookup_quotes(market, codes: Iterable[str], use_cache=True) -> pd.DataFrame:
+    """
+    Return the snapshot rows of several codes of one market, in request order.
+
+    Each code is a single lookup in the code index of the in-memory snapshot, or
+    an indexed read of the quote table if the snapshot is not loaded in this
+    process. Codes which are not in the snapshot are skipped.
+    """
+    codes = list(codes)
+    with _snapshots_lock:
+        entry = _snapshots.get(market)
+    if use_cache and entry is None:
+        # Only the requested rows are read while the stored snapshot is fresh.
+        init_cache_table()
+        timestamp = snapshot_timestamp(market)
+        if timestamp is not None and _is_fresh(market, timestamp):
+            quotes = query_quotes(codes, market).set_index("代码", drop=False)
+            return quotes.loc[[code for code in codes if code in quotes.index]].reset_index(drop=True)
+
+    timestamp, df, index = load_snapshot(market, use_cache)
+    return df.iloc[[index[code] for code in codes if code in index]]
 
 if __name__ == "__main__":
 
@@ -11,10 +11,10 @@ from datetime import (
     timedelta
 )
 import akshare as ak
-from mysharelib.table_cache import TableCache
 import logging
 from mysharelib.tools import setup_logger, normalize_symbol
 from openbb_akshare import project_name
+from openbb_akshare.utils.history_cache import HistoryTableCache, open_history_cache
 
 setup_logger(project_name)
 logger = logging.getLogger(__name__)
@@ -32,60 +32,55 @@ EQUITY_HISTORY_SCHEMA = {
     "amount": "REAL"
 }
 
+# Minute bar intervals and the matching akshare period.
+INTRADAY_INTERVALS = {
+    "1m": "1",
+    "5m": "5",
+    "15m": "15",
+    "30m": "30",
+    "60m": "60",
+}
+
+# Trading days of minute bars upstream still serves, up to the current session.
+# Eastmoney only returns the last five days of 1-minute bars. The longer
+# intervals have no fixed window; the days before the first bar returned are
+# marked covered by ``fill_missing``, so they are not requested again either.
+INTRADAY_RETENTION_DAYS = {
+    "1m": 5,
+}
+
 def get_list_date(symbol: str, api_key: Optional[str] = "") -> dateType:
     """
-    Retrieves the listing date for a given stock symbol.
+    Retrieves the listing date for a given stock symbol from the listing index.
 
     Args:
         symbol (str): The stock symbol to fetch the listing date for.
 
     Returns:
-        Optional[str]: The listing date in 'YYYY-MM-DD' format, or None if not found.
+        date: The listing date, or one year ago if it is not known.
     """
-    from openbb_akshare.utils.fetch_equity_info import fetch_equity_info
+    from openbb_akshare.utils.listing_index import get_listing_date
 
-    equity_info = fetch_equity_info(symbol, api_key=api_key)
-    
-    # Check if we have data and it's not empty
-    if not equity_info.empty and "listed_date" in equity_info.columns:
-        listed_date = equity_info["listed_date"].iloc[0] if len(equity_info) > 0 else None
-        
-        if listed_date is not None and pd.notna(listed_date):
-            logger.info(f"Listing date for {symbol} is {listed_date}.")
-            # Handle both Series and scalar cases
-            datetime_result = pd.to_datetime(listed_date, unit='ms')
-            if isinstance(datetime_result, pd.Series):
-                return datetime_result.iloc[0].date()
-            else:
-                return datetime_result.date()
-    
-    # Fallback to 1 year ago if no listing date found
-    logger.warning(f"No listing date found for {symbol}, using fallback date.")
-    return (datetime.now() - timedelta(days=365)).date()
+    return get_listing_date(symbol)
 
 def check_cache(symbol: str, 
-        cache: TableCache,
+        cache: HistoryTableCache,
         api_key : Optional[str] = "",
         period: Optional[str] = "daily"
         ) -> bool:
     """
     Check if the cache contains the latest data for the given symbol.
+
+    Only the ranges missing from the cache, i.e. the trailing days after the last
+    covered date and any interior holes, are downloaded and merged into the cache.
     """
-    from mysharelib.tools import last_closing_day
-    from mysharelib.em.orginfo import get_listing_date
-    
-    start = get_listing_date(symbol)
-    end = last_closing_day()
-    # Please note that the format of the date string must be "YYYY-MM-DD" in database.
-    cache_df = cache.fetch_date_range(start.strftime("%Y-%m-%d"), end.strftime("%Y-%m-%d"))
-    cache_df = cache_df.set_index('date')
-    cache_df.index = pd.to_datetime(cache_df.index)
-    is_cache_valid = cache_df.index.max().date() == last_closing_day()
-    if not is_cache_valid:
-        logger.warning(f"Cache for {symbol} is not up-to-date. Last date in cache: {cache_df.index.max().date()}, expected: {last_closing_day()}.")
-        data_util_today_df = ak_download_without_cache(symbol, period=period, api_key="", start_date=start.strftime("%Y%m%d"), end_date=end.strftime("%Y%m%d"))
-        cache.write_dataframe(data_util_today_df)
-    return is_cache_valid
+    from mysharelib.tools import get_valid_date
+    from openbb_akshare.utils.listing_index import get_listing_date
+    from openbb_akshare.utils.trading_calendar import last_closing_day
+
+    start = get_valid_date(get_listing_date(symbol))
+    end = last_closing_day(normalize_symbol(symbol)[2])
+    return fill_missing(cache, symbol, start, end, api_key=api_key)
 
 def ak_download_without_cache(
         symbol: str,
@@ -113,14 +108,18 @@ def ak_download_without_cache(
         Adjustment type
     """
 
+    from openbb_akshare.utils.concurrency import host_slot
+
     symbol_b, symbol_f, market = normalize_symbol(symbol)
     if market == "HK":
-        hist_df = ak.stock_hk_hist(symbol_b, period, start_date, end_date, adjust=adjust)
+        with host_slot("eastmoney"):
+            hist_df = ak.stock_hk_hist(symbol_b, period, start_date, end_date, adjust=adjust)
         hist_df.rename(columns={"日期": "date", "开盘": "open", "收盘": "close", "最高": "high", "最低": "low", "成交量": "volume", "成交额": "amount", "涨跌幅":"change_percent", "涨跌额": "change"}, inplace=True)
         hist_df = hist_df.drop(columns=["振幅"])
         hist_df = hist_df.drop(columns=["换手率"])
     else:
-        hist_df = ak.stock_zh_a_hist(symbol_b, period, start_date, end_date, adjust=adjust)
+        with host_slot("eastmoney"):
+            hist_df = ak.stock_zh_a_hist(symbol_b, period, start_date, end_date, adjust=adjust)
     
         hist_df.rename(columns={"日期": "date", "开盘": "open", "收盘": "close", "最高": "high", "最低": "low", "成交量": "volume", "成交额": "amount", "涨跌幅":"change_percent", "涨跌额": "change"}, inplace=True)
         hist_df = hist_df.drop(columns=["股票代码"])
@@ -129,6 +128,208 @@ def ak_download_without_cache(
 
     return hist_df
 
+# Pandas period frequency of each resampled bar period.
+RESAMPLE_PERIODS = {
+    "weekly": "W-SUN",
+    "monthly": "M",
+}
+
+def period_start(day: dateType, period: str) -> dateType:
+    """Return the first calendar day of the weekly or monthly bucket containing day."""
+    return pd.Timestamp(day).to_period(RESAMPLE_PERIODS[period]).start_time.date()
+
+def resample_history(df: DataFrame, period: str) -> DataFrame:
+    """
+    Resamples daily bars into weekly or monthly bars.
+
+    Each bar is labelled with the last trading day of its calendar week or month,
+    as the upstream weekly and monthly endpoints do. Prices are aggregated as OHLC,
+    volume and amount are summed, and change/change_percent are recomputed against
+    the previous bar's close. The first bar uses the previous close implied by its
+    first daily bar, so no history before the first bucket is needed.
+
+    Parameters:
+        df (DataFrame): Daily bars as returned by ``ak_download``.
+        period (str): "weekly" or "monthly".
+    """
+    if period == "daily" or df.empty:
+        return df
+
+    df = df.sort_values("date")
+    dates = pd.to_datetime(df["date"])
+    grouped = df.assign(date=dates).groupby(dates.dt.to_period(RESAMPLE_PERIODS[period]).to_numpy(), sort=True)
+    bars = grouped.agg(
+        date=("date", "last"),
+        open=("open", "first"),
+        high=("high", "max"),
+        low=("low", "min"),
+        close=("close", "last"),
+        volume=("volume", "sum"),
+        amount=("amount", "sum"),
+        first_close=("close", "first"),
+        first_change=("change", "first"),
+    ).reset_index(drop=True)
+
+    prev_close = bars["close"].shift(1)
+    prev_close.iloc[0] = bars["first_close"].iloc[0] - bars["first_change"].iloc[0]
+    bars["change"] = (bars["close"] - prev_close).round(4)
+    bars["change_percent"] = (bars["change"] / prev_close * 100).round(2)
+
+    return bars.drop(columns=["first_close", "first_change"])
+
+def ak_download_minutes_without_cache(
+        symbol: str,
+        start_date: dateType,
+        end_date: dateType,
+        interval: str = "5m",
+    ) -> DataFrame:
+    """
+    Downloads minute bars without using cache.
+
+    Parameters:
+        symbol (str): Stock symbol to fetch data for.
+        start_date (date): First trading day to fetch.
+        end_date (date): Last trading day to fetch.
+        interval (str): One of "1m", "5m", "15m", "30m" or "60m".
+    """
+    from openbb_akshare.utils.concurrency import host_slot
+
+    symbol_b, symbol_f, market = normalize_symbol(symbol)
+    start_str = f"{start_date.strftime('%Y-%m-%d')} 09:00:00"
+    end_str = f"{end_date.strftime('%Y-%m-%d')} 16:30:00"
+    with host_slot("eastmoney"):
+        if market == "HK":
+            hist_df = ak.stock_hk_hist_min_em(symbol_b, period=INTRADAY_INTERVALS[interval], adjust="", start_date=start_str, end_date=end_str)
+        else:
+            hist_df = ak.stock_zh_a_hist_min_em(symbol_b, start_date=start_str, end_date=end_str, period=INTRADAY_INTERVALS[interval], adjust="")
+
+    hist_df = hist_df.rename(columns={"时间": "date", "开盘": "open", "收盘": "close", "最高": "high", "最低": "low", "成交量": "volume", "成交额": "amount", "均价": "vwap", "涨跌幅": "change_percent", "涨跌额": "change"})
+    return hist_df[[col for col in EQUITY_HISTORY_SCHEMA if col in hist_df.columns]]
+
+def open_minute_cache(symbol_b: str, market: str, interval: str) -> HistoryTableCache:
+    """Return the minute bar cache of a symbol and interval, one table and manifest each."""
+    from openbb_akshare.utils.cache_db import get_table_cache
+
+    return get_table_cache(EQUITY_HISTORY_SCHEMA, f"{market}{symbol_b}_{interval}", primary_key="date",
+                           cls=HistoryTableCache, period=interval, date_format="%Y-%m-%d %H:%M:%S", market=market)
+
+def earliest_minute_day(market: str, interval: str) -> Optional[dateType]:
+    """Return the first trading day upstream still serves minute bars of an interval for, if it is limited."""
+    from openbb_akshare.utils.trading_calendar import exchange_now, get_trading_calendar
+
+    retention = INTRADAY_RETENTION_DAYS.get(interval)
+    if retention is None:
+        return None
+    calendar = get_trading_calendar(market)
+    day = exchange_now().date()
+    if not calendar.is_trading_day(day):
+        day = calendar.previous_trading_day(day)
+    for _ in range(retention - 1):
+        day = calendar.previous_trading_day(day)
+    return day
+
+def _mark_returned(cache: HistoryTableCache, symbol: str, start: dateType, end: dateType, df: DataFrame):
+    """
+    Mark the closed days from start to end which a download has answered as covered.
+
+    The range is covered from its start up to the last bar returned, so the days
+    before the first bar, e.g. before the listing or beyond what upstream keeps,
+    are not requested again, while the days after the last bar are. An empty
+    reply may be transient and covers nothing, unless the range ends before the
+    symbol was listed.
+    """
+    from openbb_akshare.utils.listing_index import get_listing
+
+    if df.empty:
+        listing = get_listing(symbol)
+        if listing is not None and listing.listed_date is not None and end < listing.listed_date:
+            cache.mark_covered(start, end)
+        return
+    last = pd.to_datetime(df["date"]).max().date()
+    if start <= min(end, last):
+        cache.mark_covered(start, min(end, last))
+
+def fill_missing(
+        cache: HistoryTableCache,
+        symbol: str,
+        start: dateType,
+        end: dateType,
+        interval: str = "1d",
+        api_key: Optional[str] = "",
+        refresh: bool = False,
+    ) -> bool:
+    """
+    Download the closed days from start to end which are missing from a history cache.
+
+    Each missing range is downloaded, merged into the cache and marked covered
+    with ``_mark_returned``. With refresh, the whole range is downloaded again.
+
+    Parameters:
+        cache (HistoryTableCache): The daily or minute bar cache of the symbol.
+        symbol (str): Stock symbol to fetch data for.
+        start (date): First day to fill.
+        end (date): Last day to fill, no later than the last closed session.
+        interval (str): "1d" for daily bars, or a minute interval such as "5m".
+
+    Returns:
+        bool: True if nothing was missing.
+    """
+    if refresh:
+        gaps = [(start, end)] if start <= end else []
+    else:
+        gaps = cache.missing_ranges(start, end)
+    for gap_start, gap_end in gaps:
+        logger.info(f"Downloading {symbol} {interval} bars from {gap_start} to {gap_end}...")
+        if interval == "1d":
+            gap_df = ak_download_without_cache(symbol, period="daily", api_key=api_key, start_date=gap_start.strftime("%Y%m%d"), end_date=gap_end.strftime("%Y%m%d"))
+        else:
+            gap_df = ak_download_minutes_without_cache(symbol, gap_start, gap_end, interval)
+        if not gap_df.empty:
+            cache.merge_dataframe(gap_df)
+        _mark_returned(cache, symbol, gap_start, gap_end, gap_df)
+    return not gaps
+
+def ak_download_minutes(
+        symbol: str,
+        start_date: Optional[dateType] = None,
+        end_date: Optional[dateType] = None,
+        interval: str = "5m",
+        use_cache: Optional[bool] = True,
+    ) -> DataFrame:
+    """
+    Downloads minute bars, using a cache partitioned by trading day.
+
+    Each symbol and interval has its own table and manifest. Trading days up to
+    the last close which returned bars are immutable and are never fetched
+    again; only the current session is refreshed on every call. Downloads start
+    no earlier than upstream keeps minute bars, while older days already cached
+    are still returned.
+    """
+    from mysharelib.tools import get_valid_date
+    from openbb_akshare.utils.trading_calendar import last_closing_day
+
+    if start_date is None:
+        start_date = datetime.now().date()
+    if end_date is None:
+        end_date = datetime.now().date()
+    start_dt = get_valid_date(start_date)
+    end_dt = get_valid_date(end_date)
+
+    symbol_b, symbol_f, market = normalize_symbol(symbol)
+    cache = open_minute_cache(symbol_b, market, interval)
+    closed_end = min(end_dt, last_closing_day(market))
+    earliest = earliest_minute_day(market, interval)
+    fetch_start = max(start_dt, earliest) if earliest else start_dt
+
+    fill_missing(cache, symbol, fetch_start, closed_end, interval=interval, refresh=not use_cache)
+
+    # The current session is still open, so it is refreshed but never marked as covered.
+    session_start = max(fetch_start, closed_end + timedelta(days=1))
+    if session_start <= end_dt:
+        cache.merge_dataframe(ak_download_minutes_without_cache(symbol_b, session_start, end_dt, interval))
+
+    return cache.fetch_date_range(f"{start_dt.strftime('%Y-%m-%d')} 00:00:00", f"{end_dt.strftime('%Y-%m-%d')} 23:59:59")
+
 def ak_download(
         symbol: str,
         start_date: Optional[dateType] = None,
@@ -137,22 +338,45 @@ def ak_download(
         use_cache: Optional[bool] = True,
         api_key: Optional[str] = "",
         adjust: Optional[str] = "",
+        interval: Optional[str] = "1d",
     ) -> DataFrame:
 
     from mysharelib.tools import get_valid_date
+    from openbb_akshare.utils.trading_calendar import last_closing_day
+
+    if interval != "1d":
+        return ak_download_minutes(symbol, start_date, end_date, interval=interval, use_cache=use_cache)
 
     if start_date is None:
         start_date = (datetime.now() - timedelta(days=365)).date()
-    if end_date is None: end_date = datetime.now().date()
+    if end_date is None:
+        end_date = datetime.now().date()
     start_dt = get_valid_date(start_date)
     end_dt = get_valid_date(end_date)
 
+    if period != "daily":
+        # Weekly and monthly bars are derived from the cached daily bars, so only
+        # daily bars are ever stored and the cache needs no period in its key.
+        daily_df = ak_download(symbol, period_start(start_dt, period), end_dt, period="daily", use_cache=use_cache, api_key=api_key, adjust=adjust)
+        bars_df = resample_history(daily_df, period)
+        if bars_df.empty:
+            return bars_df
+        return bars_df[bars_df["date"] >= pd.Timestamp(start_dt)].reset_index(drop=True)
+
+    if adjust:
+        # Only raw bars are cached; adjusted series are derived from them locally.
+        from openbb_akshare.utils.price_adjust import apply_adjustment
+        raw_df = ak_download(symbol, start_dt, end_dt, period="daily", use_cache=use_cache, api_key=api_key, adjust="")
+        return apply_adjustment(symbol, raw_df, adjust, use_cache=use_cache, api_key=api_key)
+
     # Retrieve data from cache first
     symbol_b, symbol_f, market = normalize_symbol(symbol)
-    cache = TableCache(EQUITY_HISTORY_SCHEMA, project=project_name, table_name=f"{market}{symbol_b}", primary_key="date")
-    
+    cache = open_history_cache(EQUITY_HISTORY_SCHEMA, table_name=f"{market}{symbol_b}", market=market)
+    # Bars of the current session may still change, so only closed days are cached.
+    covered_end = min(end_dt, last_closing_day(market))
+
     if use_cache:
-        check_cache(symbol=symbol_b, cache=cache, api_key=api_key, period=period)
+        fill_missing(cache, symbol, start_dt, covered_end, api_key=api_key)
         data_from_cache = cache.fetch_date_range(start_dt.strftime("%Y-%m-%d"), end_dt.strftime("%Y-%m-%d"))
         if not data_from_cache.empty:
             logger.info(f"Getting equity {symbol} historical data from cache...")
@@ -160,11 +384,141 @@ def ak_download(
 
     # If not in cache, download data
     # Download data using AKShare
-    data_util_today_df = ak_download_without_cache(symbol_b, period=period, api_key=api_key, start_date=start_dt.strftime("%Y%m%d"), end_date=end_dt.strftime("%Y%m%d"))
-    cache.write_dataframe(data_util_today_df)
+    data_util_today_df = ak_download_without_cache(symbol_b, period="daily", api_key=api_key, start_date=start_dt.strftime("%Y%m%d"), end_date=end_dt.strftime("%Y%m%d"))
+    cache.merge_dataframe(data_util_today_df)
+    _mark_returned(cache, symbol, start_dt, covered_end, data_util_today_df)
     
     return cache.fetch_date_range(start_dt.strftime("%Y-%m-%d"), end_dt.strftime("%Y-%m-%d"))
 
+def is_history_cached(
+        symbol: str,
+        start_date: Optional[dateType] = None,
+        end_date: Optional[dateType] = None,
+        period: Optional[str] = "daily",
+        interval: Optional[str] = "1d",
+    ) -> bool:
+    """
+    Check whether the bars of a symbol are fully cached for a date range.
+
+    This is a single manifest lookup and never touches the network.
+    """
+    from mysharelib.tools import get_valid_date
+    from openbb_akshare.utils.trading_calendar import last_closing_day
+
+    symbol_b, symbol_f, market = normalize_symbol(symbol)
+    if interval != "1d":
+        # The open session of minute bars is always refreshed.
+        if end_date is None or get_valid_date(end_date) > last_closing_day(market):
+            return False
+        start_dt = get_valid_date(start_date or end_date)
+        earliest = earliest_minute_day(market, interval)
+        if earliest and earliest > start_dt:
+            start_dt = earliest
+        return open_minute_cache(symbol_b, market, interval).is_cached(start_dt, get_valid_date(end_date))
+
+    if start_date is None:
+        start_date = (datetime.now() - timedelta(days=365)).date()
+    if end_date is None:
+        end_date = datetime.now().date()
+    start_dt = get_valid_date(start_date)
+    if period != "daily":
+        start_dt = period_start(start_dt, period)
+    covered_end = min(get_valid_date(end_date), last_closing_day(market))
+
+    cache = open_history_cache(EQUITY_HISTORY_SCHEMA, table_name=f"{market}{symbol_b}", market=market)
+    return start_dt > covered_end or cache.is_cached(start_dt, covered_end)
+
+def _concat_symbol_frames(symbols: List[str], frames: Dict[str, DataFrame]) -> DataFrame:
+    """Concatenates per-symbol bars in request order into one long-format frame."""
+    results = [frames[symbol].assign(symbol=symbol) for symbol in symbols if symbol in frames and not frames[symbol].empty]
+    if not results:
+        return DataFrame()
+    return pd.concat(results, ignore_index=True)
+
+def ak_download_many(
+        symbols: List[str],
+        start_date: Optional[dateType] = None,
+        end_date: Optional[dateType] = None,
+        period: Optional[str] = "daily",
+        use_cache: Optional[bool] = True,
+        api_key: Optional[str] = "",
+        adjust: Optional[str] = "",
+        interval: Optional[str] = "1d",
+    ) -> DataFrame:
+    """
+    Downloads historical equity data of several symbols as one long-format frame.
+
+    This is ``aak_download_many`` for synchronous callers. When an event loop is
+    already running in the calling thread, e.g. in Jupyter, the batch runs on a
+    thread of its own, since ``asyncio.run`` cannot be nested.
+
+    Returns:
+        DataFrame: The bars of all symbols with an additional ``symbol`` column.
+    """
+    import asyncio
+    from concurrent.futures import ThreadPoolExecutor
+
+    def run() -> DataFrame:
+        return asyncio.run(aak_download_many(symbols, start_date, end_date, period=period, use_cache=use_cache, api_key=api_key, adjust=adjust, interval=interval))
+
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return run()
+    with ThreadPoolExecutor(max_workers=1) as runner:
+        return runner.submit(run).result()
+
+async def aak_download_many(
+        symbols: List[str],
+        start_date: Optional[dateType] = None,
+        end_date: Optional[dateType] = None,
+        period: Optional[str] = "daily",
+        use_cache: Optional[bool] = True,
+        api_key: Optional[str] = "",
+        adjust: Optional[str] = "",
+        interval: Optional[str] = "1d",
+    ) -> DataFrame:
+    """
+    Downloads historical equity data of several symbols as one long-format frame.
+
+    Each symbol is first looked up in the cache on the shared executor, and the
+    fully cached ones are read there as soon as they are known. The misses are
+    downloaded on the Eastmoney host executor, so a cold batch waits for the host
+    limit there instead of holding shared workers, and other requests are not
+    queued behind it. The event loop is never blocked by akshare's synchronous
+    HTTP. Symbols which fail are logged and skipped.
+
+    Returns:
+        DataFrame: The bars of all symbols with an additional ``symbol`` column.
+    """
+    import asyncio
+    from openbb_akshare.utils.concurrency import run_blocking, run_on_host
+
+    def read_cached(symbol: str) -> Optional[DataFrame]:
+        try:
+            if not is_history_cached(symbol, start_date, end_date, period, interval):
+                return None
+        except Exception:
+            return None
+        return ak_download(symbol, start_date, end_date, period=period, use_cache=True, api_key=api_key, adjust=adjust, interval=interval)
+
+    async def load(symbol: str) -> DataFrame:
+        if use_cache:
+            df = await run_blocking(read_cached, symbol)
+            if df is not None:
+                return df
+        return await run_on_host("eastmoney", ak_download, symbol, start_date, end_date, period=period, use_cache=use_cache, api_key=api_key, adjust=adjust, interval=interval)
+
+    results = await asyncio.gather(*[load(symbol) for symbol in symbols], return_exceptions=True)
+    frames: Dict[str, DataFrame] = {}
+    for symbol, result in zip(symbols, results):
+        if isinstance(result, Exception):
+            logger.warning(f"Error downloading historical data for {symbol}: {result}")
+        else:
+            frames[symbol] = result
+
+    return _concat_symbol_frames(symbols, frames)
+
 def get_post_tax_dividend_per_share(dividend_str: str) -> float:
     """
     Parses Chinese dividend descriptions and returns post-tax dividend per share.
@@ -247,6 +601,47 @@ def get_post_tax_dividend_per_share(dividend_str: str) -> float:
     
     # Default: Return 0 for unrecognized formats
     return 0.0
+def get_bonus_share_ratio(dividend_str: str) -> float:
+    """
+    Parses Chinese dividend descriptions and returns the new shares received per share.
+
+    Handles bonus shares (送) and capital reserve transfers (转), e.g.:
+        - "10送3股转2股派1元" -> 0.5
+        - "每10股派送股票股利3股" -> 0.3
+        - Non-share cases ("10派1元", "不分红") -> 0
+
+    Parameters:
+        dividend_str (str): Dividend description string
+
+    Returns:
+        float: Number of new shares per existing share, rounded to 6 decimal places
+    """
+    import re
+
+    if not dividend_str or re.search(r'不分红|不分配不转增', dividend_str):
+        return 0.0
+
+    # If A股 is present, extract only that part
+    a_share_match = re.search(r'(A股[^,]*)', dividend_str)
+    if a_share_match:
+        dividend_str = a_share_match.group(1).replace('A股', '')
+
+    # Base shares, e.g. "10送3股" or "每10股派送股票股利3股"
+    base_match = re.match(r'(\d+(?:\.\d+)?)', dividend_str) or re.search(r'每(\d+(?:\.\d+)?)股', dividend_str)
+    if not base_match:
+        return 0.0
+    base = float(base_match.group(1))
+    if base == 0:
+        return 0.0
+
+    shares = 0.0
+    for pattern in (r'送(\d+(?:\.\d+)?)股', r'转(?:增)?(\d+(?:\.\d+)?)股', r'股票股利(\d+(?:\.\d+)?)股'):
+        share_match = re.search(pattern, dividend_str)
+        if share_match:
+            shares += float(share_match.group(1))
+
+    return round(shares / base, 6)
+
 def get_a_dividends(
     symbol: str,
     start_date: Optional[Union[str, "date"]] = None,
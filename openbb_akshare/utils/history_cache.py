@@ -0,0 +1,283 @@
+"""AKShare equity history cache module."""
+
+import os
+import json
+import sqlite3
+import time
+import logging
+from datetime import (
+    date as dateType,
+    timedelta
+)
+from typing import Dict, List, Optional, Tuple
+import pandas as pd
+from mysharelib.tools import setup_logger
+from openbb_akshare import project_name
+from openbb_akshare.utils.cache_db import PooledTableCache, get_connection, get_table_cache, init_once
+
+setup_logger(project_name)
+logger = logging.getLogger(__name__)
+
+MANIFEST_TABLE = "equity_history_manifest"
+
+DateRange = Tuple[dateType, dateType]
+
+
+def merge_ranges(ranges: List[DateRange]) -> List[DateRange]:
+    """Merge overlapping or adjacent date ranges into a sorted list of disjoint ranges."""
+    merged: List[DateRange] = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1] + timedelta(days=1):
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def subtract_ranges(start: dateType, end: dateType, covered: List[DateRange]) -> List[DateRange]:
+    """Return the parts of [start, end] which are not inside any of the covered ranges."""
+    missing: List[DateRange] = []
+    cursor = start
+    for cov_start, cov_end in merge_ranges(covered):
+        if cov_end < cursor:
+            continue
+        if cov_start > end:
+            break
+        if cov_start > cursor:
+            missing.append((cursor, cov_start - timedelta(days=1)))
+        cursor = max(cursor, cov_end + timedelta(days=1))
+        if cursor > end:
+            break
+    if cursor <= end:
+        missing.append((cursor, end))
+    return missing
+
+
+def has_trading_day(start: dateType, end: dateType, market: str = "SH") -> bool:
+    """Check whether a date range contains at least one trading day of a market."""
+    from openbb_akshare.utils.trading_calendar import get_trading_calendar
+
+    return get_trading_calendar(market).count_trading_days(start, end) > 0
+
+
+def ensure_manifest_table(conn: sqlite3.Connection):
+    """Create the coverage manifest table if it does not exist yet."""
+    conn.execute(f'''
+        CREATE TABLE IF NOT EXISTS {MANIFEST_TABLE} (
+            table_name TEXT,
+            period TEXT,
+            adjust TEXT,
+            ranges TEXT,
+            refreshed_at REAL,
+            PRIMARY KEY (table_name, period, adjust)
+        )
+    ''')
+
+
+def write_manifest_row(conn: sqlite3.Connection, manifest_key: str, period: str, adjust: str,
+                       ranges: List[DateRange]):
+    """Insert or replace the covered ranges of one series."""
+    conn.execute(
+        f"INSERT OR REPLACE INTO {MANIFEST_TABLE} (table_name, period, adjust, ranges, refreshed_at) "
+        "VALUES (?, ?, ?, ?, ?)",
+        (manifest_key, period, adjust, json.dumps([(s.isoformat(), e.isoformat()) for s, e in ranges]), time.time()),
+    )
+
+
+class HistoryManifest:
+    """
+    Coverage manifest of one cached price series.
+
+    The manifest table holds one row per cached series, period and adjust mode
+    with the date ranges already downloaded, so freshness checks never have to
+    read the bars themselves.
+    """
+
+    def __init__(self, db_path: str, manifest_key: str, period: str = "daily", adjust: str = "",
+                 market: str = "SH"):
+        self.db_path = db_path
+        self.manifest_key = manifest_key
+        self.period = period
+        self.adjust = adjust
+        self.market = market
+        init_once(self.db_path, MANIFEST_TABLE, ensure_manifest_table)
+
+    def _bar_date_bounds(self, conn: sqlite3.Connection) -> Tuple[Optional[str], Optional[str]]:
+        """Return the first and last cached bar dates of a series without a manifest row."""
+        return None, None
+
+    def _write_manifest(self, conn: sqlite3.Connection, ranges: List[DateRange]):
+        write_manifest_row(conn, self.manifest_key, self.period, self.adjust, ranges)
+
+    def covered_ranges(self) -> List[DateRange]:
+        """Return the date ranges already downloaded into this series."""
+        with get_connection(self.db_path) as conn:
+            row = conn.execute(
+                f"SELECT ranges FROM {MANIFEST_TABLE} WHERE table_name=? AND period=? AND adjust=?",
+                (self.manifest_key, self.period, self.adjust),
+            ).fetchone()
+            if row:
+                return [(dateType.fromisoformat(s), dateType.fromisoformat(e)) for s, e in json.loads(row[0])]
+
+            # Caches written before the manifest always held one contiguous daily range.
+            if self.period != "daily" or self.adjust != "":
+                return []
+            first, last = self._bar_date_bounds(conn)
+            if first is None:
+                return []
+            ranges = [(dateType.fromisoformat(first[:10]), dateType.fromisoformat(last[:10]))]
+            self._write_manifest(conn, ranges)
+            conn.commit()
+            return ranges
+
+    def refreshed_at(self) -> Optional[float]:
+        """Return the time the manifest of this series was last updated."""
+        with get_connection(self.db_path) as conn:
+            row = conn.execute(
+                f"SELECT refreshed_at FROM {MANIFEST_TABLE} WHERE table_name=? AND period=? AND adjust=?",
+                (self.manifest_key, self.period, self.adjust),
+            ).fetchone()
+        return row[0] if row else None
+
+    def mark_covered(self, start: dateType, end: dateType):
+        """Record that [start, end] has been downloaded into this series."""
+        ranges = merge_ranges(self.covered_ranges() + [(start, end)])
+        with get_connection(self.db_path) as conn:
+            self._write_manifest(conn, ranges)
+            conn.commit()
+
+    def missing_ranges(self, start: dateType, end: dateType) -> List[DateRange]:
+        """Return the ranges in [start, end] that still need to be downloaded."""
+        return [
+            (gap_start, gap_end)
+            for gap_start, gap_end in subtract_ranges(start, end, self.covered_ranges())
+            if has_trading_day(gap_start, gap_end, self.market)
+        ]
+
+    def is_cached(self, start: dateType, end: dateType) -> bool:
+        """Check whether [start, end] is fully covered, using only the manifest."""
+        return not self.missing_ranges(start, end)
+
+
+class HistoryTableCache(PooledTableCache, HistoryManifest):
+    """
+    Per-symbol bar cache which keeps track of the date ranges it covers.
+
+    New bars are merged into the existing SQLite table instead of replacing it,
+    and the covered ranges are recorded in the manifest.
+    """
+
+    def __init__(self, table_schema: Dict,
+                 project: str = project_name,
+                 db_path: Optional[str] = None,
+                 table_name: str = "equity_history",
+                 primary_key: str = "date",
+                 period: str = "daily",
+                 adjust: str = "",
+                 date_format: str = "%Y-%m-%d",
+                 market: str = "SH"):
+        PooledTableCache.__init__(self, table_schema, project=project, db_path=db_path,
+                            table_name=table_name, primary_key=primary_key)
+        HistoryManifest.__init__(self, self.db_path, table_name, period=period, adjust=adjust, market=market)
+        self.date_format = date_format
+
+    def _table_columns(self, conn: sqlite3.Connection) -> List[str]:
+        return [row[1] for row in conn.execute(f"PRAGMA table_info({self.table_name})")]
+
+    def _bar_date_bounds(self, conn: sqlite3.Connection) -> Tuple[Optional[str], Optional[str]]:
+        return conn.execute(f"SELECT MIN(date), MAX(date) FROM {self.table_name}").fetchone()
+
+    def merge_dataframe(self, df: pd.DataFrame):
+        """
+        Merge bars into the table, replacing any rows in the same date range.
+
+        Older caches were written with ``DataFrame.to_sql(if_exists='replace')`` and
+        may lack the primary key, so existing rows are deleted by range before insert.
+        """
+        if df is None or df.empty:
+            return
+
+        df = df.copy()
+        df["date"] = pd.to_datetime(df["date"]).dt.strftime(self.date_format)
+        with get_connection(self.db_path) as conn:
+            columns = [col for col in self._table_columns(conn) if col in df.columns]
+            conn.execute(
+                f"DELETE FROM {self.table_name} WHERE date BETWEEN ? AND ?",
+                (df["date"].min(), df["date"].max()),
+            )
+            rows = df[columns].astype(object).where(df[columns].notna(), None)
+            conn.executemany(
+                f"INSERT INTO {self.table_name} ({', '.join(columns)}) "
+                f"VALUES ({', '.join(['?'] * len(columns))})",
+                rows.itertuples(index=False, name=None),
+            )
+            conn.commit()
+
+
+def append_bars_many(db_path: str, bars_by_table: Dict[str, pd.DataFrame], date_format: str = "%Y-%m-%d") -> int:
+    """
+    Merge bars into many existing daily bar tables in a single transaction.
+
+    Only tables that already exist are touched, so this keeps cached series
+    current without creating one table per symbol of the universe. The manifest
+    of each series is extended by the dates of its new bars in the same
+    transaction, so readers never see bars without coverage or vice versa.
+
+    Returns:
+        int: The number of tables updated.
+    """
+    updated = 0
+    with get_connection(db_path) as conn:
+        ensure_manifest_table(conn)
+        tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type='table'")}
+        manifests = {
+            row[0]: [(dateType.fromisoformat(s), dateType.fromisoformat(e)) for s, e in json.loads(row[1])]
+            for row in conn.execute(f"SELECT table_name, ranges FROM {MANIFEST_TABLE} WHERE period='daily' AND adjust=''")
+        }
+        for table_name, df in bars_by_table.items():
+            if table_name not in tables or df is None or df.empty:
+                continue
+            df = df.assign(date=pd.to_datetime(df["date"]).dt.strftime(date_format))
+            columns = [row[1] for row in conn.execute(f"PRAGMA table_info({table_name})") if row[1] in df.columns]
+
+            ranges = manifests.get(table_name)
+            if ranges is None:
+                # Same bootstrap as HistoryManifest.covered_ranges for caches written before the manifest.
+                first, last = conn.execute(f"SELECT MIN(date), MAX(date) FROM {table_name}").fetchone()
+                ranges = [] if first is None else [(dateType.fromisoformat(first[:10]), dateType.fromisoformat(last[:10]))]
+
+            conn.execute(f"DELETE FROM {table_name} WHERE date BETWEEN ? AND ?", (df["date"].min(), df["date"].max()))
+            rows = df[columns].astype(object).where(df[columns].notna(), None)
+            conn.executemany(
+                f"INSERT INTO {table_name} ({', '.join(columns)}) VALUES ({', '.join(['?'] * len(columns))})",
+                rows.itertuples(index=False, name=None),
+            )
+            new_range = (dateType.fromisoformat(df["date"].min()[:10]), dateType.fromisoformat(df["date"].max()[:10]))
+            write_manifest_row(conn, table_name, "daily", "", merge_ranges(ranges + [new_range]))
+            updated += 1
+        conn.commit()
+    return updated
+
+
+def open_history_cache(table_schema: Dict,
+                       table_name: str,
+                       period: str = "daily",
+                       adjust: str = "",
+                       backend: Optional[str] = None,
+                       market: str = "SH"):
+    """
+    Open the bar cache of one series with the configured storage backend.
+
+    The backend is ``sqlite`` by default and can be switched to the memory-mapped
+    ``columnar`` store with the ``OPENBB_AKSHARE_HISTORY_BACKEND`` environment variable.
+    """
+    backend = backend or os.environ.get("OPENBB_AKSHARE_HISTORY_BACKEND", "sqlite")
+    if backend == "columnar":
+        from openbb_akshare.utils.columnar_store import ColumnarHistoryCache
+        return ColumnarHistoryCache(table_schema, table_name=table_name, period=period, adjust=adjust,
+                                    market=market)
+    if backend != "sqlite":
+        raise ValueError(f"Unsupported history cache backend: {backend}")
+    return get_table_cache(table_schema, table_name, primary_key="date", cls=HistoryTableCache,
+                           period=period, adjust=adjust, market=market)
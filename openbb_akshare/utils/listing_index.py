@@ -0,0 +1,214 @@
+"""AKShare listing date index module."""
+
+import time
+import logging
+import threading
+from datetime import (
+    date as dateType,
+    datetime,
+    timedelta
+)
+from typing import Callable, Dict, List, NamedTuple, Optional
+import pandas as pd
+from mysharelib.tools import setup_logger, normalize_symbol
+from openbb_akshare import project_name
+
+setup_logger(project_name)
+logger = logging.getLogger(__name__)
+
+LISTING_SCHEMA = {
+    "symbol": "TEXT PRIMARY KEY",
+    "listed_date": "TEXT",
+    "delisted_date": "TEXT",
+    "board": "TEXT",
+    "timestamp": "REAL",
+}
+
+# New listings appear daily, so the A-share lists are downloaded again after a day.
+LISTING_TTL = 24 * 60 * 60
+
+
+class Listing(NamedTuple):
+    """Listing dates and board of one symbol."""
+
+    listed_date: Optional[dateType]
+    delisted_date: Optional[dateType]
+    board: Optional[str]
+
+
+_listings: Dict[str, Listing] = {}
+_loaded_at = 0.0
+_lock = threading.Lock()
+
+
+def _listing_key(symbol: str) -> str:
+    symbol_b, symbol_f, market = normalize_symbol(symbol)
+    return f"{symbol_b}.{'SH' if market == 'SS' else market}"
+
+
+def _to_dates(values) -> List[Optional[dateType]]:
+    dates = pd.to_datetime(pd.Series(values, dtype=object), errors="coerce")
+    return [None if pd.isna(d) else d.date() for d in dates]
+
+
+def _listing_frame(df: pd.DataFrame, market: str, code: str, listed: str, board=None,
+                   delisted: Optional[str] = None) -> pd.DataFrame:
+    return pd.DataFrame({
+        "symbol": [f"{c}.{market}" for c in df[code].astype(str)],
+        "listed_date": _to_dates(df[listed]),
+        "delisted_date": _to_dates(df[delisted]) if delisted else None,
+        "board": df[board].astype(str).to_numpy() if board in df.columns else board,
+    })
+
+
+def _listing_sources() -> List[Callable[[], pd.DataFrame]]:
+    import akshare as ak
+
+    return [
+        lambda: _listing_frame(ak.stock_info_sh_name_code(symbol="主板A股"), "SH", "证券代码", "上市日期", "主板"),
+        lambda: _listing_frame(ak.stock_info_sh_name_code(symbol="科创板"), "SH", "证券代码", "上市日期", "科创板"),
+        lambda: _listing_frame(ak.stock_info_sz_name_code(symbol="A股列表"), "SZ", "A股代码", "A股上市日期", "板块"),
+        lambda: _listing_frame(ak.stock_info_bj_name_code(), "BJ", "证券代码", "上市日期", "北交所"),
+        lambda: _listing_frame(ak.stock_info_sh_delist(symbol="全部"), "SH", "公司代码", "上市日期", None,
+                               "暂停上市日期"),
+        lambda: _listing_frame(ak.stock_info_sz_delist(symbol="终止上市公司"), "SZ", "证券代码", "上市日期", None,
+                               "终止上市日期"),
+    ]
+
+
+def fetch_listings() -> pd.DataFrame:
+    """
+    Download the listing dates of all A-shares, including delisted ones, from the exchange lists.
+
+    The lists are downloaded concurrently with ``map_on_host``. Lists
+    which fail to download are skipped. HK symbols have no bulk list and are
+    looked up one by one when first needed.
+    """
+    from openbb_akshare.utils.concurrency import host_slot, map_on_host
+
+    def load(source):
+        with host_slot("exchange"):
+            return source()
+
+    frames = []
+    for frame, error in map_on_host("exchange", load, _listing_sources()):
+        if error is not None:
+            logger.warning(f"Failed to fetch a listing date list: {error}")
+        else:
+            frames.append(frame)
+    if not frames:
+        return pd.DataFrame(columns=[col for col in LISTING_SCHEMA if col != "timestamp"])
+    # A delisted entry completes the listed one of the same code.
+    df = pd.concat(frames, ignore_index=True)
+    return df.groupby("symbol", as_index=False, sort=False).first()
+
+
+def _to_row(symbol: str, listing: Listing, timestamp: float) -> Dict:
+    return {
+        "symbol": symbol,
+        "listed_date": listing.listed_date.isoformat() if listing.listed_date else None,
+        "delisted_date": listing.delisted_date.isoformat() if listing.delisted_date else None,
+        "board": listing.board,
+        "timestamp": timestamp,
+    }
+
+
+def _from_frame(df: pd.DataFrame) -> Dict[str, Listing]:
+    listed, delisted = _to_dates(df["listed_date"]), _to_dates(df["delisted_date"])
+    boards = [None if pd.isna(b) else b for b in df["board"]]
+    return {symbol: Listing(*entry) for symbol, *entry in zip(df["symbol"], listed, delisted, boards)}
+
+
+def load_listings(use_cache: bool = True) -> Dict[str, Listing]:
+    """
+    Return the listing index of all known symbols, keyed like "600036.SH".
+
+    The index is built in bulk from the exchange lists, persisted in the cache
+    database and held in memory as a dict, so a lookup costs no I/O. Concurrent
+    rebuilds are coalesced into one.
+    """
+    from openbb_akshare.utils.single_flight import single_flight
+
+    with _lock:
+        if use_cache and time.time() - _loaded_at < LISTING_TTL:
+            return _listings
+    return single_flight(f"listing_index_{use_cache}", _load_listings, use_cache)
+
+
+def _load_listings(use_cache: bool) -> Dict[str, Listing]:
+    global _listings, _loaded_at
+    from openbb_akshare.utils.cache_db import get_table_cache
+
+    with _lock:
+        if use_cache and time.time() - _loaded_at < LISTING_TTL:
+            return _listings
+
+    cache = get_table_cache(LISTING_SCHEMA, "listing_index", primary_key="symbol")
+    cached = cache.read_dataframe()
+    stored = _from_frame(cached) if not cached.empty else {}
+    # Rows added one by one are newer than the last bulk download, which is the oldest timestamp.
+    if use_cache and stored and time.time() - cached["timestamp"].min() < LISTING_TTL:
+        with _lock:
+            _listings = {**_listings, **stored}
+            _loaded_at = cached["timestamp"].min()
+            return _listings
+
+    # The download runs without _lock, so lookups in the current index are not held up.
+    logger.info("Fetching the listing date lists...")
+    df = fetch_listings()
+    now = time.time()
+    if df.empty:
+        # Keep what is cached, and try the download again in an hour.
+        with _lock:
+            _listings = {**_listings, **stored}
+            _loaded_at = now - LISTING_TTL + 60 * 60
+            return _listings
+    # Symbols looked up one by one, e.g. on HKEX, are kept.
+    merged = {**stored, **_from_frame(df)}
+    cache.write_dataframe(pd.DataFrame([_to_row(s, listing, now) for s, listing in merged.items()]))
+    with _lock:
+        # Symbols looked up while the lists were downloading are kept too.
+        _listings = {**_listings, **merged}
+        _loaded_at = now
+        return _listings
+
+
+def get_listing(symbol: str, use_cache: bool = True) -> Optional[Listing]:
+    """
+    Return the listing dates and board of a symbol.
+
+    Symbols missing from the exchange lists, such as HK ones, are looked up once
+    with ``mysharelib.em.orginfo.get_listing_date`` and added to the index.
+    """
+    from openbb_akshare.utils.cache_db import get_table_cache
+
+    key = _listing_key(symbol)
+    listings = load_listings(use_cache)
+    listing = listings.get(key)
+    if listing is not None:
+        return listing
+
+    from mysharelib.em.orginfo import get_listing_date as fetch_listing_date
+
+    try:
+        listed = _to_dates([fetch_listing_date(key)])[0]
+    except Exception as e:
+        logger.warning(f"Failed to fetch the listing date of {symbol}: {e}")
+        return None
+    if listed is None:
+        return None
+    listing = Listing(listed, None, "港股" if key.endswith(".HK") else None)
+    with _lock:
+        _listings[key] = listing
+    cache = get_table_cache(LISTING_SCHEMA, "listing_index", primary_key="symbol")
+    cache.update_or_insert(pd.DataFrame([_to_row(key, listing, time.time())]))
+    return listing
+
+
+def get_listing_date(symbol: str, use_cache: bool = True) -> dateType:
+    """Return the listing date of a symbol, or a year ago if it is unknown."""
+    listing = get_listing(symbol, use_cache)
+    if listing is not None and listing.listed_date is not None:
+        return listing.listed_date
+    logger.warning(f"No listing date found for {symbol}, using fallback date.")
+    return (datetime.now() - timedelta(days=365)).date()
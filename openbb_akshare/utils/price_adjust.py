@@ -0,0 +1,179 @@
+"""AKShare local price adjustment (qfq/hfq) module."""
+
+import json
+import time
+import logging
+from datetime import timedelta
+from typing import Optional
+import numpy as np
+import pandas as pd
+from mysharelib.tools import setup_logger, normalize_symbol
+from openbb_akshare import project_name
+
+setup_logger(project_name)
+logger = logging.getLogger(__name__)
+
+ADJUST_EVENTS_SCHEMA = {
+    "symbol": "TEXT PRIMARY KEY",
+    "events": "TEXT",
+    "timestamp": "REAL"
+}
+
+# Dividend schemes are refreshed once a day.
+ADJUST_EVENTS_TTL = 24 * 60 * 60
+
+ADJUSTED_COLUMNS = ["open", "high", "low", "close", "vwap", "change"]
+
+# The close before an ex-date must be at most this old, e.g. after a suspension.
+PREV_CLOSE_WINDOW = timedelta(days=14)
+
+
+def fetch_adjust_events(symbol: str) -> pd.DataFrame:
+    """
+    Builds the ex-date events of a symbol from its dividend, bonus share and transfer history.
+
+    Returns:
+        DataFrame: Columns ``ex_date``, ``cash`` (cash dividend per share) and
+        ``ratio`` (new shares per share), sorted by ``ex_date``.
+    """
+    from openbb_core.provider.utils.errors import EmptyDataError
+    from openbb_akshare.utils.concurrency import host_slot
+    from openbb_akshare.utils.helpers import get_a_dividends, get_hk_dividends, get_bonus_share_ratio
+
+    symbol_b, symbol_f, market = normalize_symbol(symbol)
+    try:
+        if market == "HK":
+            with host_slot("ths"):
+                dividends = pd.DataFrame(get_hk_dividends(symbol_b))
+            # get_hk_dividends stores 除净日 (the ex-date) in record_date.
+            ex_dates = dividends["record_date"]
+        else:
+            with host_slot("ths"):
+                dividends = pd.DataFrame(get_a_dividends(symbol_b))
+            ex_dates = dividends["ex_dividend_date"]
+    except EmptyDataError:
+        return pd.DataFrame(columns=["ex_date", "cash", "ratio"])
+
+    events = pd.DataFrame({
+        "ex_date": pd.to_datetime(ex_dates, errors="coerce"),
+        "cash": pd.to_numeric(dividends["amount"], errors="coerce").fillna(0.0),
+        "ratio": dividends["description"].apply(lambda x: get_bonus_share_ratio(x) if isinstance(x, str) else 0.0),
+    })
+    events = events.dropna(subset=["ex_date"])
+    events = events[(events["cash"] > 0) | (events["ratio"] > 0)]
+    # Several schemes may go ex on the same day, e.g. an interim and a special dividend.
+    events = events.groupby("ex_date", as_index=False).agg(cash=("cash", "sum"), ratio=("ratio", "sum"))
+    return events.sort_values("ex_date").reset_index(drop=True)
+
+
+def get_adjust_events(symbol: str, use_cache: bool = True) -> pd.DataFrame:
+    """Returns the cached ex-date events of a symbol, refreshing them after ADJUST_EVENTS_TTL."""
+    from openbb_akshare.utils.cache_db import get_table_cache
+
+    symbol_b, symbol_f, market = normalize_symbol(symbol)
+    cache = get_table_cache(ADJUST_EVENTS_SCHEMA, "adjust_events", primary_key="symbol")
+
+    if use_cache:
+        cached = cache.read_rows({"symbol": symbol_f})
+        if not cached.empty and time.time() - cached["timestamp"].iloc[0] < ADJUST_EVENTS_TTL:
+            events = pd.DataFrame(json.loads(cached["events"].iloc[0]), columns=["ex_date", "cash", "ratio"])
+            events["ex_date"] = pd.to_datetime(events["ex_date"])
+            return events
+
+    logger.info(f"Fetching adjustment events for {symbol_f}...")
+    events = fetch_adjust_events(symbol)
+    records = events.assign(ex_date=events["ex_date"].dt.strftime("%Y-%m-%d")).values.tolist()
+    cache.update_or_insert(pd.DataFrame([{"symbol": symbol_f, "events": json.dumps(records), "timestamp": time.time()}]))
+    return events
+
+
+def adjust_factors(dates: pd.Series, events: pd.DataFrame, adjust: str) -> np.ndarray:
+    """
+    Computes the price multiplier of each bar date.
+
+    ``events`` must hold ``ex_date`` and the ex-rights ``factor`` of each event, i.e.
+    the ex-rights reference price divided by the previous close. Forward adjustment
+    (qfq) keeps the latest prices unchanged and scales each bar by the product of the
+    factors of all later events. Backward adjustment (hfq) keeps the earliest prices
+    unchanged and divides each bar by the product of the factors of all events on
+    or before its date.
+    """
+    ex_dates = events["ex_date"].to_numpy(dtype="datetime64[ns]")
+    prefix = np.concatenate([[1.0], np.cumprod(events["factor"].to_numpy(dtype=float))])
+    # Number of events which went ex on or before each bar date.
+    applied = np.searchsorted(ex_dates, pd.to_datetime(dates).to_numpy(dtype="datetime64[ns]"), side="right")
+    if adjust == "qfq":
+        return prefix[-1] / prefix[applied]
+    if adjust == "hfq":
+        return 1.0 / prefix[applied]
+    raise ValueError(f"Unsupported adjust mode: {adjust}")
+
+
+def _previous_closes(symbol: str, bars: pd.DataFrame, ex_dates: pd.Series, use_cache: bool = True,
+                     api_key: Optional[str] = "") -> np.ndarray:
+    """
+    Return the close of the last bar before each ex-date, or NaN if there is none within PREV_CLOSE_WINDOW.
+
+    Ex-dates whose previous close is not in ``bars`` are looked up with a single
+    raw bar download covering all of them, which the raw bar cache then keeps.
+    """
+    from openbb_akshare.utils.helpers import ak_download
+
+    def lookup(history: pd.DataFrame) -> np.ndarray:
+        closes = np.full(len(ex_dates), np.nan)
+        dates = history["date"].to_numpy(dtype="datetime64[ns]")
+        if len(dates) == 0:
+            return closes
+        pos = np.searchsorted(dates, ex_dates.to_numpy(dtype="datetime64[ns]"), side="left") - 1
+        earliest = (ex_dates - PREV_CLOSE_WINDOW).to_numpy(dtype="datetime64[ns]")
+        found = (pos >= 0) & (dates[np.maximum(pos, 0)] >= earliest)
+        closes[found] = history["close"].to_numpy(dtype=float)[pos[found]]
+        return closes
+
+    closes = lookup(bars)
+    missing = np.isnan(closes)
+    if not missing.any():
+        return closes
+    needed = ex_dates[missing]
+    history = ak_download(symbol, (needed.min() - PREV_CLOSE_WINDOW).date(), (needed.max() - timedelta(days=1)).date(),
+                          use_cache=use_cache, api_key=api_key)
+    if history.empty:
+        return closes
+    history = pd.concat([history.assign(date=pd.to_datetime(history["date"])), bars[["date", "close"]]])
+    return lookup(history.drop_duplicates("date", keep="last").sort_values("date"))
+
+
+def apply_adjustment(symbol: str, df: pd.DataFrame, adjust: str, use_cache: bool = True,
+                     api_key: Optional[str] = "") -> pd.DataFrame:
+    """
+    Adjusts raw daily bars for dividends, bonus shares and transfers.
+
+    The previous close of each ex-date is read from the raw bar cache, so the
+    adjustment is a local, vectorized transform once the cache is warm. Volume
+    and change_percent are left unchanged.
+
+    Parameters:
+        symbol (str): Stock symbol of the bars.
+        df (DataFrame): Raw (unadjusted) daily bars.
+        adjust (str): "qfq" (forward) or "hfq" (backward).
+    """
+    if not adjust or df.empty:
+        return df
+
+    events = get_adjust_events(symbol, use_cache=use_cache)
+    events = events[events["ex_date"] <= pd.Timestamp.now().normalize()]
+    if events.empty:
+        return df
+
+    bars = df.assign(date=pd.to_datetime(df["date"])).sort_values("date")
+    prev_closes = _previous_closes(symbol, bars, events["ex_date"], use_cache=use_cache, api_key=api_key)
+
+    events = events.assign(prev_close=prev_closes).dropna(subset=["prev_close"])
+    events["factor"] = (events["prev_close"] - events["cash"]) / ((1 + events["ratio"]) * events["prev_close"])
+    events = events[events["factor"] > 0]
+
+    multiplier = adjust_factors(bars["date"], events, adjust)
+    for col in ADJUSTED_COLUMNS:
+        if col in bars.columns:
+            bars[col] = bars[col] * multiplier
+    return bars.reset_index(drop=True)
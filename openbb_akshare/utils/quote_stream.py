@@ -0,0 +1,140 @@
+"""AKShare streaming quote subscription module."""
+
+import asyncio
+import logging
+from typing import AsyncIterator, Dict, List, Set, Tuple
+import pandas as pd
+from mysharelib.tools import setup_logger, normalize_symbol
+from openbb_akshare import project_name
+
+setup_logger(project_name)
+logger = logging.getLogger(__name__)
+
+# Snapshot columns whose change is reported to subscribers.
+WATCHED_COLUMNS = ["最新价", "成交量"]
+
+# Default seconds between two upstream polls of a market.
+DEFAULT_INTERVAL = 3.0
+
+# Shared pollers, keyed by event loop and market.
+_pollers: Dict[Tuple[int, str], "MarketPoller"] = {}
+
+
+def changed_rows(previous: pd.DataFrame, current: pd.DataFrame, columns: List[str] = WATCHED_COLUMNS) -> pd.DataFrame:
+    """
+    Return the rows of ``current`` whose watched columns differ from ``previous``.
+
+    Rows are matched on 代码 with one vectorized comparison; codes which are new
+    in ``current`` count as changed.
+    """
+    columns = [col for col in columns if col in current.columns]
+    cur = current.set_index("代码")[columns]
+    prev = previous.set_index("代码")[columns].reindex(cur.index) if not previous.empty else cur.iloc[:0].reindex(cur.index)
+    changed = (cur != prev) & ~(cur.isna() & prev.isna())
+    return current[changed.any(axis=1).to_numpy()]
+
+
+class _Subscription:
+    """Codes watched by one subscriber and the queue of its pending changes."""
+
+    def __init__(self, codes: Dict[str, Set[str]], interval: float):
+        self.codes = codes
+        self.interval = interval
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=1)
+
+    def push(self, market: str, rows: pd.DataFrame):
+        rows = rows[rows["代码"].isin(self.codes.get(market, ()))]
+        if rows.empty:
+            return
+        if self.queue.full():
+            # A slow subscriber gets the changes of the ticks it missed merged into one frame.
+            pending = self.queue.get_nowait()
+            rows = pd.concat([pending, rows]).drop_duplicates("代码", keep="last")
+        self.queue.put_nowait(rows)
+
+
+class MarketPoller:
+    """
+    Polls the snapshot of one market for all of its subscribers.
+
+    Each tick downloads the snapshot once and pushes the changed rows to every
+    subscriber watching any of them. The poll stops when the last subscriber leaves.
+    """
+
+    def __init__(self, market: str):
+        self.market = market
+        self.subscriptions: Set[_Subscription] = set()
+        self.previous: pd.DataFrame = pd.DataFrame()
+        self.task = None
+
+    def add(self, subscription: _Subscription):
+        self.subscriptions.add(subscription)
+        if not self.previous.empty:
+            # Late subscribers start from the last snapshot instead of waiting for a change.
+            subscription.push(self.market, self.previous)
+        if self.task is None or self.task.done():
+            self.task = asyncio.get_running_loop().create_task(self._run())
+
+    def remove(self, subscription: _Subscription):
+        self.subscriptions.discard(subscription)
+        if not self.subscriptions and self.task is not None:
+            self.task.cancel()
+            self.task = None
+
+    async def _poll(self) -> pd.DataFrame:
+        from openbb_akshare.utils.concurrency import run_blocking
+        from openbb_akshare.utils.fetch_quote import _market_code, load_snapshot
+        from openbb_akshare.utils.trading_calendar import get_trading_calendar
+
+        # Outside the auction and continuous trading the cached snapshot cannot change.
+        phase = get_trading_calendar(_market_code(self.market)).market_phase()[0]
+        timestamp, df, index = await run_blocking(load_snapshot, self.market, phase not in ("pre_open", "trading"))
+        return df
+
+    async def _run(self):
+        while self.subscriptions:
+            try:
+                current = await self._poll()
+            except Exception as e:
+                logger.warning(f"Polling the {self.market} snapshot failed: {e}")
+            else:
+                rows = changed_rows(self.previous, current)
+                self.previous = current
+                for subscription in list(self.subscriptions):
+                    subscription.push(self.market, rows)
+            await asyncio.sleep(min((s.interval for s in self.subscriptions), default=DEFAULT_INTERVAL))
+
+
+async def subscribe_quotes(symbols: List[str], interval: float = DEFAULT_INTERVAL) -> AsyncIterator[pd.DataFrame]:
+    """
+    Stream the quotes of several symbols, yielding only the rows that changed.
+
+    The first frame holds the current quotes of all symbols; each following frame
+    holds the symbols whose price or volume changed since the previous poll.
+    Subscribers on the same event loop share one upstream poll per market, which
+    runs at the shortest interval any of them asked for.
+
+    Parameters:
+        symbols (List[str]): Symbols to watch, e.g. ["600036", "00700"].
+        interval (float): Seconds between two polls of the upstream snapshot.
+    """
+    codes: Dict[str, Set[str]] = {}
+    for symbol in symbols:
+        symbol_b, symbol_f, market = normalize_symbol(symbol)
+        codes.setdefault(market, set()).add(symbol_b)
+
+    loop_id = id(asyncio.get_running_loop())
+    subscription = _Subscription(codes, interval)
+    for market in codes:
+        poller = _pollers.setdefault((loop_id, market), MarketPoller(market))
+        poller.add(subscription)
+    try:
+        while True:
+            yield await subscription.queue.get()
+    finally:
+        for market in codes:
+            poller = _pollers.get((loop_id, market))
+            if poller is not None:
+                poller.remove(subscription)
+                if not poller.subscriptions:
+                    _pollers.pop((loop_id, market), None)
@@ -0,0 +1,188 @@
+"""AKShare intraday quote tape module."""
+
+import os
+import logging
+import threading
+from datetime import (
+    date as dateType,
+    datetime
+)
+from typing import Dict, Optional, Union
+import numpy as np
+import pandas as pd
+from mysharelib.tools import setup_logger, normalize_symbol
+from openbb_akshare import project_name
+
+setup_logger(project_name)
+logger = logging.getLogger(__name__)
+
+# Tape columns and their on-disk dtypes. Time is kept as seconds after the
+# exchange midnight, since every file holds a single trading day.
+TAPE_DTYPES = {
+    "time": "<i4",
+    "code": "S6",
+    "price": "<f4",
+    "change_percent": "<f4",
+    "volume": "<f8",
+    "amount": "<f8",
+}
+
+# Snapshot columns and the matching tape columns.
+SNAPSHOT_TAPE_COLUMNS = {
+    "最新价": "price",
+    "涨跌幅": "change_percent",
+    "成交量": "volume",
+    "成交额": "amount",
+}
+
+# Last snapshot recorded per market, so that only changed rows are appended.
+_last_recorded: Dict[str, pd.DataFrame] = {}
+_last_recorded_lock = threading.Lock()
+
+
+def tape_enabled() -> bool:
+    """Check whether snapshot refreshes are recorded, with OPENBB_AKSHARE_QUOTE_TAPE."""
+    return os.environ.get("OPENBB_AKSHARE_QUOTE_TAPE", "").lower() in ("1", "true", "yes")
+
+
+def get_tape_root(project: str = project_name) -> str:
+    """Return the directory holding the quote tape partitions."""
+    from mysharelib import get_cache_path
+
+    root = os.path.join(os.path.dirname(get_cache_path(project)), "tape")
+    os.makedirs(root, exist_ok=True)
+    return root
+
+
+def partition_dir(market: str, day: Union[str, dateType], root: Optional[str] = None) -> str:
+    """Return the directory of the tape of one market and trading day."""
+    return os.path.join(root or get_tape_root(), market, pd.Timestamp(day).strftime("%Y%m%d"))
+
+
+def snapshot_to_tape(snapshot: pd.DataFrame, moment: datetime) -> Dict[str, np.ndarray]:
+    """Convert a snapshot taken at an exchange time to tape columns."""
+    columns = {
+        "time": np.full(len(snapshot), moment.hour * 3600 + moment.minute * 60 + moment.second,
+                        dtype=TAPE_DTYPES["time"]),
+        "code": snapshot["代码"].astype(str).to_numpy(dtype=TAPE_DTYPES["code"]),
+    }
+    for source, name in SNAPSHOT_TAPE_COLUMNS.items():
+        values = pd.to_numeric(snapshot[source], errors="coerce") if source in snapshot.columns else np.nan
+        columns[name] = np.broadcast_to(np.asarray(values, dtype=TAPE_DTYPES[name]), len(snapshot))
+    return columns
+
+
+def append_tape(market: str, columns: Dict[str, np.ndarray], day: Union[str, dateType],
+                root: Optional[str] = None) -> int:
+    """
+    Append rows to the day partition of a market, one file per column.
+
+    Writers in other processes are serialized with an advisory lock, so all
+    column files of a partition grow together.
+
+    Returns:
+        int: The number of rows appended.
+    """
+    from openbb_akshare.utils.single_flight import process_lock
+
+    rows = len(columns["time"])
+    if rows == 0:
+        return 0
+    directory = partition_dir(market, day, root)
+    os.makedirs(directory, exist_ok=True)
+    with process_lock(f"quote_tape_{market}"):
+        for name, dtype in TAPE_DTYPES.items():
+            with open(os.path.join(directory, f"{name}.bin"), "ab") as f:
+                f.write(np.ascontiguousarray(columns[name], dtype=dtype).tobytes())
+    return rows
+
+
+def read_tape(market: str, day: Union[str, dateType], root: Optional[str] = None) -> Dict[str, np.ndarray]:
+    """
+    Return the columns of a day partition as read-only memory maps.
+
+    Columns are cut to the shortest file, so rows of an append that was
+    interrupted half-way are ignored.
+    """
+    directory = partition_dir(market, day, root)
+    sizes = {}
+    for name, dtype in TAPE_DTYPES.items():
+        path = os.path.join(directory, f"{name}.bin")
+        sizes[name] = os.path.getsize(path) // np.dtype(dtype).itemsize if os.path.exists(path) else 0
+    rows = min(sizes.values())
+    if rows == 0:
+        return {name: np.empty(0, dtype=dtype) for name, dtype in TAPE_DTYPES.items()}
+    return {name: np.memmap(os.path.join(directory, f"{name}.bin"), dtype=dtype, mode="r", shape=(rows,))
+            for name, dtype in TAPE_DTYPES.items()}
+
+
+def record_snapshot(market: str, snapshot: pd.DataFrame, timestamp: float, root: Optional[str] = None) -> int:
+    """
+    Record a refreshed market snapshot on the tape.
+
+    Only the rows whose price or volume changed since the snapshot recorded last
+    in this process are appended; the first snapshot of a process is recorded in
+    full. Snapshots taken before the open, or on a day without trading, show the
+    previous session and are not recorded.
+
+    Returns:
+        int: The number of rows appended.
+    """
+    from openbb_akshare.utils.fetch_quote import _market_code
+    from openbb_akshare.utils.quote_stream import changed_rows
+    from openbb_akshare.utils.trading_calendar import SESSION_PHASES, exchange_time, get_trading_calendar
+
+    market = _market_code(market)
+    moment = exchange_time(timestamp)
+    calendar = get_trading_calendar(market)
+    opens_at = SESSION_PHASES.get(calendar.market, SESSION_PHASES["CN"])[0][1]
+    if not calendar.is_trading_day(moment.date()) or moment.time() < opens_at:
+        return 0
+
+    with _last_recorded_lock:
+        previous = _last_recorded.get(market, pd.DataFrame())
+        _last_recorded[market] = snapshot
+    rows = changed_rows(previous, snapshot) if not previous.empty else snapshot
+    return append_tape(market, snapshot_to_tape(rows, moment), moment.date(), root)
+
+
+def query_tape(symbol: str, start: Optional[Union[str, datetime]] = None, end: Optional[Union[str, datetime]] = None,
+               day: Optional[Union[str, dateType]] = None, root: Optional[str] = None) -> pd.DataFrame:
+    """
+    Return the recorded quotes of a symbol on one trading day.
+
+    Parameters:
+        symbol (str): Symbol, e.g. "600036" or "00700.HK".
+        start (str | datetime): First exchange time, e.g. "10:00" or a datetime. Defaults to the start of the day.
+        end (str | datetime): Last exchange time. Defaults to the end of the day.
+        day (str | date): Trading day. Defaults to the day of ``start``, or today in exchange time.
+
+    Returns:
+        DataFrame: One row per recorded change, with the exchange time and the
+        price, change percent, volume and amount, sorted by time.
+    """
+    from openbb_akshare.utils.fetch_quote import _market_code
+    from openbb_akshare.utils.trading_calendar import exchange_now
+
+    symbol_b, symbol_f, market = normalize_symbol(symbol)
+    market = _market_code(market)
+    if day is None:
+        day = start.date() if isinstance(start, datetime) else exchange_now().date()
+    day = pd.Timestamp(day).normalize()
+
+    def seconds(moment, default: int) -> int:
+        if moment is None:
+            return default
+        moment = pd.Timestamp(moment) if isinstance(moment, datetime) else pd.Timestamp(f"{day.date()} {moment}")
+        return int((moment - day).total_seconds())
+
+    columns = read_tape(market, day, root)
+    times = columns["time"]
+    # Writers in several processes may append slightly out of order, so the rows are masked and sorted.
+    selected = np.flatnonzero((columns["code"] == symbol_b.encode())
+                              & (times >= seconds(start, 0)) & (times <= seconds(end, 86400)))
+    selected = selected[np.argsort(times[selected], kind="stable")]
+
+    result = pd.DataFrame({name: np.asarray(columns[name][selected]) for name in TAPE_DTYPES if name != "code"})
+    result["time"] = day + pd.to_timedelta(result["time"].astype("int64"), unit="s")
+    return result
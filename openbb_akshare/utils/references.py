@@ -1102,6 +1102,96 @@ INDUSTRY_MAP = {
 }
 
 
+# Eastmoney industry boards and the matching INDUSTRY_MAP industries.
+INDUSTRY_BOARD_MAP = {
+    "银行": "banks",
+    "证券": "capital_markets",
+    "保险": "insurance",
+    "多元金融": "diversified_financials",
+    "房地产开发": "real_estate",
+    "房地产服务": "real_estate",
+    "酿酒行业": "food_products",
+    "食品饮料": "packaged_foods",
+    "农牧饲渔": "farm_products",
+    "美容护理": "household_personal_products",
+    "家用轻工": "household_products",
+    "教育": "education_training_services",
+    "医药商业": "medical_distribution",
+    "中药": "drugs",
+    "化学制药": "drugs",
+    "生物制品": "biotechnology",
+    "医疗器械": "medical_devices",
+    "医疗服务": "medical_care_facilities",
+    "半导体": "semiconductors",
+    "电子元件": "electronic_components",
+    "光学光电子": "electronic_components",
+    "消费电子": "consumer_electronics",
+    "电子化学品": "semiconductor_equipment_materials",
+    "计算机设备": "computer_hardware",
+    "软件开发": "software_and_services",
+    "互联网服务": "information_technology_services",
+    "通信设备": "communication_equipment",
+    "仪器仪表": "scientific_technical_instruments",
+    "光伏设备": "solar",
+    "通信服务": "telecom_services",
+    "游戏": "electronic_gaming_multimedia",
+    "文化传媒": "media",
+    "电力行业": "utilities",
+    "燃气": "utilities",
+    "公用事业": "utilities",
+    "煤炭行业": "thermal_coal",
+    "石油行业": "oil_gas_integrated",
+    "采掘行业": "energy_services",
+    "钢铁行业": "steel",
+    "有色金属": "diversified_metals",
+    "贵金属": "precious_metals",
+    "能源金属": "other_industrial_metals_mining",
+    "小金属": "other_industrial_metals_mining",
+    "化学制品": "specialty_chemicals",
+    "化学原料": "chemicals",
+    "化纤行业": "chemicals",
+    "化肥行业": "agricultural_inputs",
+    "农药兽药": "agricultural_inputs",
+    "塑料制品": "specialty_chemicals",
+    "橡胶制品": "specialty_chemicals",
+    "非金属材料": "building_materials",
+    "玻璃玻纤": "building_materials",
+    "水泥建材": "building_materials",
+    "造纸印刷": "paper_paper_products",
+    "装修建材": "building_products",
+    "工程建设": "engineering_construction",
+    "工程咨询服务": "consulting_services",
+    "专业服务": "specialty_business_services",
+    "专用设备": "specialty_industrial_machinery",
+    "通用设备": "machinery",
+    "工程机械": "farm_heavy_construction_machinery",
+    "交运设备": "machinery",
+    "船舶制造": "machinery",
+    "航天航空": "aerospace_defense",
+    "电网设备": "electrical_equipment",
+    "电源设备": "electrical_equipment",
+    "风电设备": "electrical_equipment",
+    "电机": "electrical_equipment_parts",
+    "电池": "electrical_equipment_parts",
+    "物流行业": "integrated_freight_logistics",
+    "航运港口": "marine_shipping",
+    "航空机场": "airports_air_services",
+    "铁路公路": "railroads",
+    "环保行业": "pollution_treatment_controls",
+    "包装材料": "containers_packaging",
+    "综合行业": "industrial_conglomerates",
+    "汽车整车": "auto_manufacturers",
+    "汽车零部件": "auto_parts",
+    "汽车服务": "auto_truck_dealerships",
+    "家电行业": "furnishings_fixtures_appliances",
+    "纺织服装": "textiles_apparel",
+    "珠宝首饰": "luxury_goods",
+    "商业百货": "department_stores",
+    "贸易行业": "traders_distributors",
+    "旅游酒店": "lodging",
+}
+
+
 def get_industry_sector(industry: str):
     """Get the sector from the industry."""
     for sector, industries in INDUSTRY_MAP.items():
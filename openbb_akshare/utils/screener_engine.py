@@ -0,0 +1,228 @@
+"""AKShare indexed in-memory screening module."""
+
+import logging
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+import numpy as np
+import pandas as pd
+from mysharelib.tools import setup_logger
+from openbb_akshare import project_name
+
+setup_logger(project_name)
+logger = logging.getLogger(__name__)
+
+# Screenable metrics and their snapshot columns.
+SCREEN_METRICS = {
+    "price": "最新价",
+    "change_percent": "涨跌幅",
+    "volume": "成交量",
+    "turnover": "成交额",
+    "market_cap": "总市值",
+    "pe": "市盈率-动态",
+}
+
+# Indexes of the snapshots currently loaded, per market.
+_indexes: Dict[str, "SnapshotIndex"] = {}
+_indexes_lock = threading.Lock()
+
+RangeFilters = Dict[str, Tuple[Optional[float], Optional[float]]]
+
+
+class SnapshotIndex:
+    """
+    Numeric columns of one market snapshot with sorted indexes for screening.
+
+    The metric columns are converted once when the snapshot is loaded. The sorted
+    index of a metric is built on the first range filter on it and kept until the
+    snapshot is replaced, so a range filter is two binary searches.
+    """
+
+    def __init__(self, market: str, timestamp: float, snapshot: pd.DataFrame):
+        self.market = market
+        self.timestamp = timestamp
+        self.snapshot = snapshot
+        self.values: Dict[str, np.ndarray] = {}
+        for metric, column in SCREEN_METRICS.items():
+            if column in snapshot.columns:
+                self.values[metric] = pd.to_numeric(snapshot[column], errors="coerce").to_numpy(dtype="f8")
+            else:
+                self.values[metric] = np.full(len(snapshot), np.nan)
+        self._sorted: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        self._lock = threading.Lock()
+        self.classification: Optional[pd.DataFrame] = None
+        self.sectors: Optional[pd.Categorical] = None
+        self.industries: Optional[pd.Categorical] = None
+
+    def classify(self, classification: pd.DataFrame):
+        """Join the sector classification onto the rows, once per classification."""
+        if self.classification is classification:
+            return
+        codes = self.snapshot["代码"].astype(str) if "代码" in self.snapshot.columns else pd.Series([], dtype=str)
+        joined = classification.reindex(codes)
+        self.sectors = pd.Categorical(joined["sector"])
+        self.industries = pd.Categorical(joined["industry"])
+        self.classification = classification
+
+    def __len__(self) -> int:
+        return len(self.snapshot)
+
+    def sorted_index(self, metric: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Return the row positions with a value of a metric, sorted by it, and the sorted values."""
+        entry = self._sorted.get(metric)
+        if entry is None:
+            with self._lock:
+                entry = self._sorted.get(metric)
+                if entry is None:
+                    values = self.values[metric]
+                    order = np.argsort(values, kind="stable")
+                    # NaN sorts last, so the rows without a value are cut off the end.
+                    order = order[:np.count_nonzero(~np.isnan(values))]
+                    entry = self._sorted[metric] = (order, values[order])
+        return entry
+
+    def range_positions(self, metric: str, low: Optional[float] = None, high: Optional[float] = None) -> np.ndarray:
+        """Return the row positions whose metric is in [low, high]; a missing bound is open."""
+        order, values = self.sorted_index(metric)
+        lo = np.searchsorted(values, low, side="left") if low is not None else 0
+        hi = np.searchsorted(values, high, side="right") if high is not None else len(values)
+        return order[lo:hi]
+
+    def select(self, filters: Optional[RangeFilters] = None, sector: Optional[str] = None) -> np.ndarray:
+        """Return the row positions which pass all range filters and are in a sector, in snapshot order."""
+        mask = None
+        if sector is not None:
+            if self.sectors is None:
+                raise ValueError("The snapshot has no sector classification")
+            categories = self.sectors.categories
+            code = categories.get_loc(sector) if sector in categories else -2
+            mask = self.sectors.codes == code
+        for metric, (low, high) in (filters or {}).items():
+            if low is None and high is None:
+                continue
+            hits = np.zeros(len(self), dtype=bool)
+            hits[self.range_positions(metric, low, high)] = True
+            mask = hits if mask is None else mask & hits
+        return np.arange(len(self)) if mask is None else np.flatnonzero(mask)
+
+    def sort_keys(self, positions: np.ndarray, metric: str, ascending: bool = False) -> np.ndarray:
+        """Return the keys ranking rows by a metric, smallest first; rows without a value rank last."""
+        keys = self.values[metric][positions]
+        keys = keys if ascending else -keys
+        return np.where(np.isnan(keys), np.inf, keys)
+
+    def top(self, positions: np.ndarray, metric: str, n: int, ascending: bool = False) -> np.ndarray:
+        """Return the ``n`` best positions by a metric, ranked, without sorting all of them."""
+        keys = self.sort_keys(positions, metric, ascending)
+        if n < len(positions):
+            best = np.argpartition(keys, n - 1)[:n]
+            positions, keys = positions[best], keys[best]
+        return positions[np.argsort(keys, kind="stable")]
+
+
+def get_snapshot_index(market: str, use_cache: bool = True) -> SnapshotIndex:
+    """Return the screening index of the current snapshot of a market, rebuilding it when the snapshot changed."""
+    from openbb_akshare.utils.fetch_quote import load_snapshot
+
+    timestamp, snapshot, _ = load_snapshot(market, use_cache)
+    with _indexes_lock:
+        index = _indexes.get(market)
+        if index is None or index.snapshot is not snapshot:
+            index = _indexes[market] = SnapshotIndex(market, timestamp, snapshot)
+    return index
+
+
+def screen(indexes: Iterable[SnapshotIndex], filters: Optional[RangeFilters] = None, sort_by: Optional[str] = None,
+           ascending: bool = False, limit: Optional[int] = None, sector: Optional[str] = None) -> pd.DataFrame:
+    """
+    Screen the snapshots of several markets.
+
+    Range filters and the ``limit`` are applied to the index positions, and only
+    the selected rows are taken from the snapshots at the end. With ``sort_by``
+    the top ``limit`` rows of each market are partitioned out and merged, so the
+    universe is never fully sorted.
+
+    Parameters:
+        indexes (Iterable[SnapshotIndex]): The markets to screen, in output order when not sorting.
+        filters (Dict[str, Tuple]): Metric -> (low, high) inclusive bounds, None for an open bound.
+        sort_by (str): Metric to rank the results by.
+        ascending (bool): Rank the smallest values first.
+        limit (int): Maximum number of rows to return.
+        sector (str): Only keep rows of this sector, e.g. "financial_services". The
+            indexes must have been classified with ``SnapshotIndex.classify``.
+
+    Returns:
+        DataFrame: The selected snapshot rows, with an ``exchange`` column, and
+        ``sector`` and ``industry`` columns for classified indexes.
+    """
+    from openbb_akshare.utils.fetch_quote import get_exchange_name
+    from openbb_akshare.utils.references import INDUSTRY_MAP, SECTOR_MAP
+
+    for metric in list(filters or {}) + ([sort_by] if sort_by else []):
+        if metric not in SCREEN_METRICS:
+            raise ValueError(f"Unsupported screener metric: {metric}")
+
+    indexes = list(indexes)
+    if limit is not None and limit <= 0:
+        return pd.DataFrame()
+    selected: List[np.ndarray] = []
+    for index in indexes:
+        positions = index.select(filters, sector)
+        if sort_by and limit is not None:
+            positions = index.top(positions, sort_by, limit, ascending)
+        selected.append(positions)
+
+    # Pick the final (market, position) pairs before touching any snapshot row.
+    owners = np.repeat(np.arange(len(indexes)), [len(p) for p in selected])
+    positions = np.concatenate(selected) if selected else np.empty(0, dtype=int)
+    if sort_by:
+        keys = np.concatenate([index.sort_keys(p, sort_by, ascending) for index, p in zip(indexes, selected)]
+                              or [np.empty(0)])
+        if limit is not None and limit < len(keys):
+            best = np.argpartition(keys, limit - 1)[:limit]
+            owners, positions, keys = owners[best], positions[best], keys[best]
+        order = np.argsort(keys, kind="stable")
+        owners, positions = owners[order], positions[order]
+    elif limit is not None:
+        owners, positions = owners[:limit], positions[:limit]
+
+    frames = []
+    for i, index in enumerate(indexes):
+        mine = np.flatnonzero(owners == i)
+        if len(mine):
+            rows = index.snapshot.iloc[positions[mine]].assign(exchange=get_exchange_name(index.market))
+            if index.sectors is not None:
+                sectors = index.sectors.take(positions[mine])
+                industries = index.industries.take(positions[mine])
+                rows["sector"] = np.asarray(sectors.map(SECTOR_MAP, na_action="ignore").astype(object))
+                rows["industry"] = [INDUSTRY_MAP[sector][industry] if isinstance(industry, str) else None
+                                    for sector, industry in zip(sectors, industries)]
+            frames.append(rows.set_axis(mine))
+    if not frames:
+        return pd.DataFrame()
+    return pd.concat(frames).sort_index().reset_index(drop=True)
+
+
+def sector_summary(indexes: Iterable[SnapshotIndex]) -> pd.DataFrame:
+    """
+    Aggregate classified snapshots by sector with one group-by.
+
+    Returns:
+        DataFrame: Per sector, the number of equities, the mean change percent,
+        the total turnover and the total market capitalization.
+    """
+    indexes = list(indexes)
+    if not indexes or any(index.sectors is None for index in indexes):
+        raise ValueError("All snapshots must have a sector classification")
+    # The classification gives every index the same categories, so the codes can be concatenated.
+    frame = pd.DataFrame({
+        "sector": pd.Categorical.from_codes(np.concatenate([index.sectors.codes for index in indexes]),
+                                            categories=indexes[0].sectors.categories),
+        **{metric: np.concatenate([index.values[metric] for index in indexes])
+           for metric in ("change_percent", "turnover", "market_cap")},
+    })
+    return frame.groupby("sector", observed=True).agg(
+        count=("change_percent", "size"),
+        change_percent=("change_percent", "mean"),
+        turnover=("turnover", "sum"),
+        market_cap=("market_cap", "sum"),
+    )
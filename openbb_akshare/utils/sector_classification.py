@@ -0,0 +1,132 @@
+"""AKShare sector and industry classification module."""
+
+import time
+import logging
+import threading
+from typing import List, Optional
+import pandas as pd
+from mysharelib.tools import setup_logger
+from openbb_akshare import project_name
+from openbb_akshare.utils.references import INDUSTRY_BOARD_MAP, INDUSTRY_MAP, SECTORS, get_industry_sector
+
+setup_logger(project_name)
+logger = logging.getLogger(__name__)
+
+CLASSIFICATION_SCHEMA = {
+    "code": "TEXT PRIMARY KEY",
+    "board": "TEXT",
+    "industry": "TEXT",
+    "sector": "TEXT",
+    "timestamp": "REAL",
+}
+
+# Board memberships change rarely, so the classification is rebuilt weekly.
+CLASSIFICATION_TTL = 7 * 24 * 60 * 60
+
+INDUSTRIES = list(dict.fromkeys(industry for industries in INDUSTRY_MAP.values() for industry in industries))
+
+_classification: Optional[pd.DataFrame] = None
+_loaded_at = 0.0
+_lock = threading.Lock()
+
+
+def _board_constituents(board: str) -> List[str]:
+    import akshare as ak
+    from openbb_akshare.utils.concurrency import host_slot
+
+    with host_slot("eastmoney"):
+        return ak.stock_board_industry_cons_em(symbol=board)["代码"].astype(str).tolist()
+
+
+def fetch_classification() -> pd.DataFrame:
+    """
+    Build the classification of all A-share codes from the Eastmoney industry boards.
+
+    The constituents of all boards are downloaded concurrently with
+    ``map_on_host``, and each board is mapped to an industry and sector with
+    ``INDUSTRY_BOARD_MAP``. Boards which fail to download are skipped.
+    """
+    import akshare as ak
+    from openbb_akshare.utils.concurrency import host_slot, map_on_host
+
+    with host_slot("eastmoney"):
+        boards = ak.stock_board_industry_name_em()["板块名称"].tolist()
+
+    rows = []
+    for board, (codes, error) in zip(boards, map_on_host("eastmoney", _board_constituents, boards)):
+        if error is not None:
+            logger.warning(f"Failed to fetch the constituents of industry board {board}: {error}")
+            continue
+        industry = INDUSTRY_BOARD_MAP.get(board)
+        sector = get_industry_sector(industry) if industry else None
+        rows.extend((code, board, industry, sector) for code in codes)
+
+    df = pd.DataFrame(rows, columns=["code", "board", "industry", "sector"])
+    # A few codes are listed on more than one board; the first one wins.
+    return df.drop_duplicates("code").reset_index(drop=True)
+
+
+def _to_categorical(df: pd.DataFrame) -> pd.DataFrame:
+    """Index a classification by code, with the board, industry and sector as categoricals."""
+    df = df.set_index("code")[["board", "industry", "sector"]]
+    return df.astype({
+        "board": "category",
+        "industry": pd.CategoricalDtype(INDUSTRIES),
+        "sector": pd.CategoricalDtype(SECTORS),
+    })
+
+
+def get_classification(use_cache: bool = True) -> pd.DataFrame:
+    """
+    Return the sector classification of all A-share codes.
+
+    The classification is persisted in the cache database and held in memory,
+    indexed by code with categorical columns, so it can be joined onto whole
+    snapshots at once. Concurrent rebuilds are coalesced into one.
+
+    Returns:
+        DataFrame: board, industry and sector per code.
+    """
+    from openbb_akshare.utils.single_flight import single_flight
+
+    with _lock:
+        if use_cache and _classification is not None and time.time() - _loaded_at < CLASSIFICATION_TTL:
+            return _classification
+    return single_flight(f"sector_classification_{use_cache}", _load_classification, use_cache)
+
+
+def _load_classification(use_cache: bool) -> pd.DataFrame:
+    global _classification, _loaded_at
+    from openbb_akshare.utils.cache_db import get_table_cache
+
+    with _lock:
+        if use_cache and _classification is not None and time.time() - _loaded_at < CLASSIFICATION_TTL:
+            return _classification
+
+    cache = get_table_cache(CLASSIFICATION_SCHEMA, "sector_classification", primary_key="code")
+    if use_cache:
+        cached = cache.read_dataframe()
+        if not cached.empty and time.time() - cached["timestamp"].min() < CLASSIFICATION_TTL:
+            with _lock:
+                _classification, _loaded_at = _to_categorical(cached), cached["timestamp"].min()
+                return _classification
+
+    # The download runs without _lock, so lookups of the current classification are not held up.
+    logger.info("Fetching the industry board constituents...")
+    df = fetch_classification()
+    if df.empty:
+        raise ValueError("No industry board constituents could be fetched")
+    loaded_at = time.time()
+    cache.write_dataframe(df.assign(timestamp=loaded_at))
+    with _lock:
+        _classification, _loaded_at = _to_categorical(df), loaded_at
+        return _classification
+
+
+def set_classification(df: pd.DataFrame) -> pd.DataFrame:
+    """Install a classification with code, board, industry and sector columns in memory, e.g. for tests."""
+    global _classification, _loaded_at
+    with _lock:
+        _classification, _loaded_at = _to_categorical(df), float("inf")
+        return _classification
+
@@ -0,0 +1,126 @@
+"""AKShare single-flight coalescing of cached upstream loads."""
+
+import os
+import re
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Dict
+import pandas as pd
+from mysharelib.blob_cache import BlobCache
+from mysharelib.tools import setup_logger, normalize_symbol
+from openbb_akshare import project_name
+
+setup_logger(project_name)
+logger = logging.getLogger(__name__)
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows has no advisory file locks in fcntl.
+    fcntl = None
+
+
+class _Call:
+    """An in-flight load which other callers of the same key wait for."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException = None
+        self.followers = 0
+
+
+_calls: Dict[str, _Call] = {}
+_lock = threading.Lock()
+
+
+def get_lock_dir(project: str = project_name) -> str:
+    """Return the directory holding the advisory lock files, next to the SQLite cache."""
+    from mysharelib import get_cache_path
+
+    lock_dir = os.path.join(os.path.dirname(get_cache_path(project)), "locks")
+    os.makedirs(lock_dir, exist_ok=True)
+    return lock_dir
+
+
+@contextmanager
+def process_lock(key: str):
+    """
+    Hold an exclusive advisory file lock for a key across processes.
+
+    Without ``fcntl`` the lock is a no-op, so loads are only coalesced in-process.
+    """
+    if fcntl is None:
+        yield
+        return
+    path = os.path.join(get_lock_dir(), re.sub(r"[^A-Za-z0-9_.-]", "_", key) + ".lock")
+    with open(path, "a+") as f:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+def single_flight(key: str, func: Callable, *args: Any, **kwargs: Any) -> Any:
+    """
+    Run a cached load once for all concurrent callers of the same key.
+
+    The first caller in a process runs ``func`` while holding the cross-process
+    lock of the key; the other threads, including coroutines offloaded with
+    ``run_blocking``, wait for its result or exception. A caller in another
+    process waits for the lock and then runs ``func`` itself, which then finds
+    the cache filled. ``func`` must therefore check the cache before fetching.
+
+    DataFrame results are copied for each waiting caller, so every caller may
+    modify the frame it gets.
+    """
+    with _lock:
+        call = _calls.get(key)
+        leader = call is None
+        if leader:
+            call = _calls[key] = _Call()
+        else:
+            call.followers += 1
+
+    if not leader:
+        call.done.wait()
+        if call.error is not None:
+            raise call.error
+        return call.result.copy() if isinstance(call.result, pd.DataFrame) else call.result
+
+    try:
+        with process_lock(key):
+            call.result = func(*args, **kwargs)
+    except BaseException as e:
+        call.error = e
+        raise
+    finally:
+        with _lock:
+            _calls.pop(key, None)
+        call.done.set()
+    if call.followers and isinstance(call.result, pd.DataFrame):
+        return call.result.copy()
+    return call.result
+
+
+class CoalescingBlobCache(BlobCache):
+    """
+    ``BlobCache`` whose loads of the same key are coalesced with ``single_flight``.
+
+    The blob table is created once per process on a pooled connection; the loads
+    themselves still open their own connection in ``BlobCache``, which the WAL
+    mode set by the pool applies to as well.
+    """
+
+    def _ensure_db_exists(self):
+        from openbb_akshare.utils.cache_db import init_once
+
+        init_once(self.db_path, self.table_name, lambda conn: conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {self.table_name} (key TEXT PRIMARY KEY, timestamp REAL, data BLOB)"))
+
+    def load_cached_data(self, symbol: str, report_type, use_cache, get_data, api_key: str = "", *args, **kwargs):
+        symbol_b, symbol_f, market = normalize_symbol(symbol)
+        key = f"{self.table_name}_{market}{symbol_b}_{report_type}_{use_cache}_{args}_{sorted(kwargs.items())}"
+        return single_flight(key, super().load_cached_data, symbol, report_type, use_cache, get_data, api_key,
+                             *args, **kwargs)
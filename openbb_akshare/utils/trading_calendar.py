@@ -0,0 +1,315 @@
+"""AKShare exchange trading calendar module."""
+
+import json
+import math
+import time
+import logging
+import threading
+from datetime import (
+    date as dateType,
+    datetime,
+    time as timeType,
+    timedelta,
+    timezone
+)
+from typing import Dict, Iterable, List, Optional, Tuple
+import numpy as np
+import pandas as pd
+from mysharelib.tools import setup_logger
+from openbb_akshare import project_name
+
+setup_logger(project_name)
+logger = logging.getLogger(__name__)
+
+CALENDAR_SCHEMA = {
+    "market": "TEXT PRIMARY KEY",
+    "dates": "TEXT",
+    "timestamp": "REAL"
+}
+
+# Calendars are refreshed once a day, which also picks up newly announced holidays.
+CALENDAR_TTL = 24 * 60 * 60
+
+# SSE, SZSE and BSE share one calendar; HKEX has its own.
+CALENDAR_MARKETS = {
+    "SH": "CN",
+    "SZ": "CN",
+    "BJ": "CN",
+    "HK": "HK",
+}
+
+# Local time (UTC+8) after which the bars of a session are final.
+SESSION_CLOSE = {
+    "CN": timeType(15, 0),
+    "HK": timeType(16, 10),
+}
+
+# Market phases of a trading day in local time (UTC+8). The market is closed
+# outside of them. The HKEX closing auction is part of the afternoon session.
+SESSION_PHASES = {
+    "CN": [
+        ("pre_open", timeType(9, 15), timeType(9, 30)),
+        ("trading", timeType(9, 30), timeType(11, 30)),
+        ("lunch_break", timeType(11, 30), timeType(13, 0)),
+        ("trading", timeType(13, 0), timeType(15, 0)),
+    ],
+    "HK": [
+        ("pre_open", timeType(9, 0), timeType(9, 30)),
+        ("trading", timeType(9, 30), timeType(12, 0)),
+        ("lunch_break", timeType(12, 0), timeType(13, 0)),
+        ("trading", timeType(13, 0), timeType(16, 10)),
+    ],
+}
+
+# Length of the continuous trading session in minutes.
+SESSION_MINUTES = {
+    "CN": 240,
+    "HK": 330,
+}
+
+_calendars: Dict[str, "TradingCalendar"] = {}
+_lock = threading.Lock()
+
+
+def calendar_market(market: str) -> str:
+    """Map a symbol market such as SH, SZ, BJ or HK to its calendar."""
+    return CALENDAR_MARKETS.get(market.upper(), market.upper())
+
+
+def exchange_time(timestamp: float) -> datetime:
+    """Convert a POSIX timestamp to the exchange time (UTC+8) as a naive datetime."""
+    return datetime.fromtimestamp(timestamp, tz=timezone.utc).replace(tzinfo=None) + timedelta(hours=8)
+
+
+def exchange_timestamp(moment: datetime) -> float:
+    """Convert a naive exchange time (UTC+8) to a POSIX timestamp."""
+    return (moment - timedelta(hours=8)).replace(tzinfo=timezone.utc).timestamp()
+
+
+def exchange_now() -> datetime:
+    """Return the current exchange time (UTC+8) as a naive datetime."""
+    return exchange_time(time.time())
+
+
+def _to_day(day) -> np.datetime64:
+    return np.datetime64(pd.Timestamp(day).date(), "D")
+
+
+def _to_date(day: np.datetime64) -> dateType:
+    return day.astype("datetime64[D]").item()
+
+
+class TradingCalendar:
+    """
+    Trading days of one exchange calendar held as a sorted array plus a bitset.
+
+    ``is_trading_day`` and ``count_trading_days`` are O(1) lookups into the bitset
+    and its prefix sums; ``trading_days_between`` and ``previous_trading_day``
+    binary search the sorted array. Days outside the known calendar fall back to
+    plain weekdays. ``loaded_at`` is the time the days were fetched, which the
+    in-memory cache expires the calendar by; it defaults to now.
+    """
+
+    def __init__(self, market: str, days: Iterable, loaded_at: Optional[float] = None):
+        self.market = calendar_market(market)
+        self.loaded_at = time.time() if loaded_at is None else loaded_at
+        self.days = np.unique(np.asarray([_to_day(d) for d in days], dtype="datetime64[D]"))
+        if len(self.days) == 0:
+            raise ValueError(f"Trading calendar of {self.market} is empty")
+        self.first = self.days[0]
+        self.last = self.days[-1]
+        self._open = np.zeros(int((self.last - self.first).astype(int)) + 1, dtype=bool)
+        self._open[(self.days - self.first).astype(int)] = True
+        self._cum = np.concatenate([[0], np.cumsum(self._open)])
+
+    def is_trading_day(self, day) -> bool:
+        """Check whether the exchange is open on a day."""
+        d = _to_day(day)
+        if self.first <= d <= self.last:
+            return bool(self._open[int((d - self.first).astype(int))])
+        return bool(np.is_busday(d))
+
+    def count_trading_days(self, start, end) -> int:
+        """Count the trading days in [start, end]."""
+        s, e = _to_day(start), _to_day(end) + 1
+        if e <= s:
+            return 0
+        count = 0
+        lo, hi = max(s, self.first), min(e, self.last + 1)
+        if lo < hi:
+            count += int(self._cum[int((hi - self.first).astype(int))] - self._cum[int((lo - self.first).astype(int))])
+        if s < self.first:
+            count += int(np.busday_count(s, min(e, self.first)))
+        if e > self.last + 1:
+            count += int(np.busday_count(max(s, self.last + 1), e))
+        return count
+
+    def trading_days_between(self, start, end) -> List[dateType]:
+        """Return the trading days in [start, end]."""
+        s, e = _to_day(start), _to_day(end)
+        if e < s:
+            return []
+        inside = self.days[np.searchsorted(self.days, s, side="left"):np.searchsorted(self.days, e, side="right")]
+        parts = [inside]
+        if s < self.first:
+            before = np.arange(s, min(e + 1, self.first), dtype="datetime64[D]")
+            parts.insert(0, before[np.is_busday(before)])
+        if e > self.last:
+            after = np.arange(max(s, self.last + 1), e + 1, dtype="datetime64[D]")
+            parts.append(after[np.is_busday(after)])
+        return [_to_date(d) for d in np.concatenate(parts)]
+
+    def previous_trading_day(self, day) -> dateType:
+        """Return the last trading day strictly before a day."""
+        d = _to_day(day) - 1
+        if d > self.last:
+            d = np.busday_offset(d, 0, roll="backward")
+            if d > self.last:
+                return _to_date(d)
+        i = np.searchsorted(self.days, d, side="right")
+        if i == 0:
+            return _to_date(np.busday_offset(d, 0, roll="backward"))
+        return _to_date(self.days[i - 1])
+
+    def next_trading_day(self, day) -> dateType:
+        """Return the first trading day strictly after a day."""
+        d = _to_day(day) + 1
+        if d > self.last:
+            return _to_date(np.busday_offset(d, 0, roll="forward"))
+        if d < self.first:
+            d = np.busday_offset(d, 0, roll="forward")
+            if d < self.first:
+                return _to_date(d)
+        return _to_date(self.days[np.searchsorted(self.days, d, side="left")])
+
+    def market_phase(self, now: Optional[datetime] = None) -> Tuple[str, datetime]:
+        """
+        Return the market phase at a local exchange time and when it ends.
+
+        The phase is one of ``pre_open``, ``trading``, ``lunch_break`` or ``closed``.
+        A closed market reopens with the pre-open phase of the next trading day.
+        """
+        if now is None:
+            now = exchange_now()
+        phases = SESSION_PHASES.get(self.market, SESSION_PHASES["CN"])
+        if self.is_trading_day(now.date()):
+            for phase, start, end in phases:
+                if now.time() < start:
+                    return "closed", datetime.combine(now.date(), start)
+                if now.time() < end:
+                    return phase, datetime.combine(now.date(), end)
+        return "closed", datetime.combine(self.next_trading_day(now.date()), phases[0][1])
+
+    def previous_close(self, now: Optional[datetime] = None) -> dateType:
+        """
+        Return the last trading day whose session has closed.
+
+        Bars up to this day are final and can be cached for good. ``now`` is the
+        local exchange time and defaults to the current time in UTC+8.
+        """
+        if now is None:
+            now = exchange_now()
+        if self.is_trading_day(now.date()) and now.time() >= SESSION_CLOSE.get(self.market, timeType(15, 0)):
+            return now.date()
+        return self.previous_trading_day(now.date())
+
+    def expected_bar_count(self, start, end, interval: str = "1d") -> int:
+        """Return the number of bars a complete series has in [start, end]."""
+        days = self.count_trading_days(start, end)
+        if interval == "1d":
+            return days
+        minutes = int(interval.rstrip("m"))
+        return days * math.ceil(SESSION_MINUTES.get(self.market, 240) / minutes)
+
+
+def fetch_trading_days(market: str) -> List[dateType]:
+    """Download the trading days of a calendar."""
+    import akshare as ak
+    from openbb_akshare.utils.concurrency import host_slot
+
+    with host_slot("sina"):
+        if calendar_market(market) == "HK":
+            # There is no HKEX calendar endpoint; the Hang Seng index trades on every session.
+            return list(pd.to_datetime(ak.stock_hk_index_daily_sina(symbol="HSI")["date"]).dt.date)
+        return list(ak.tool_trade_date_hist_sina()["trade_date"])
+
+
+def fallback_trading_days(market: str, start: dateType = dateType(1990, 12, 19),
+                          end: Optional[dateType] = None) -> List[dateType]:
+    """Approximate a calendar from weekdays and the mainland holiday table when it cannot be downloaded."""
+    from chinese_calendar import is_workday
+
+    end = end or dateType(datetime.now().year, 12, 31)
+    days = [d.date() for d in pd.bdate_range(start, end)]
+    if calendar_market(market) == "HK":
+        return days
+
+    def open_on(day):
+        try:
+            return is_workday(day)
+        except NotImplementedError:
+            return True
+
+    return [d for d in days if open_on(d)]
+
+
+def get_trading_calendar(market: str = "SH", use_cache: bool = True) -> TradingCalendar:
+    """
+    Return the trading calendar of a market.
+
+    The calendar is downloaded once, persisted in the cache database and held in
+    memory afterwards, so lookups never touch the network or the disk. Concurrent
+    loads of the same market are coalesced into one, and lookups of other markets
+    never wait for a download.
+    """
+    from openbb_akshare.utils.single_flight import single_flight
+
+    key = calendar_market(market)
+    with _lock:
+        calendar = _calendars.get(key)
+    if use_cache and calendar is not None and time.time() - calendar.loaded_at < CALENDAR_TTL:
+        return calendar
+    return single_flight(f"trading_calendar_{key}_{use_cache}", _load_trading_calendar, key, use_cache)
+
+
+def _load_trading_calendar(key: str, use_cache: bool) -> TradingCalendar:
+    from openbb_akshare.utils.cache_db import get_table_cache
+
+    with _lock:
+        calendar = _calendars.get(key)
+    if use_cache and calendar is not None and time.time() - calendar.loaded_at < CALENDAR_TTL:
+        return calendar
+
+    cache = get_table_cache(CALENDAR_SCHEMA, "trading_calendar", primary_key="market")
+    cached = cache.read_rows({"market": key}) if use_cache else pd.DataFrame()
+    if not cached.empty and time.time() - cached["timestamp"].iloc[0] < CALENDAR_TTL:
+        calendar = TradingCalendar(key, json.loads(cached["dates"].iloc[0]), loaded_at=cached["timestamp"].iloc[0])
+    else:
+        try:
+            logger.info(f"Fetching the {key} trading calendar...")
+            calendar = TradingCalendar(key, fetch_trading_days(key))
+            cache.update_or_insert(pd.DataFrame([{
+                "market": key,
+                "dates": json.dumps([d.isoformat() for d in map(_to_date, calendar.days)]),
+                "timestamp": calendar.loaded_at,
+            }]))
+        except Exception as e:
+            logger.warning(f"Failed to fetch the {key} trading calendar, using weekdays and holidays instead: {e}")
+            # Retry the download after an hour instead of a day.
+            calendar = TradingCalendar(key, fallback_trading_days(key), loaded_at=time.time() - CALENDAR_TTL + 60 * 60)
+    with _lock:
+        _calendars[key] = calendar
+    return calendar
+
+
+def set_trading_calendar(market: str, days: Iterable) -> TradingCalendar:
+    """Install the calendar of a market in memory, e.g. for tests or offline use."""
+    calendar = TradingCalendar(market, days, loaded_at=float("inf"))
+    with _lock:
+        _calendars[calendar.market] = calendar
+    return calendar
+
+
+def last_closing_day(market: str = "SH") -> dateType:
+    """Return the last trading day of a market whose session has closed."""
+    return get_trading_calendar(market).previous_close()
@@ -0,0 +1,36 @@
+import threading
+
+import pandas as pd
+
+from openbb_akshare.utils import cache_db
+
+
+def test_connection_is_pooled_per_thread_in_wal_mode(tmp_path):
+    db_path = str(tmp_path / "pool.db")
+    conn = cache_db.get_connection(db_path)
+    assert cache_db.get_connection(db_path) is conn
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+    other = []
+    thread = threading.Thread(target=lambda: other.append(cache_db.get_connection(db_path)))
+    thread.start()
+    thread.join()
+    assert other[0] is not conn
+
+
+def test_init_once_and_shared_table_cache(tmp_path):
+    db_path = str(tmp_path / "pool.db")
+    calls = []
+    for _ in range(3):
+        cache_db.init_once(db_path, "probe", calls.append)
+    assert len(calls) == 1
+
+    schema = {"symbol": "TEXT PRIMARY KEY", "name": "TEXT"}
+    cache = cache_db.get_table_cache(schema, "names", db_path=db_path)
+    assert cache_db.get_table_cache(schema, "names", db_path=db_path) is cache
+
+    cache.update_or_insert(pd.DataFrame({"symbol": ["600036.SS", "00700.HK"], "name": ["招商银行", "腾讯控股"]}))
+    cache.update_or_insert(pd.DataFrame({"symbol": ["600036.SS"], "name": ["招行"]}))
+    rows = cache.read_rows({"symbol": "600036.SS"})
+    assert rows["name"].tolist() == ["招行"]
+    assert len(cache.read_dataframe()) == 2
@@ -0,0 +1,110 @@
+import asyncio
+import threading
+import time
+import pandas as pd
+from openbb_akshare.utils import concurrency
+
+
+def test_host_slot_caps_concurrency():
+    concurrency.set_host_limit("test_host", 2)
+    active = []
+    peak = []
+    lock = threading.Lock()
+
+    def call():
+        with concurrency.host_slot("test_host"):
+            with lock:
+                active.append(1)
+                peak.append(len(active))
+            time.sleep(0.02)
+            with lock:
+                active.pop()
+
+    futures = [concurrency.get_executor().submit(call) for _ in range(8)]
+    for future in futures:
+        future.result()
+    assert max(peak) == 2
+
+
+def test_map_on_host_from_a_shared_worker(monkeypatch):
+    from concurrent.futures import ThreadPoolExecutor
+
+    def call(item):
+        if item == 2:
+            raise ValueError("failed")
+        return item * 10
+
+    # Called from the only shared worker, the items must not be submitted back to the shared executor.
+    shared = ThreadPoolExecutor(max_workers=1)
+    monkeypatch.setattr(concurrency, "get_executor", lambda: shared)
+    try:
+        results = shared.submit(concurrency.map_on_host, "test_host", call, range(5), 2).result(timeout=5)
+    finally:
+        shared.shutdown(wait=False)
+    assert [result for result, error in results] == [0, 10, None, 30, 40]
+    assert isinstance(results[2][1], ValueError)
+
+
+def test_aak_download_many(monkeypatch):
+    from openbb_akshare.utils import helpers
+
+    def fake_download(symbol, start_date, end_date, **kwargs):
+        if symbol == "BAD":
+            raise ValueError("no data")
+        return pd.DataFrame({"date": pd.to_datetime(["2025-06-02"]), "close": [1.0]})
+
+    monkeypatch.setattr(helpers, "ak_download", fake_download)
+    monkeypatch.setattr(helpers, "is_history_cached", lambda *args: False)
+    df = asyncio.run(helpers.aak_download_many(["600036", "BAD", "00700"]))
+    assert list(df["symbol"]) == ["600036", "00700"]
+
+
+def test_ak_download_many_inside_a_running_loop(monkeypatch):
+    from openbb_akshare.utils import helpers
+
+    monkeypatch.setattr(helpers, "ak_download", lambda symbol, *args, **kwargs: pd.DataFrame({"close": [1.0]}))
+    monkeypatch.setattr(helpers, "is_history_cached", lambda *args: False)
+
+    async def notebook_cell():
+        return helpers.ak_download_many(["600036", "00700"])
+
+    df = asyncio.run(notebook_cell())
+    assert list(df["symbol"]) == ["600036", "00700"]
+
+
+def test_equity_profile_fetches_concurrently(monkeypatch, tmp_path):
+    import warnings
+    from openbb_akshare.models.equity_profile import AKShareEquityProfileFetcher
+    from openbb_akshare.utils import cache_db, fetch_equity_info
+
+    monkeypatch.setattr(cache_db, "get_db_path", lambda project=None: str(tmp_path / "profiles.db"))
+    cache = fetch_equity_info.get_equity_info_cache()
+    active = []
+    peak = []
+    lock = threading.Lock()
+
+    def fake_fetch(symbol, api_key=None, use_cache=True):
+        with lock:
+            active.append(1)
+            peak.append(len(active))
+        time.sleep(0.05)
+        with lock:
+            active.pop()
+        if symbol == "000000.SZ":
+            raise ValueError("unknown symbol")
+        cache.update_or_insert(pd.DataFrame([{"symbol": symbol, "org_name_cn": f"公司{symbol}",
+                                              "fetched_at": time.time()}]))
+
+    monkeypatch.setattr(fetch_equity_info, "fetch_equity_info", fake_fetch)
+    symbols = [f"60000{i}" for i in range(8)]
+    query = AKShareEquityProfileFetcher.transform_query({"symbol": ",".join(symbols + ["000000"])})
+
+    start = time.perf_counter()
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter("always")
+        results = asyncio.run(AKShareEquityProfileFetcher.aextract_data(query, None))
+    assert time.perf_counter() - start < 0.5
+    # The upstream calls are bounded by the Xueqiu host limit rather than by the shared executor.
+    assert 1 < max(peak) <= concurrency.HOST_LIMITS["xueqiu"]
+    assert [r["symbol"] for r in results] == [f"{symbol}.SH" for symbol in symbols]
+    assert any("000000 -> ValueError: unknown symbol" in str(w.message) for w in caught)
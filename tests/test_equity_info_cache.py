@@ -133,3 +133,87 @@ def test_ak_xq_fetch_equity_info(symbol, logger):
     equity_info_df = obb.equity.profile(symbol=symbol, provider="akshare").to_dataframe()
     logger.info(f"obb.equity.profile:{symbol}, {len(equity_info_df)}")
     assert equity_info_df.shape[0] > 0
+
+
+def test_fetch_equity_info_many_reads_hits_and_fetches_misses(sample_equity_info_df, tmp_path, monkeypatch):
+    from openbb_akshare.utils import cache_db, fetch_equity_info as equity_info_module
+
+    monkeypatch.setattr(cache_db, "get_db_path", lambda project=None: str(tmp_path / "many.db"))
+    cache = cache_db.get_table_cache(EQUITY_INFO_SCHEMA, "equity_info", primary_key="symbol")
+    cache.update_or_insert(sample_equity_info_df.assign(symbol="601127.SH", fetched_at=time.time()))
+
+    fetched = []
+
+    def fake_fetch(symbol, api_key=None, use_cache=True):
+        fetched.append(symbol)
+        if symbol == "000000.SZ":
+            raise ValueError("unknown symbol")
+        cache.update_or_insert(sample_equity_info_df.assign(symbol=symbol, org_name_en=f"{symbol} Ltd.",
+                                                            fetched_at=time.time()))
+
+    monkeypatch.setattr(equity_info_module, "fetch_equity_info", fake_fetch)
+    result = equity_info_module.fetch_equity_info_many(["00700.HK", "601127", "000000.SZ", "600036.SH"])
+    assert sorted(fetched) == ["000000.SZ", "00700.HK", "600036.SH"]
+    assert result["symbol"].tolist() == ["00700.HK", "601127.SH", "600036.SH"]
+    assert result["org_name_en"].tolist() == ["00700.HK Ltd.", "Seres Group Co.,Ltd.", "600036.SH Ltd."]
+
+
+def test_equity_info_expires_and_refreshes_oldest(sample_equity_info_df, tmp_path, monkeypatch):
+    from openbb_akshare.utils import cache_db, fetch_equity_info as equity_info_module
+
+    db_path = str(tmp_path / "legacy.db")
+    monkeypatch.setattr(cache_db, "get_db_path", lambda project=None: db_path)
+    # A table cached before fetched_at existed.
+    legacy_schema = {k: v for k, v in EQUITY_INFO_SCHEMA.items() if k != "fetched_at"}
+    legacy = TableCache(legacy_schema, project=project_name, db_path=db_path, table_name="equity_info",
+                        primary_key="symbol")
+    legacy.update_or_insert(sample_equity_info_df.assign(symbol="601127.SH"))
+
+    cache = equity_info_module.get_equity_info_cache()
+    now = time.time()
+    cache.update_or_insert(sample_equity_info_df.assign(symbol="600036.SH", fetched_at=now - 10))
+    cache.update_or_insert(sample_equity_info_df.assign(symbol="600000.SH", fetched_at=now - 2 * equity_info_module.EQUITY_INFO_MAX_AGE))
+
+    fetched = []
+
+    def fake_fetch(symbol, api_key=None, use_cache=True):
+        fetched.append(symbol)
+        cache.update_or_insert(sample_equity_info_df.assign(symbol=symbol, fetched_at=time.time()))
+
+    monkeypatch.setattr(equity_info_module, "fetch_equity_info", fake_fetch)
+    # The legacy row has no fetched_at and is the oldest.
+    assert equity_info_module.refresh_stale_equity_info(limit=1) == 1
+    assert fetched == ["601127.SH"]
+    assert equity_info_module.refresh_stale_equity_info() == 1
+    assert fetched == ["601127.SH", "600000.SH"]
+    assert equity_info_module.refresh_stale_equity_info() == 0
+
+    equity_info_module.prefetch_equity_info(["600036", "601127", "000001"])
+    assert fetched[2:] == ["000001.SZ"]
+
+
+def test_prefetch_submits_a_bounded_window(sample_equity_info_df, tmp_path, monkeypatch):
+    from openbb_akshare.utils import cache_db, concurrency, fetch_equity_info as equity_info_module
+
+    monkeypatch.setattr(cache_db, "get_db_path", lambda project=None: str(tmp_path / "prefetch.db"))
+    cache = equity_info_module.get_equity_info_cache()
+    executor = concurrency.get_host_executor("xueqiu")
+    submitted = []
+    peak = []
+
+    class CountingExecutor:
+        def submit(self, func, *args):
+            future = executor.submit(func, *args)
+            submitted.append(future)
+            peak.append(sum(not f.done() for f in submitted))
+            return future
+
+    def fake_fetch(symbol, api_key=None, use_cache=True):
+        time.sleep(0.01)
+        cache.update_or_insert(sample_equity_info_df.assign(symbol=symbol, fetched_at=time.time()))
+
+    monkeypatch.setattr(concurrency, "get_host_executor", lambda host: CountingExecutor())
+    monkeypatch.setattr(equity_info_module, "fetch_equity_info", fake_fetch)
+    symbols = [f"6000{i:02d}" for i in range(40)]
+    assert equity_info_module.prefetch_equity_info(symbols) == 40
+    assert max(peak) <= concurrency.HOST_LIMITS["xueqiu"]
@@ -0,0 +1,62 @@
+import pandas as pd
+from datetime import date
+from openbb_akshare.models.equity_historical import AKShareEquityHistoricalData
+from openbb_akshare.models.equity_quote import AKShareEquityQuoteData
+from openbb_akshare.utils.fast_transform import ColumnarResults, columnar_transform
+
+
+def test_columnar_transform_matches_model_validate():
+    df = pd.DataFrame({
+        "date": pd.to_datetime(["2025-06-02", "2025-06-03"]),
+        "open": [10.0, 10.2],
+        "high": [10.5, 10.6],
+        "low": [9.8, 10.0],
+        "close": [10.2, float("nan")],
+        "volume": [1000, 1200],
+        "amount": [10200.0, 12300.0],
+        "change": [0.2, None],
+        "change_percent": [2.0, None],
+    })
+    results = columnar_transform(AKShareEquityHistoricalData, df)
+    assert isinstance(results, ColumnarResults)
+    assert len(results) == 2
+    first = results[0]
+    expected = AKShareEquityHistoricalData.model_validate(df.to_dict(orient="records")[0])
+    assert first.model_dump(exclude={"date"}) == expected.model_dump(exclude={"date"})
+    # Daily bars are returned as dates rather than midnight timestamps.
+    assert first.date == date(2025, 6, 2)
+    assert pd.isna(results[-1].close)
+    assert results[-1].change is None
+    assert [bar.open for bar in results] == [10.0, 10.2]
+
+
+def test_columnar_transform_uses_aliases_and_keeps_extras():
+    df = pd.DataFrame({"代码": ["600036"], "名称": ["招商银行"], "最新价": ["42.1"], "市盈率-动态": [6.5]})
+    quote = columnar_transform(AKShareEquityQuoteData, df)[0]
+    assert quote.symbol == "600036"
+    assert quote.last_price == 42.1
+    assert quote.model_dump()["市盈率-动态"] == 6.5
+
+
+def test_columnar_results_round_trip_through_obbject():
+    from openbb_core.app.model.obbject import OBBject
+
+    df = pd.DataFrame({
+        "date": pd.to_datetime(["2025-06-02", "2025-06-03"]),
+        "open": [10.0, 10.2],
+        "high": [10.5, 10.6],
+        "low": [9.8, 10.0],
+        "close": [10.2, 10.4],
+        "volume": [1000, 1200],
+    })
+    results = columnar_transform(AKShareEquityHistoricalData, df)
+    assert isinstance(results, list)
+
+    obbject = OBBject(results=results)
+    frame = obbject.to_dataframe()
+    assert frame["close"].tolist() == [10.2, 10.4]
+    assert frame["volume"].tolist() == [1000, 1200]
+
+    restored = OBBject.model_validate_json(obbject.model_dump_json())
+    assert [bar["close"] for bar in restored.results] == [10.2, 10.4]
+    assert restored.results[0]["date"] == "2025-06-02"
@@ -0,0 +1,138 @@
+import threading
+import pandas as pd
+import pytest
+from openbb_akshare.utils import fetch_quote
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    from datetime import datetime
+    from openbb_akshare.utils.trading_calendar import exchange_timestamp, fallback_trading_days, set_trading_calendar
+
+    set_trading_calendar("SH", fallback_trading_days("SH", datetime(2025, 1, 1), datetime(2025, 12, 31)))
+    now = {"time": exchange_timestamp(datetime(2025, 6, 3, 20, 0))}
+    monkeypatch.setattr(fetch_quote.time, "time", lambda: now["time"])
+
+    def set_clock(moment):
+        now["time"] = exchange_timestamp(moment)
+
+    return set_clock
+
+
+@pytest.fixture
+def snapshot_source(tmp_path, monkeypatch, clock):
+    from openbb_akshare.utils import cache_db
+
+    calls = []
+
+    def fake_get_data(market):
+        calls.append(market)
+        return pd.DataFrame({"代码": ["600000", "600036"], "名称": ["浦发银行", "招商银行"], "最新价": [8.1, 42.1]})
+
+    monkeypatch.setattr(fetch_quote, "get_data", fake_get_data)
+    monkeypatch.setattr(cache_db, "get_db_path", lambda project=None: str(tmp_path / "quote.db"))
+    fetch_quote._snapshots.clear()
+    yield calls
+    fetch_quote._snapshots.clear()
+
+
+def test_lookup_quotes_uses_memory_snapshot(snapshot_source):
+    quotes = fetch_quote.lookup_quotes("SH", ["600036", "000000", "600000"])
+    assert list(quotes["代码"]) == ["600036", "600000"]
+    assert fetch_quote.load_cached_data("SH") is fetch_quote.load_cached_data("SH")
+    assert snapshot_source == ["SH"]
+
+
+def test_snapshot_after_close_is_kept_until_the_open(snapshot_source, clock):
+    from datetime import datetime
+
+    fetch_quote.load_cached_data("SH")
+    clock(datetime(2025, 6, 4, 9, 0))
+    fetch_quote.load_cached_data("SH")
+    assert snapshot_source == ["SH"]
+
+    # The pre-open phase starts at 9:15, which expires the overnight snapshot.
+    clock(datetime(2025, 6, 4, 9, 16))
+    fetch_quote.load_cached_data("SH")
+    assert snapshot_source == ["SH", "SH"]
+
+    fetch_quote._snapshots.clear()
+    fetch_quote.load_cached_data("SH")
+    assert snapshot_source == ["SH", "SH"]
+
+
+def test_stale_snapshot_is_served_while_refreshing(snapshot_source, clock):
+    from datetime import datetime
+
+    clock(datetime(2025, 6, 4, 10, 0))
+    first = fetch_quote.load_cached_data("SH")
+    clock(datetime(2025, 6, 4, 10, 5))
+    assert fetch_quote.load_cached_data("SH") is first
+    for _ in range(100):
+        if not fetch_quote._refreshing:
+            break
+        threading.Event().wait(0.05)
+    assert snapshot_source == ["SH", "SH"]
+    assert fetch_quote.load_cached_data("SH") is not first
+
+
+def test_stale_snapshot_reloads_a_newer_stored_one(snapshot_source, clock):
+    from datetime import datetime
+
+    first = fetch_quote.load_cached_data("SH")
+    clock(datetime(2025, 6, 4, 9, 16))
+    # Another process downloaded the market while this one waited for the lock.
+    newer = pd.DataFrame({"代码": ["600036"], "名称": ["招商银行"], "最新价": [43.0]})
+    fetch_quote.write_snapshot("SH", newer)
+
+    df = fetch_quote.load_cached_data("SH")
+    assert df is not first
+    assert list(df["最新价"]) == [43.0]
+    assert snapshot_source == ["SH"]
+
+
+def test_empty_or_unsupported_snapshots_are_not_written(snapshot_source):
+    fetch_quote.load_cached_data("SH")
+    stored = fetch_quote.snapshot_timestamp("SH")
+
+    fetch_quote.write_snapshot("SH", pd.DataFrame())
+    assert fetch_quote.snapshot_timestamp("SH") == stored
+    assert list(fetch_quote.query_quotes(["600036"])["代码"]) == ["600036"]
+    with pytest.raises(ValueError):
+        fetch_quote.write_snapshot("US", pd.DataFrame({"代码": ["AAPL"]}))
+
+
+def test_quote_rows_are_indexed_by_code(snapshot_source):
+    fetch_quote.load_cached_data("SH")
+    fetch_quote._snapshots.clear()
+
+    # Another process reads single rows without loading the snapshot.
+    quotes = fetch_quote.query_quotes(["600036"])
+    assert list(quotes["代码"]) == ["600036"]
+    assert list(quotes["最新价"]) == [42.1]
+
+    quotes = fetch_quote.lookup_quotes("SH", ["600036", "600000"])
+    assert list(quotes["名称"]) == ["招商银行", "浦发银行"]
+    assert "SH" not in fetch_quote._snapshots
+    assert snapshot_source == ["SH"]
+
+    with fetch_quote.get_connection() as conn:
+        plan = conn.execute(f"EXPLAIN QUERY PLAN SELECT * FROM {fetch_quote.QUOTE_TABLE} WHERE code IN ('600036')").fetchall()
+    assert "USING INDEX" in str(plan)
+
+
+def test_quote_fetcher_loads_each_market_once(monkeypatch):
+    import asyncio
+    from openbb_akshare.models.equity_quote import AKShareEquityQuoteFetcher
+
+    calls = []
+
+    def fake_lookup(market, codes, use_cache=True):
+        calls.append((market, list(codes)))
+        return pd.DataFrame({"代码": codes[::-1], "最新价": [1.0] * len(codes)})
+
+    monkeypatch.setattr(fetch_quote, "lookup_quotes", fake_lookup)
+    query = AKShareEquityQuoteFetcher.transform_query({"symbol": "600519,000001,00700,601398,999999"})
+    data = asyncio.run(AKShareEquityQuoteFetcher.aextract_data(query, None))
+    assert sorted(calls) == [("BJ", ["999999"]), ("HK", ["00700"]), ("SH", ["600519", "601398"]), ("SZ", ["000001"])]
+    assert [d.get("代码", d.get("symbol")) for d in data] == ["600519", "000001", "00700", "601398", "999999"]
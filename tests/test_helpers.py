@@ -39,6 +39,24 @@ def test_get_post_tax_dividend_per_share(dividend_str, expected):
     result = get_post_tax_dividend_per_share(dividend_str)
     assert result == pytest.approx(expected, rel=1e-4)
 
+@pytest.mark.parametrize(
+    "dividend_str,expected",
+    [
+        ("不分红", 0.0),
+        ("10派1元", 0.0),
+        ("10送3股转2股派1元", 0.5),
+        ("10转增4股", 0.4),
+        ("10.00转4.00股派2.00元(含税)", 0.4),
+        ("每10股派送股票股利3股", 0.3),
+        ("每股派发现金股利0.088332港元,每10股派送股票股利3股", 0.3),
+        ('A股10送3.5股派1.5元,B股10送2.426股派1.04元', 0.35),
+        ("", 0.0),
+    ]
+)
+def test_get_bonus_share_ratio(dividend_str, expected):
+    from openbb_akshare.utils.helpers import get_bonus_share_ratio
+    assert get_bonus_share_ratio(dividend_str) == pytest.approx(expected)
+
 def test_ak_download(logger):
     from openbb_akshare.utils.helpers import ak_download
     from datetime import date
@@ -0,0 +1,363 @@
+import os
+import pytest
+import sqlite3
+import pandas as pd
+from datetime import date
+from openbb_akshare import project_name
+from openbb_akshare.utils.helpers import EQUITY_HISTORY_SCHEMA
+from openbb_akshare.utils.history_cache import (
+    HistoryTableCache,
+    merge_ranges,
+    subtract_ranges,
+)
+
+
+def make_bars(dates):
+    return pd.DataFrame({
+        "date": [date.fromisoformat(d) for d in dates],
+        "open": [10.0] * len(dates),
+        "close": [10.5] * len(dates),
+        "high": [11.0] * len(dates),
+        "low": [9.5] * len(dates),
+        "volume": [1000] * len(dates),
+        "amount": [10500.0] * len(dates),
+        "change_percent": [0.5] * len(dates),
+        "change": [0.05] * len(dates),
+    })
+
+
+@pytest.fixture(autouse=True)
+def offline_calendar():
+    from openbb_akshare.utils import trading_calendar
+
+    for market in ("SH", "HK"):
+        trading_calendar.set_trading_calendar(market, trading_calendar.fallback_trading_days(market, date(2024, 1, 1), date(2025, 12, 31)))
+    yield
+    trading_calendar._calendars.clear()
+
+
+@pytest.fixture
+def history_cache(tmp_path):
+    return HistoryTableCache(EQUITY_HISTORY_SCHEMA, project=project_name,
+                             db_path=str(tmp_path / "history.db"), table_name="SH600036")
+
+
+def test_merge_ranges():
+    ranges = [(date(2025, 1, 6), date(2025, 1, 10)), (date(2025, 1, 11), date(2025, 1, 12)),
+              (date(2025, 2, 1), date(2025, 2, 3))]
+    assert merge_ranges(ranges) == [(date(2025, 1, 6), date(2025, 1, 12)), (date(2025, 2, 1), date(2025, 2, 3))]
+
+
+def test_subtract_ranges():
+    covered = [(date(2025, 1, 6), date(2025, 1, 10)), (date(2025, 1, 20), date(2025, 1, 24))]
+    missing = subtract_ranges(date(2025, 1, 1), date(2025, 1, 31), covered)
+    assert missing == [(date(2025, 1, 1), date(2025, 1, 5)),
+                       (date(2025, 1, 11), date(2025, 1, 19)),
+                       (date(2025, 1, 25), date(2025, 1, 31))]
+
+
+def test_merge_dataframe_keeps_existing_rows(history_cache):
+    history_cache.merge_dataframe(make_bars(["2025-06-02", "2025-06-03"]))
+    history_cache.merge_dataframe(make_bars(["2025-06-03", "2025-06-04"]))
+    df = history_cache.fetch_date_range("2025-06-01", "2025-06-30")
+    assert list(df["date"].dt.strftime("%Y-%m-%d")) == ["2025-06-02", "2025-06-03", "2025-06-04"]
+
+
+def test_missing_ranges_only_returns_gaps(history_cache):
+    history_cache.mark_covered(date(2025, 6, 2), date(2025, 6, 6))
+    history_cache.mark_covered(date(2025, 6, 16), date(2025, 6, 20))
+    # The weekend after the last covered day has no trading day and is skipped.
+    assert history_cache.missing_ranges(date(2025, 6, 2), date(2025, 6, 22)) == [
+        (date(2025, 6, 7), date(2025, 6, 15))
+    ]
+
+
+def test_legacy_cache_coverage(history_cache):
+    with sqlite3.connect(history_cache.db_path) as conn:
+        make_bars(["2025-06-02", "2025-06-03", "2025-06-04"]).to_sql(
+            history_cache.table_name, conn, if_exists="replace", index=False)
+    assert history_cache.covered_ranges() == [(date(2025, 6, 2), date(2025, 6, 4))]
+
+
+def test_check_cache_downloads_only_gaps(history_cache, monkeypatch):
+    from openbb_akshare.utils import helpers, listing_index, trading_calendar
+
+    requested = []
+
+    def fake_download(symbol, start_date, end_date, **kwargs):
+        requested.append((start_date, end_date))
+        return make_bars(["2025-06-09", "2025-06-10"]) if start_date == "20250607" else make_bars([])
+
+    monkeypatch.setattr(listing_index, "get_listing_date", lambda symbol: date(2025, 6, 2))
+    monkeypatch.setattr(trading_calendar, "last_closing_day", lambda market="SH": date(2025, 6, 10))
+    monkeypatch.setattr(helpers, "ak_download_without_cache", fake_download)
+
+    history_cache.merge_dataframe(make_bars(["2025-06-02", "2025-06-03", "2025-06-04", "2025-06-05", "2025-06-06"]))
+    history_cache.mark_covered(date(2025, 6, 2), date(2025, 6, 6))
+
+    assert helpers.check_cache("600036", history_cache) is False
+    assert requested == [("20250607", "20250610")]
+    assert helpers.check_cache("600036", history_cache) is True
+    assert len(requested) == 1
+
+
+def test_empty_replies_are_fetched_again(history_cache, monkeypatch):
+    from openbb_akshare.utils import helpers, listing_index
+
+    requested = []
+
+    def fake_download(symbol, start_date, end_date, **kwargs):
+        requested.append((start_date, end_date))
+        return make_bars([])
+
+    monkeypatch.setattr(helpers, "ak_download_without_cache", fake_download)
+    monkeypatch.setattr(listing_index, "get_listing",
+                        lambda symbol: listing_index.Listing(date(2025, 6, 16), None, "主板"))
+
+    # A transient empty reply leaves the days to be fetched on the next call.
+    assert helpers.fill_missing(history_cache, "600036", date(2025, 6, 16), date(2025, 6, 20)) is False
+    assert helpers.fill_missing(history_cache, "600036", date(2025, 6, 16), date(2025, 6, 20)) is False
+    assert len(requested) == 2 and history_cache.covered_ranges() == []
+
+    # Days before the listing have no bars and are covered.
+    helpers.fill_missing(history_cache, "600036", date(2025, 6, 2), date(2025, 6, 13))
+    assert history_cache.covered_ranges() == [(date(2025, 6, 2), date(2025, 6, 13))]
+
+
+def test_manifest_is_keyed_by_period_and_adjust(tmp_path, history_cache):
+    history_cache.mark_covered(date(2025, 6, 2), date(2025, 6, 6))
+    qfq_cache = HistoryTableCache(EQUITY_HISTORY_SCHEMA, project=project_name, db_path=history_cache.db_path,
+                                  table_name=history_cache.table_name, adjust="qfq")
+    assert history_cache.is_cached(date(2025, 6, 2), date(2025, 6, 6))
+    assert history_cache.refreshed_at() is not None
+    assert not qfq_cache.is_cached(date(2025, 6, 2), date(2025, 6, 6))
+    assert qfq_cache.refreshed_at() is None
+
+
+def test_empty_cache_is_not_cached(history_cache):
+    assert history_cache.covered_ranges() == []
+    assert not history_cache.is_cached(date(2025, 6, 2), date(2025, 6, 6))
+
+
+def test_columnar_cache_merge_and_range(tmp_path):
+    from openbb_akshare.utils.columnar_store import ColumnarHistoryCache, load_many
+
+    cache = ColumnarHistoryCache(EQUITY_HISTORY_SCHEMA, table_name="SH600036", root=str(tmp_path),
+                                 db_path=str(tmp_path / "history.db"))
+    assert cache.fetch_date_range("2025-06-01", "2025-06-30").empty
+
+    cache.merge_dataframe(make_bars(["2025-06-03", "2025-06-04"]))
+    update = make_bars(["2025-06-02", "2025-06-04"])
+    update["close"] = 12.0
+    cache.merge_dataframe(update)
+    cache.mark_covered(date(2025, 6, 2), date(2025, 6, 4))
+
+    df = cache.fetch_date_range("2025-06-03", "2025-06-30")
+    assert list(df["date"].dt.strftime("%Y-%m-%d")) == ["2025-06-03", "2025-06-04"]
+    assert list(df["close"]) == [10.5, 12.0]
+    assert cache.is_cached(date(2025, 6, 2), date(2025, 6, 4))
+
+    bars = load_many(EQUITY_HISTORY_SCHEMA, ["SH600036", "SZ000001"], "2025-06-01", "2025-06-02",
+                     columns=["close"], root=str(tmp_path))
+    assert list(bars["SH600036"]) == ["date", "close"]
+    assert list(bars["SH600036"]["date"]) == [20250602]
+    assert len(bars["SZ000001"]["close"]) == 0
+
+    # Each write is a new generation; readers of the previous one keep their maps.
+    mapped = cache.read_columns(["close"])["close"]
+    cache.merge_dataframe(make_bars(["2025-06-05"]))
+    assert list(mapped) == [12.0, 10.5, 12.0]
+    assert len(cache.read_columns(["close"])["close"]) == 4
+    assert len(os.listdir(cache.path)) == 3
+
+
+def test_columnar_cache_concurrent_merges_keep_all_bars(tmp_path):
+    from concurrent.futures import ThreadPoolExecutor
+    from openbb_akshare.utils.columnar_store import ColumnarHistoryCache
+
+    days = [f"2025-06-{day:02d}" for day in range(2, 30)]
+
+    def write(day):
+        cache = ColumnarHistoryCache(EQUITY_HISTORY_SCHEMA, table_name="SH600036", root=str(tmp_path),
+                                     db_path=str(tmp_path / "history.db"))
+        cache.merge_dataframe(make_bars([day]))
+        cache.mark_covered(date.fromisoformat(day), date.fromisoformat(day))
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(write, days))
+
+    cache = ColumnarHistoryCache(EQUITY_HISTORY_SCHEMA, table_name="SH600036", root=str(tmp_path),
+                                 db_path=str(tmp_path / "history.db"))
+    assert list(cache.read_dataframe()["date"].dt.strftime("%Y-%m-%d")) == days
+    assert cache.covered_ranges() == [(date(2025, 6, 2), date(2025, 6, 29))]
+
+
+def test_ak_download_many_serves_hits_before_misses(monkeypatch):
+    import threading
+    from concurrent.futures import ThreadPoolExecutor
+    from openbb_akshare.utils import concurrency, helpers
+
+    hit_served = threading.Event()
+    miss_threads = []
+
+    def fake_download(symbol, start_date, end_date, **kwargs):
+        if symbol == "600036":
+            # The miss only completes once the hit has been served.
+            miss_threads.append(threading.current_thread().name)
+            assert hit_served.wait(5)
+        else:
+            hit_served.set()
+        return make_bars(["2025-06-02"])
+
+    monkeypatch.setattr(helpers, "ak_download", fake_download)
+    monkeypatch.setattr(helpers, "is_history_cached", lambda symbol, start, end, period, interval: symbol != "600036")
+    # With a single shared worker, the miss must not hold it while the hits wait.
+    shared = ThreadPoolExecutor(max_workers=1)
+    monkeypatch.setattr(concurrency, "get_executor", lambda: shared)
+    try:
+        df = helpers.ak_download_many(["600036", "000001", "00700"], date(2025, 6, 2), date(2025, 6, 2))
+    finally:
+        shared.shutdown(wait=False)
+    assert list(df["symbol"]) == ["600036", "000001", "00700"]
+    assert miss_threads[0].startswith(f"{project_name}_eastmoney")
+
+
+def test_resample_history_weekly():
+    from openbb_akshare.utils.helpers import resample_history
+
+    daily = make_bars(["2025-06-05", "2025-06-06", "2025-06-09", "2025-06-10", "2025-06-13"])
+    daily["open"] = [10.0, 10.2, 10.4, 10.6, 10.8]
+    daily["close"] = [10.1, 10.3, 10.5, 10.7, 10.9]
+    daily["high"] = [10.2, 10.9, 10.6, 10.8, 11.5]
+    daily["low"] = [9.9, 10.1, 10.3, 9.0, 10.7]
+    daily["change"] = [0.1, 0.2, 0.2, 0.2, 0.2]
+
+    weekly = resample_history(daily, "weekly")
+    assert list(weekly["date"].dt.strftime("%Y-%m-%d")) == ["2025-06-06", "2025-06-13"]
+    assert list(weekly["open"]) == [10.0, 10.4]
+    assert list(weekly["high"]) == [10.9, 11.5]
+    assert list(weekly["low"]) == [9.9, 9.0]
+    assert list(weekly["close"]) == [10.3, 10.9]
+    assert list(weekly["volume"]) == [2000, 3000]
+    # The first week's previous close comes from its first daily bar: 10.1 - 0.1.
+    assert list(weekly["change"]) == pytest.approx([0.3, 0.6])
+    assert list(weekly["change_percent"]) == pytest.approx([3.0, 5.83])
+
+
+def test_resample_history_monthly():
+    from openbb_akshare.utils.helpers import period_start, resample_history
+
+    monthly = resample_history(make_bars(["2025-05-29", "2025-05-30", "2025-06-03"]), "monthly")
+    assert list(monthly["date"].dt.strftime("%Y-%m-%d")) == ["2025-05-30", "2025-06-03"]
+    assert period_start(date(2025, 6, 18), "monthly") == date(2025, 6, 1)
+    assert period_start(date(2025, 6, 18), "weekly") == date(2025, 6, 16)
+
+
+def test_minute_bars_only_refresh_open_session(tmp_path, monkeypatch):
+    from openbb_akshare.utils import cache_db, helpers, trading_calendar
+
+    requested = []
+
+    def fake_download(symbol, start_date, end_date, interval):
+        requested.append((start_date, end_date))
+        times = pd.date_range(f"{start_date} 09:35", periods=2, freq="5min")
+        bars = make_bars([]).reindex(range(len(times)))
+        bars["date"] = times
+        bars["close"] = [10.0 + len(requested), 10.1 + len(requested)]
+        return bars
+
+    monkeypatch.setattr(trading_calendar, "last_closing_day", lambda market="SH": date(2025, 6, 9))
+    monkeypatch.setattr(helpers, "ak_download_minutes_without_cache", fake_download)
+    monkeypatch.setattr(cache_db, "get_db_path", lambda project=None: str(tmp_path / "history.db"))
+
+    df = helpers.ak_download_minutes("600036", date(2025, 6, 9), date(2025, 6, 10), interval="5m")
+    assert requested == [(date(2025, 6, 9), date(2025, 6, 9)), (date(2025, 6, 10), date(2025, 6, 10))]
+    assert list(df["date"].dt.strftime("%Y-%m-%d %H:%M")) == [
+        "2025-06-09 09:35", "2025-06-09 09:40", "2025-06-10 09:35", "2025-06-10 09:40"]
+
+    # The closed session is served from the cache, the open one is downloaded again.
+    df = helpers.ak_download_minutes("600036", date(2025, 6, 9), date(2025, 6, 10), interval="5m")
+    assert requested[2:] == [(date(2025, 6, 10), date(2025, 6, 10))]
+    assert list(df["close"]) == [11.0, 11.1, 13.0, 13.1]
+
+
+def test_one_minute_bars_start_at_the_upstream_window(tmp_path, monkeypatch):
+    from datetime import datetime
+    from openbb_akshare.utils import cache_db, helpers, trading_calendar
+
+    requested = []
+
+    def fake_download(symbol, start_date, end_date, interval):
+        requested.append((start_date, end_date))
+        # Upstream has no bars for 2025-06-04, the first day asked for.
+        times = pd.date_range("2025-06-05 09:31", periods=1, freq="1min").append(
+            pd.date_range("2025-06-09 09:31", periods=1, freq="1min"))
+        bars = make_bars([]).reindex(range(len(times)))
+        bars["date"] = times
+        bars["close"] = 10.0
+        return bars
+
+    monkeypatch.setattr(trading_calendar, "_calendars", {})
+    trading_calendar.set_trading_calendar("SH", pd.bdate_range("2025-01-01", "2025-12-31").date)
+    monkeypatch.setattr(trading_calendar, "exchange_now", lambda: datetime(2025, 6, 10, 20, 0))
+    monkeypatch.setattr(trading_calendar, "last_closing_day", lambda market="SH": date(2025, 6, 10))
+    monkeypatch.setattr(helpers, "ak_download_minutes_without_cache", fake_download)
+    monkeypatch.setattr(cache_db, "get_db_path", lambda project=None: str(tmp_path / "history.db"))
+
+    # A year of 1-minute bars is asked for, but upstream only keeps the last five trading days.
+    helpers.ak_download_minutes("600036", date(2024, 6, 10), date(2025, 6, 10), interval="1m")
+    assert requested == [(date(2025, 6, 4), date(2025, 6, 10))]
+
+    cache = helpers.open_minute_cache("600036", "SH", "1m")
+    # The first day has no bars but later ones do, so it is covered too; the last one is not.
+    assert cache.covered_ranges() == [(date(2025, 6, 4), date(2025, 6, 9))]
+    assert cache is helpers.open_minute_cache("600036", "SH", "1m")
+
+
+def test_five_minute_bars_before_the_upstream_window_are_not_refetched(tmp_path, monkeypatch):
+    from openbb_akshare.utils import cache_db, helpers, trading_calendar
+
+    requested = []
+
+    def fake_download(symbol, start_date, end_date, interval):
+        requested.append((start_date, end_date))
+        # Upstream only keeps the last few days of 5-minute bars.
+        bars = make_bars([]).reindex(range(1))
+        bars["date"] = pd.Timestamp("2025-06-09 09:35")
+        return bars
+
+    monkeypatch.setattr(trading_calendar, "last_closing_day", lambda market="SH": date(2025, 6, 9))
+    monkeypatch.setattr(helpers, "ak_download_minutes_without_cache", fake_download)
+    monkeypatch.setattr(cache_db, "get_db_path", lambda project=None: str(tmp_path / "history.db"))
+
+    helpers.ak_download_minutes("600036", date(2025, 1, 2), date(2025, 6, 9), interval="5m")
+    helpers.ak_download_minutes("600036", date(2025, 1, 2), date(2025, 6, 9), interval="5m")
+    assert requested == [(date(2025, 1, 2), date(2025, 6, 9))]
+
+
+def test_eod_append_updates_existing_caches(history_cache):
+    from openbb_akshare.utils.eod_append import append_snapshot
+
+    history_cache.merge_dataframe(make_bars(["2025-06-05"]))
+    history_cache.mark_covered(date(2025, 6, 2), date(2025, 6, 5))
+    snapshot = pd.DataFrame({
+        "代码": ["600036", "600000", "600001"],
+        "今开": [10.0, 8.0, None],
+        "最高": [10.8, 8.2, None],
+        "最低": [9.9, 7.9, None],
+        "最新价": [10.6, 8.1, None],
+        "成交量": [1200, 900, 0],
+        "成交额": [12700.0, 7300.0, 0.0],
+        "涨跌额": [0.1, 0.1, None],
+        "涨跌幅": [0.95, 1.25, None],
+    })
+
+    # Only the existing SH600036 cache is updated; no tables are created for the others.
+    assert append_snapshot("SH", snapshot, date(2025, 6, 6), db_path=history_cache.db_path, backend="sqlite") == 1
+    df = history_cache.fetch_date_range("2025-06-01", "2025-06-30")
+    assert list(df["date"].dt.strftime("%Y-%m-%d")) == ["2025-06-05", "2025-06-06"]
+    assert df["close"].iloc[-1] == 10.6
+    assert history_cache.covered_ranges() == [(date(2025, 6, 2), date(2025, 6, 6))]
+    with sqlite3.connect(history_cache.db_path) as conn:
+        tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type='table'")}
+    assert "SH600000" not in tables
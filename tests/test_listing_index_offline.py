@@ -0,0 +1,53 @@
+from datetime import date
+
+import pandas as pd
+import pytest
+from openbb_akshare.utils import cache_db, listing_index
+
+
+@pytest.fixture
+def listing_sources(tmp_path, monkeypatch):
+    calls = []
+
+    def sources():
+        calls.append(1)
+        sh = pd.DataFrame({"证券代码": ["600036", "600001"], "上市日期": ["2002-04-09", "1998-01-01"]})
+        sz = pd.DataFrame({"A股代码": ["000001", "300750"], "A股上市日期": ["1991-04-03", "2018-06-11"],
+                           "板块": ["主板", "创业板"]})
+        delisted = pd.DataFrame({"公司代码": ["600001"], "上市日期": ["1998-01-01"], "暂停上市日期": ["2009-12-29"]})
+        return [
+            lambda: listing_index._listing_frame(sh, "SH", "证券代码", "上市日期", "主板"),
+            lambda: listing_index._listing_frame(sz, "SZ", "A股代码", "A股上市日期", "板块"),
+            lambda: listing_index._listing_frame(delisted, "SH", "公司代码", "上市日期", None, "暂停上市日期"),
+        ]
+
+    monkeypatch.setattr(cache_db, "get_db_path", lambda project=None: str(tmp_path / "listings.db"))
+    monkeypatch.setattr(listing_index, "_listing_sources", sources)
+    monkeypatch.setattr(listing_index, "_listings", {})
+    monkeypatch.setattr(listing_index, "_loaded_at", 0.0)
+    return calls
+
+
+def test_listing_index_is_built_in_bulk(listing_sources, monkeypatch):
+    import mysharelib.em.orginfo
+
+    looked_up = []
+    monkeypatch.setattr(mysharelib.em.orginfo, "get_listing_date",
+                        lambda symbol: looked_up.append(symbol) or pd.Timestamp("2004-06-16"))
+
+    assert listing_index.get_listing_date("600036") == date(2002, 4, 9)
+    assert listing_index.get_listing("300750.SZ") == listing_index.Listing(date(2018, 6, 11), None, "创业板")
+    assert listing_index.get_listing("600001.SH") == listing_index.Listing(date(1998, 1, 1), date(2009, 12, 29), "主板")
+    assert listing_sources == [1]
+
+    # HK symbols are not on the exchange lists and are looked up once.
+    assert listing_index.get_listing_date("00700.HK") == date(2004, 6, 16)
+    assert listing_index.get_listing_date("00700") == date(2004, 6, 16)
+    assert looked_up == ["00700.HK"]
+
+    # A new process loads the persisted index, including the HK row, without downloading.
+    monkeypatch.setattr(listing_index, "_listings", {})
+    monkeypatch.setattr(listing_index, "_loaded_at", 0.0)
+    assert listing_index.get_listing_date("00700.HK") == date(2004, 6, 16)
+    assert listing_index.get_listing_date("000001.SZ") == date(1991, 4, 3)
+    assert listing_sources == [1] and looked_up == ["00700.HK"]
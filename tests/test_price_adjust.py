@@ -0,0 +1,69 @@
+import pytest
+import pandas as pd
+from openbb_akshare.utils import price_adjust
+
+
+@pytest.fixture
+def raw_bars():
+    return pd.DataFrame({
+        "date": pd.to_datetime(["2025-06-03", "2025-06-04", "2025-06-05", "2025-06-06"]),
+        "open": [10.0, 10.0, 9.0, 4.6],
+        "high": [10.0, 10.0, 9.0, 4.6],
+        "low": [10.0, 10.0, 9.0, 4.6],
+        "close": [10.0, 10.0, 9.0, 4.5],
+        "volume": [100.0, 100.0, 100.0, 200.0],
+        "change": [0.0, 0.0, 0.0, 0.0],
+        "change_percent": [0.0, 0.0, 0.0, 0.0],
+    })
+
+
+@pytest.fixture
+def events(monkeypatch):
+    # A 1 yuan cash dividend on 06-05 and a 10送10股 bonus issue on 06-06.
+    events = pd.DataFrame({
+        "ex_date": pd.to_datetime(["2025-06-05", "2025-06-06"]),
+        "cash": [1.0, 0.0],
+        "ratio": [0.0, 1.0],
+    })
+    monkeypatch.setattr(price_adjust, "get_adjust_events", lambda symbol, use_cache=True: events)
+    return events
+
+
+def test_qfq_keeps_latest_prices(raw_bars, events):
+    adjusted = price_adjust.apply_adjustment("600036", raw_bars, "qfq")
+    # 0.9 for the dividend, 0.5 for the bonus issue.
+    assert list(adjusted["close"]) == pytest.approx([4.5, 4.5, 4.5, 4.5])
+    assert list(adjusted["volume"]) == list(raw_bars["volume"])
+
+
+def test_hfq_keeps_earliest_prices(raw_bars, events):
+    adjusted = price_adjust.apply_adjustment("600036", raw_bars, "hfq")
+    assert list(adjusted["close"]) == pytest.approx([10.0, 10.0, 10.0, 10.0])
+
+
+def test_no_adjustment_returns_raw_bars(raw_bars):
+    assert price_adjust.apply_adjustment("600036", raw_bars, "") is raw_bars
+
+
+def test_previous_closes_outside_the_window_are_downloaded_once(raw_bars, monkeypatch):
+    from openbb_akshare.utils import helpers
+
+    events = pd.DataFrame({
+        "ex_date": pd.to_datetime(["2025-03-10", "2025-05-12", "2025-06-05"]),
+        "cash": [1.0, 1.0, 1.0],
+        "ratio": [0.0, 0.0, 0.0],
+    })
+    monkeypatch.setattr(price_adjust, "get_adjust_events", lambda symbol, use_cache=True: events)
+    requested = []
+
+    def fake_download(symbol, start_date, end_date, **kwargs):
+        requested.append((str(start_date), str(end_date)))
+        return pd.DataFrame({"date": pd.to_datetime(["2025-03-07", "2025-05-09"]), "close": [20.0, 10.0]})
+
+    monkeypatch.setattr(helpers, "ak_download", fake_download)
+    raw_bars["vwap"] = raw_bars["close"]
+    adjusted = price_adjust.apply_adjustment("600036", raw_bars, "hfq")
+    assert requested == [("2025-02-24", "2025-05-11")]
+    # 0.95, 0.9 and 0.9 for the three dividends.
+    assert adjusted["close"].iloc[-1] == pytest.approx(4.5 / (0.95 * 0.9 * 0.9))
+    assert list(adjusted["vwap"]) == pytest.approx(list(adjusted["close"]))
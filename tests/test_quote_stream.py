@@ -0,0 +1,48 @@
+import asyncio
+import pandas as pd
+from openbb_akshare.utils import quote_stream
+
+
+def make_snapshot(prices, volumes):
+    return pd.DataFrame({"代码": ["600000", "600036", "601398"], "最新价": prices, "成交量": volumes})
+
+
+def test_changed_rows():
+    previous = make_snapshot([8.1, 42.1, 6.0], [100, 200, 300])
+    current = make_snapshot([8.1, 42.2, 6.0], [100, 200, 310])
+    assert list(quote_stream.changed_rows(previous, current)["代码"]) == ["600036", "601398"]
+    assert len(quote_stream.changed_rows(pd.DataFrame(), current)) == 3
+
+
+def test_subscribers_share_one_poll(monkeypatch):
+    snapshots = [
+        make_snapshot([8.1, 42.1, 6.0], [100, 200, 300]),
+        make_snapshot([8.2, 42.1, 6.0], [110, 200, 300]),
+        make_snapshot([8.2, 42.1, 6.1], [110, 200, 320]),
+    ]
+    polls = []
+
+    async def fake_poll(self):
+        polls.append(self.market)
+        return snapshots[min(len(polls), len(snapshots)) - 1]
+
+    monkeypatch.setattr(quote_stream.MarketPoller, "_poll", fake_poll)
+
+    async def main():
+        first = quote_stream.subscribe_quotes(["600000", "600036"], interval=0.01)
+        second = quote_stream.subscribe_quotes(["600036", "601398"], interval=0.01)
+        # Both subscribe before the first poll, which then serves them both.
+        a0, b0 = await asyncio.gather(first.__anext__(), second.__anext__())
+        a = [a0, await first.__anext__()]
+        b = [b0, await second.__anext__()]
+        await first.aclose()
+        await second.aclose()
+        return a, b
+
+    a, b = asyncio.run(main())
+    assert list(a[0]["代码"]) == ["600000", "600036"]
+    assert list(a[1]["代码"]) == ["600000"]
+    assert list(b[0]["代码"]) == ["600036", "601398"]
+    assert list(b[1]["代码"]) == ["601398"]
+    assert polls == ["SH"] * len(polls)
+    assert not quote_stream._pollers
@@ -0,0 +1,52 @@
+from datetime import datetime
+
+import pandas as pd
+import pytest
+from openbb_akshare.utils import quote_tape
+from openbb_akshare.utils.trading_calendar import exchange_timestamp, fallback_trading_days, set_trading_calendar
+
+
+@pytest.fixture(autouse=True)
+def calendar():
+    set_trading_calendar("SH", fallback_trading_days("SH", datetime(2025, 1, 1), datetime(2025, 12, 31)))
+    quote_tape._last_recorded.clear()
+    yield
+    quote_tape._last_recorded.clear()
+
+
+def make_snapshot(prices, volumes):
+    return pd.DataFrame({"代码": ["600000", "600036"], "最新价": prices, "涨跌幅": [0.1, 0.2],
+                         "成交量": volumes, "成交额": [1e6, 2e6]})
+
+
+def test_record_and_query_tape(tmp_path):
+    root = str(tmp_path)
+
+    def record(df, moment):
+        return quote_tape.record_snapshot("SH", df, exchange_timestamp(moment), root=root)
+
+    # Before the open the snapshot still shows the previous session.
+    assert record(make_snapshot([8.0, 42.0], [0, 0]), datetime(2025, 6, 3, 9, 0)) == 0
+    assert record(make_snapshot([8.1, 42.1], [100, 200]), datetime(2025, 6, 3, 9, 31)) == 2
+    # Only 600036 changed.
+    assert record(make_snapshot([8.1, 42.3], [100, 260]), datetime(2025, 6, 3, 9, 32)) == 1
+    assert record(make_snapshot([8.2, 42.5], [150, 300]), datetime(2025, 6, 3, 10, 5)) == 2
+
+    tape = quote_tape.query_tape("600036", "09:30", "10:00", day="2025-06-03", root=root)
+    assert tape["time"].tolist() == [pd.Timestamp("2025-06-03 09:31"), pd.Timestamp("2025-06-03 09:32")]
+    assert tape["price"].tolist() == pytest.approx([42.1, 42.3])
+    assert tape["volume"].tolist() == [200, 260]
+
+    tape = quote_tape.query_tape("600000.SS", day="2025-06-03", root=root)
+    assert tape["price"].tolist() == pytest.approx([8.1, 8.2])
+    assert quote_tape.query_tape("600000", day="2025-06-04", root=root).empty
+
+
+def test_interrupted_append_is_ignored(tmp_path):
+    root = str(tmp_path)
+    quote_tape.record_snapshot("SH", make_snapshot([8.1, 42.1], [100, 200]),
+                               exchange_timestamp(datetime(2025, 6, 3, 9, 31)), root=root)
+    # A writer died after the first column of the next append.
+    with open(f"{quote_tape.partition_dir('SH', '2025-06-03', root)}/time.bin", "ab") as f:
+        f.write(b"\x00" * 8)
+    assert len(quote_tape.read_tape("SH", "2025-06-03", root)["time"]) == 2
@@ -0,0 +1,113 @@
+import asyncio
+
+import numpy as np
+import pandas as pd
+import pytest
+from openbb_akshare.utils import screener_engine
+from openbb_akshare.utils.screener_engine import SnapshotIndex, screen
+
+
+def make_snapshot(codes, prices, caps):
+    return pd.DataFrame({"代码": codes, "名称": [f"name{c}" for c in codes], "最新价": prices,
+                         "成交量": [100] * len(codes), "总市值": caps})
+
+
+@pytest.fixture
+def indexes():
+    sh = SnapshotIndex("SH", 0.0, make_snapshot(["600000", "600036", "601398", "600519"],
+                                               [8.1, 42.1, 6.0, 1500.0], [2.4e11, 1.1e12, 2.1e12, np.nan]))
+    hk = SnapshotIndex("HK", 0.0, make_snapshot(["00700", "00005"], [380.0, 65.0], [3.6e12, 1.2e12]))
+    return [sh, hk]
+
+
+def test_range_filters(indexes):
+    sh = indexes[0]
+    assert sh.range_positions("price", 6.0, 42.1).tolist() == [2, 0, 1]
+    assert sh.select({"price": (None, 50), "market_cap": (1e12, None)}).tolist() == [1, 2]
+
+    result = screen(indexes, {"price": (10, None)})
+    assert result["代码"].tolist() == ["600036", "600519", "00700", "00005"]
+    assert result["exchange"].tolist() == ["SSE", "SSE", "HKEX", "HKEX"]
+
+
+def test_top_n_across_markets(indexes):
+    result = screen(indexes, sort_by="market_cap", limit=3)
+    assert result["代码"].tolist() == ["00700", "601398", "00005"]
+
+    # Rows without a value rank last in both directions.
+    result = screen(indexes, {"price": (1, None)}, sort_by="market_cap", ascending=True, limit=10)
+    assert result["代码"].tolist() == ["600000", "600036", "00005", "601398", "00700", "600519"]
+
+    assert screen(indexes, limit=2)["代码"].tolist() == ["600000", "600036"]
+    assert screen(indexes, {"price": (1e6, None)}).empty
+    with pytest.raises(ValueError):
+        screen(indexes, sort_by="dividend_yield")
+
+
+def test_screener_fetcher(monkeypatch, indexes):
+    from openbb_akshare.models.equity_screener import AKShareEquityScreenerFetcher
+
+    by_market = {index.market: index for index in indexes}
+    monkeypatch.setattr(screener_engine, "get_snapshot_index", lambda market, use_cache=True: by_market.get(
+        market, SnapshotIndex(market, 0.0, make_snapshot([], [], []))))
+
+    query = AKShareEquityScreenerFetcher.transform_query({"price_min": 50, "sort_by": "price", "limit": 2})
+    data = asyncio.run(AKShareEquityScreenerFetcher.aextract_data(query, None))
+    results = AKShareEquityScreenerFetcher.transform_data(query, data)
+    assert [r.symbol for r in results] == ["600519", "00700"]
+    assert results[1].exchange == "HKEX"
+
+
+@pytest.fixture
+def classification(monkeypatch):
+    from openbb_akshare.utils import sector_classification
+
+    # Restore the module state after the test.
+    monkeypatch.setattr(sector_classification, "_classification", None)
+    monkeypatch.setattr(sector_classification, "_loaded_at", 0.0)
+    return sector_classification.set_classification(pd.DataFrame({
+        "code": ["600000", "600036", "601398", "600519"],
+        "board": ["银行", "银行", "银行", "酿酒行业"],
+        "industry": ["banks", "banks", "banks", "food_products"],
+        "sector": ["financial_services", "financial_services", "financial_services", "consumer_defensive"],
+    }))
+
+
+def test_sector_filter_and_summary(indexes, classification):
+    for index in indexes:
+        index.classify(classification)
+
+    result = screen(indexes, {"price": (8, None)}, sector="financial_services")
+    assert result["代码"].tolist() == ["600000", "600036"]
+    assert result["sector"].tolist() == ["Financial Services"] * 2
+    assert result["industry"].tolist() == ["Banks"] * 2
+    assert screen(indexes, sector="energy").empty
+
+    summary = screener_engine.sector_summary(indexes)
+    assert summary.loc["financial_services", "count"] == 3
+    assert summary.loc["financial_services", "market_cap"] == pytest.approx(3.44e12)
+    assert list(summary.index) == ["consumer_defensive", "financial_services"]
+
+
+def test_classification_is_cached(tmp_path, monkeypatch):
+    from openbb_akshare.utils import cache_db, sector_classification
+
+    fetched = []
+
+    def fake_fetch():
+        fetched.append(1)
+        return pd.DataFrame({"code": ["600036"], "board": ["银行"], "industry": ["banks"],
+                             "sector": ["financial_services"]})
+
+    monkeypatch.setattr(cache_db, "get_db_path", lambda project=None: str(tmp_path / "sectors.db"))
+    monkeypatch.setattr(sector_classification, "fetch_classification", fake_fetch)
+    monkeypatch.setattr(sector_classification, "_classification", None)
+    monkeypatch.setattr(sector_classification, "_loaded_at", 0.0)
+
+    first = sector_classification.get_classification()
+    monkeypatch.setattr(sector_classification, "_classification", None)
+    second = sector_classification.get_classification()
+    assert len(fetched) == 1
+    assert second.loc["600036", "sector"] == "financial_services"
+    assert isinstance(second["sector"].dtype, pd.CategoricalDtype)
+    assert first.equals(second)
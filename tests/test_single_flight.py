@@ -0,0 +1,69 @@
+import threading
+import time
+import pandas as pd
+import pytest
+from openbb_akshare.utils.single_flight import single_flight
+
+
+@pytest.fixture(autouse=True)
+def lock_dir(tmp_path, monkeypatch):
+    from openbb_akshare.utils import single_flight as module
+
+    monkeypatch.setattr(module, "get_lock_dir", lambda project=None: str(tmp_path))
+
+
+def test_concurrent_callers_share_one_load():
+    calls = []
+    started = threading.Event()
+
+    def load():
+        calls.append(1)
+        started.set()
+        time.sleep(0.1)
+        return pd.DataFrame({"close": [1.0]})
+
+    results = []
+
+    def call():
+        results.append(single_flight("test_key", load))
+
+    leader = threading.Thread(target=call)
+    leader.start()
+    started.wait(5)
+    followers = [threading.Thread(target=call) for _ in range(4)]
+    for thread in followers:
+        thread.start()
+    for thread in [leader, *followers]:
+        thread.join()
+
+    assert len(calls) == 1
+    assert len(results) == 5
+    # Every caller gets its own frame.
+    assert len({id(df) for df in results}) == 5
+
+
+def test_errors_are_shared_and_not_cached():
+    started = threading.Event()
+
+    def fail():
+        started.set()
+        time.sleep(0.05)
+        raise ValueError("upstream down")
+
+    errors = []
+
+    def call():
+        try:
+            single_flight("failing_key", fail)
+        except ValueError as e:
+            errors.append(e)
+
+    leader = threading.Thread(target=call)
+    leader.start()
+    started.wait(5)
+    follower = threading.Thread(target=call)
+    follower.start()
+    leader.join()
+    follower.join()
+    assert len(errors) == 2
+    assert single_flight("failing_key", lambda: 42) == 42
@@ -0,0 +1,81 @@
+import pytest
+from datetime import date, datetime
+from openbb_akshare.utils.trading_calendar import TradingCalendar, calendar_market
+
+# Trading days of SSE around the 2025 Dragon Boat Festival (May 31 - June 2).
+DAYS = [date(2025, 5, 26), date(2025, 5, 27), date(2025, 5, 28), date(2025, 5, 29), date(2025, 5, 30),
+        date(2025, 6, 3), date(2025, 6, 4), date(2025, 6, 5), date(2025, 6, 6)]
+
+
+@pytest.fixture
+def calendar():
+    return TradingCalendar("SH", DAYS)
+
+
+def test_is_trading_day(calendar):
+    assert calendar.is_trading_day(date(2025, 5, 30))
+    assert not calendar.is_trading_day(date(2025, 6, 2))
+    assert not calendar.is_trading_day(date(2025, 5, 31))
+    # Days after the known calendar fall back to weekdays.
+    assert calendar.is_trading_day(date(2025, 6, 9))
+    assert not calendar.is_trading_day(date(2025, 6, 14))
+
+
+def test_trading_days_between(calendar):
+    assert calendar.trading_days_between(date(2025, 5, 30), date(2025, 6, 3)) == [date(2025, 5, 30), date(2025, 6, 3)]
+    assert calendar.count_trading_days(date(2025, 5, 31), date(2025, 6, 2)) == 0
+    assert calendar.count_trading_days(date(2025, 5, 26), date(2025, 6, 10)) == 11
+    assert calendar.trading_days_between(date(2025, 6, 6), date(2025, 6, 9)) == [date(2025, 6, 6), date(2025, 6, 9)]
+
+
+def test_previous_close(calendar):
+    assert calendar.previous_trading_day(date(2025, 6, 3)) == date(2025, 5, 30)
+    assert calendar.previous_close(datetime(2025, 6, 3, 10, 0)) == date(2025, 5, 30)
+    assert calendar.previous_close(datetime(2025, 6, 3, 15, 0)) == date(2025, 6, 3)
+    assert calendar.previous_close(datetime(2025, 6, 1, 9, 0)) == date(2025, 5, 30)
+
+
+def test_expected_bar_count(calendar):
+    assert calendar.expected_bar_count(date(2025, 5, 29), date(2025, 6, 3)) == 3
+    assert calendar.expected_bar_count(date(2025, 5, 29), date(2025, 6, 3), interval="5m") == 3 * 48
+    assert TradingCalendar("HK", DAYS).expected_bar_count(date(2025, 6, 3), date(2025, 6, 3), interval="60m") == 6
+    assert calendar_market("SZ") == "CN"
+
+
+def test_market_phase(calendar):
+    assert calendar.market_phase(datetime(2025, 6, 3, 9, 20)) == ("pre_open", datetime(2025, 6, 3, 9, 30))
+    assert calendar.market_phase(datetime(2025, 6, 3, 10, 0)) == ("trading", datetime(2025, 6, 3, 11, 30))
+    assert calendar.market_phase(datetime(2025, 6, 3, 12, 0)) == ("lunch_break", datetime(2025, 6, 3, 13, 0))
+    assert calendar.market_phase(datetime(2025, 6, 3, 8, 0)) == ("closed", datetime(2025, 6, 3, 9, 15))
+    # The close before the Dragon Boat Festival lasts until the next trading day.
+    assert calendar.market_phase(datetime(2025, 5, 30, 15, 0)) == ("closed", datetime(2025, 6, 3, 9, 15))
+    hk = TradingCalendar("HK", DAYS)
+    assert hk.market_phase(datetime(2025, 6, 3, 16, 5)) == ("trading", datetime(2025, 6, 3, 16, 10))
+
+
+def test_slow_calendar_download_does_not_block_other_markets(tmp_path, monkeypatch):
+    import threading
+    from openbb_akshare.utils import cache_db, trading_calendar
+
+    monkeypatch.setattr(cache_db, "get_db_path", lambda project=None: str(tmp_path / "calendar.db"))
+    monkeypatch.setattr(trading_calendar, "_calendars", {})
+    trading_calendar.set_trading_calendar("HK", [date(2025, 6, 3)])
+    started, release = threading.Event(), threading.Event()
+
+    def slow_fetch(market):
+        started.set()
+        release.wait(5)
+        return [date(2025, 6, 3)]
+
+    monkeypatch.setattr(trading_calendar, "fetch_trading_days", slow_fetch)
+    loader = threading.Thread(target=trading_calendar.get_trading_calendar, args=("SH",))
+    loader.start()
+    try:
+        assert started.wait(5)
+        # The HK lookup does not wait for the SH download.
+        assert trading_calendar.get_trading_calendar("HK").is_trading_day(date(2025, 6, 3))
+        assert not release.is_set()
+    finally:
+        release.set()
+        loader.join(5)
+    assert trading_calendar.get_trading_calendar("SH").loaded_at < float("inf")